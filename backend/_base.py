@@ -5,15 +5,31 @@ import logging
 class SudokuBase:
     """ Base object for the project, handling logging and most common operations.
 
+    All loggers share a single handler, attached only once per logger, so creating many objects does not multiply
+    handlers. Loggers created by the project pass all messages on (loggers configured by the application keep their
+    levels): levels of objects are checked by `log`, and the level configured for the process is set on the shared
+    handler, so that it applies to loggers created before it was configured. Messages can be given in %-style with
+    arguments, which are formatted only if the message is emitted:
+    >>> self.log_debug("Field %s filled with %s", position, value)
+
     Attributes:
         logger (logging.Logger): Logger instance
         logger_name (str): logger name
-        logging_level (int): logging level
+        logging_level (int): logging level, `SILENT` to turn logging of the object off
     """
 
     LOGGING_FORMAT = "[%(asctime)s.%(msecs)03d][%(levelname)s][%(name)s]\t %(message)s"
     LOGGING_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
+    SILENT = logging.CRITICAL + 10
+    # level of loggers created by the project, filtering is left to objects and the shared handler
+    PASS_ALL = 1
+
+    __slots__ = ("logger", "logger_name", "logging_level")
+
+    _handler = None  # type: logging.Handler
+    _level = None  # type: int
+
     def __init__(self, logger_name: str = "SudokuBase", logging_level: int = logging.DEBUG):
         """ Initialize with given logger name and level
 
@@ -27,67 +43,115 @@ class SudokuBase:
 
         self.logger = self.get_logger()
 
+    @classmethod
+    def configure_logging(cls, level: int = None, silent: bool = False, stream=sys.stdout):
+        """ Configure logging of all project objects, once per process (e.g. at the start of a script or a worker)
+
+        Args:
+            level (int): logging level overriding levels given to objects, levels of objects are used if not given
+            silent (bool): True to turn logging off entirely
+            stream: stream of the shared handler
+        """
+        # set on the base class, as it is read from there by all objects, whichever class this is called on
+        SudokuBase._level = cls.SILENT if silent else level
+        handler = cls.get_handler()
+        handler.setStream(stream)
+        handler.setLevel(logging.NOTSET if SudokuBase._level is None else SudokuBase._level)
+
+    @classmethod
+    def get_handler(cls) -> logging.Handler:
+        """ Return the handler shared by all loggers, creating it on first use
+
+        Returns:
+            (logging.Handler): handler writing to stdout, with given formatter and date format
+        """
+        if SudokuBase._handler is None:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter(fmt=SudokuBase.LOGGING_FORMAT,
+                                                   datefmt=SudokuBase.LOGGING_TIME_FORMAT))
+            SudokuBase._handler = handler
+        return SudokuBase._handler
+
+    def effective_level(self) -> int:
+        """ Return logging level in effect for this object
+
+        Returns:
+            (int): level configured for the process if any, level of the object otherwise
+        """
+        return SudokuBase._level if SudokuBase._level is not None else self.logging_level
+
     def get_logger(self) -> logging.Logger:
         """ Return Logger for logging messages
 
         Returns:
-             (logging.Logger): Logger object, with given formatter, date format and handlers
+             (logging.Logger): Logger object, with shared handler attached
         """
         if self.logger:
-            self.logger.setLevel(self.logging_level)
             return self.logger
+        # only loggers created here get a level (once, as setting it clears caches of all loggers), loggers which
+        # already exist may be configured by the application
+        created = not isinstance(logging.Logger.manager.loggerDict.get(self.logger_name), logging.Logger)
         logger = logging.getLogger(self.logger_name)
-        logger.setLevel(self.logging_level)
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(logging.Formatter(fmt=SudokuBase.LOGGING_FORMAT, datefmt=SudokuBase.LOGGING_TIME_FORMAT))
-        logger.addHandler(handler)
+        if created:
+            logger.setLevel(self.PASS_ALL)
+        handler = self.get_handler()
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
         return logger
 
-    def log(self, message: str, level: int = logging.DEBUG):
-        """ Log message with given level
+    def log(self, message: str, level: int = logging.DEBUG, *args):
+        """ Log message with given level. Nothing is done (and message is not formatted) if level is disabled.
 
         Args:
-            message (str): message
+            message (str): message, formatted with args in %-style
             level (int): logging level
+            args: message arguments
         """
-        self.get_logger().log(level, message)
+        if level < self.effective_level():
+            return
+        self.logger.log(level, message, *args)
 
-    def log_debug(self, message):
+    def log_debug(self, message, *args):
         """ Log debug message
 
         Args:
             message (str): message
+            args: message arguments
         """
-        self.log(message, logging.DEBUG)
+        self.log(message, logging.DEBUG, *args)
 
-    def log_info(self, message):
+    def log_info(self, message, *args):
         """ Log info message
 
         Args:
             message (str): message
+            args: message arguments
         """
-        self.log(message, logging.INFO)
+        self.log(message, logging.INFO, *args)
 
-    def log_warning(self, message):
+    def log_warning(self, message, *args):
         """ Log warning message
 
         Args:
             message (str): message
+            args: message arguments
         """
-        self.log(message, logging.WARNING)
+        self.log(message, logging.WARNING, *args)
 
-    def log_error(self, message):
+    def log_error(self, message, *args):
         """ Log error message
 
         Args:
             message (str): message
+            args: message arguments
         """
-        self.log(message, logging.ERROR)
+        self.log(message, logging.ERROR, *args)
 
-    def log_critical(self, message):
+    def log_critical(self, message, *args):
         """ Log critical message
 
         Args:
             message (str): message
+            args: message arguments
         """
-        self.log(message, logging.CRITICAL)
+        self.log(message, logging.CRITICAL, *args)
@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List, Dict
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.consts import SolvingStatus
+from backend.sudoku.solvers.batch_solver import BatchSolver
+from backend.sudoku.validation import GridValidator
+
+
+""" Local HTTP/JSON solving service built on asyncio. Puzzles of incoming requests are queued one by one, collected into
+micro-batches (up to `max_batch` puzzles, waiting at most `batch_wait` seconds for more) and solved by `BatchSolver` in
+a pool of processes. When the queue is full, requests are rejected with 503, so that clients back off instead of
+piling up unbounded latency.
+
+    POST /solve     {"puzzle": "0030..."} or {"puzzles": ["0030...", ...]}
+                    -> {"solutions": [...], "statuses": ["solved", ...]}
+    POST /validate  {"submissions": ["1234...", ...], "puzzles": ["0030...", ...]} (one puzzle for all, or none)
+                    -> {"valid": [...], "complete": [...], "consistent": [...], "correct": [...], "offending": [[...]]}
+    GET /metrics    queue depth, batches in flight, counters and latency percentiles
+    GET /health     {"status": "ok"}
+
+    python -m backend.api.service --port 8080
+"""
+
+_solver = None  # type: BatchSolver
+
+
+def _solve_batch(puzzles: np.ndarray, logging_level: int, puzzle_timeout: float) -> Tuple[np.ndarray, np.ndarray]:
+    """ Solve a batch in worker process, reusing one solver per process
+
+    Returns:
+        (np.ndarray, np.ndarray): solutions and statuses
+    """
+    global _solver
+    if _solver is None:
+        _solver = BatchSolver(logging_level=logging_level)
+    return _solver.solve(puzzles, puzzle_timeout=puzzle_timeout)
+
+
+class HTTPError(Exception):
+    """ Error answered to the client with given HTTP status
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class SolvingService(SudokuBase):
+    """ Solving service, see module description
+
+    Attributes:
+        host (str): host to listen on, loopback by default
+        port (int): port to listen on
+        workers (int): number of worker processes (all cores by default), which is also the number of batches solved
+                       at once
+        max_batch (int): maximal number of puzzles in a batch
+        batch_wait (float): seconds to wait for more puzzles before a batch is dispatched
+        max_queue (int): maximal number of queued puzzles, requests are rejected above it (with 413 if they have more
+                         puzzles than that, so that they could never be queued)
+        puzzle_timeout (float): seconds search of a single puzzle may take, it is answered as timed out after that
+        latencies (deque[float]): latencies of recent puzzles in seconds, from queuing to solution
+        validator (GridValidator): validator of submitted grids
+    """
+
+    REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+               500: "Internal Server Error", 503: "Service Unavailable"}
+    MAX_BODY = 16 * 1024 * 1024
+    LATENCY_WINDOW = 10000
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, workers: int = None, max_batch: int = 256,
+                 batch_wait: float = 0.005, max_queue: int = 10000, puzzle_timeout: float = 1.0,
+                 logger_name: str = "SolvingService", logging_level: int = 20):
+        super().__init__(logger_name, logging_level)
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.max_queue = max_queue
+        self.puzzle_timeout = puzzle_timeout
+        self.latencies = deque(maxlen=self.LATENCY_WINDOW)
+        self.validator = GridValidator(logging_level=logging_level)
+
+        self.queue = None  # type: asyncio.Queue
+        self.executor = None  # type: ProcessPoolExecutor
+        self.server = None  # type: asyncio.AbstractServer
+        self.batcher = None  # type: asyncio.Task
+        self.slots = None  # type: asyncio.Semaphore
+        self.tasks = set()
+        self.connections = {}  # type: Dict[asyncio.StreamWriter, asyncio.Task]
+        self.counters = {"requests": 0, "rejected": 0, "errors": 0, "puzzles": 0, "batches": 0, "in_flight": 0,
+                         "validated": 0}
+
+    async def start(self):
+        """ Start worker processes, the batcher and listening for requests
+        """
+        self.queue = asyncio.Queue(maxsize=self.max_queue)
+        self.slots = asyncio.Semaphore(self.workers)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.batcher = asyncio.create_task(self._batch_loop())
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.log_info("Listening on %s:%s with %s workers", self.host, self.port, self.workers)
+
+    async def close(self):
+        """ Stop listening, cancel the batcher and shut worker processes down
+        """
+        self.server.close()
+        for writer in list(self.connections):
+            writer.close()
+        await asyncio.gather(*self.connections.values(), return_exceptions=True)
+        await self.server.wait_closed()
+        self.batcher.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        self.executor.shutdown(cancel_futures=True)
+        self.log_info("Closed")
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def solve(self, puzzles: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """ Queue puzzles to be solved in the next batches and wait for their solutions
+
+        Args:
+            puzzles (np.ndarray): (N, 81) array of values
+
+        Returns:
+            (np.ndarray, np.ndarray): (N, 81) solutions and (N,) `SolvingStatus` values
+        """
+        if len(puzzles) > self.max_queue:
+            self.counters["rejected"] += 1
+            raise HTTPError(413, f"Request has {len(puzzles)} puzzles, at most {self.max_queue} are accepted at once")
+        if self.queue.maxsize - self.queue.qsize() < len(puzzles):
+            self.counters["rejected"] += 1
+            raise HTTPError(503, f"Queue is full ({self.queue.qsize()} puzzles), retry later")
+        loop = asyncio.get_running_loop()
+        futures = []
+        for puzzle in puzzles:
+            future = loop.create_future()
+            self.queue.put_nowait((puzzle, future, time.perf_counter()))
+            futures.append(future)
+        results = await asyncio.gather(*futures)
+        return np.array([solution for solution, _ in results]), np.array([status for _, status in results])
+
+    async def _batch_loop(self):
+        """ Collect queued puzzles into batches and dispatch them to worker processes, at most one batch per worker
+        at once (so that puzzles queued while all workers are busy make bigger batches)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.slots.acquire()
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.max_batch:
+                if self.queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.queue.get_nowait())
+            task = asyncio.create_task(self._solve_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def _solve_batch(self, batch: List[tuple]):
+        """ Solve a batch in a worker process and resolve futures of its puzzles
+        """
+        self.counters["in_flight"] += 1
+        try:
+            puzzles = np.array([puzzle for puzzle, _, _ in batch], dtype=np.uint8)
+            solutions, statuses = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _solve_batch, puzzles, self.logging_level, self.puzzle_timeout)
+        except Exception as error:
+            self.log_error("Batch of %s puzzles failed: %s", len(batch), error)
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        finally:
+            self.counters["in_flight"] -= 1
+            self.slots.release()
+        self.counters["batches"] += 1
+        self.counters["puzzles"] += len(batch)
+        now = time.perf_counter()
+        for (_, future, queued), solution, status in zip(batch, solutions, statuses):
+            self.latencies.append(now - queued)
+            if not future.done():
+                future.set_result((solution, status))
+
+    def metrics(self) -> Dict[str, float]:
+        """ Current metrics of the service
+
+        Returns:
+            (dict[str, float]): queue depth, counters, mean batch size and latency percentiles in milliseconds
+        """
+        metrics = dict(self.counters)
+        metrics["queue_depth"] = self.queue.qsize()
+        metrics["mean_batch_size"] = self.counters["puzzles"] / self.counters["batches"] if self.counters["batches"] \
+            else 0.0
+        if self.latencies:
+            latencies = np.array(self.latencies) * 1000
+            for percentile in (50, 90, 99):
+                metrics[f"latency_p{percentile}_ms"] = float(np.percentile(latencies, percentile))
+            metrics["latency_max_ms"] = float(latencies.max())
+        return metrics
+
+    @staticmethod
+    def parse_puzzles(body: bytes) -> np.ndarray:
+        """ Parse body of a solve request
+
+        Args:
+            body (bytes): JSON with `puzzle` string or `puzzles` list of strings, 0 or '.' for empty fields
+
+        Returns:
+            (np.ndarray): (N, 81) array of values
+        """
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        puzzles = data.get("puzzles", [data["puzzle"]] if "puzzle" in data else None) if isinstance(data, dict) \
+            else None
+        if not puzzles or not isinstance(puzzles, list) or not all(isinstance(puzzle, str) for puzzle in puzzles):
+            raise HTTPError(400, "Expected {\"puzzle\": str} or {\"puzzles\": [str, ...]}")
+        return SolvingService.parse_grids(puzzles)
+
+    @staticmethod
+    def parse_grids(grids: List[str]) -> np.ndarray:
+        """ Convert grid strings to array of values
+
+        Args:
+            grids (list[str]): strings of 81 digits, 0 or '.' for empty fields
+
+        Returns:
+            (np.ndarray): (N, 81) array of values
+        """
+        # '.' is an empty field, as in `Sudoku.setup` and text corpora
+        data = "".join(grids).replace(".", "0").encode("ascii", errors="replace")
+        if any(len(grid) != 81 for grid in grids) or not data.isdigit():
+            raise HTTPError(400, "Every puzzle should be a string of 81 digits, 0 or '.' for empty fields")
+        return (np.frombuffer(data, dtype=np.uint8) - ord("0")).reshape(-1, 81)
+
+    def validate(self, body: bytes) -> dict:
+        """ Answer a validation request, checked in place as it takes only array operations
+
+        Args:
+            body (bytes): JSON with `submissions` list of strings and optional `puzzles` list of strings, having one
+                          puzzle for all submissions or one for each of them
+
+        Returns:
+            (dict): JSON response, see `ValidationReport.to_dict`
+        """
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        submissions = data.get("submissions") if isinstance(data, dict) else None
+        puzzles = data.get("puzzles") if isinstance(data, dict) else None
+        if not submissions or not all(isinstance(grids, list) and all(isinstance(grid, str) for grid in grids)
+                                      for grids in (submissions, puzzles or [])):
+            raise HTTPError(400, "Expected {\"submissions\": [str, ...], \"puzzles\": [str, ...]}")
+        if puzzles and len(puzzles) not in (1, len(submissions)):
+            raise HTTPError(400, f"Expected 1 or {len(submissions)} puzzles, got {len(puzzles)}")
+        report = self.validator.validate(self.parse_grids(submissions), self.parse_grids(puzzles) if puzzles else None)
+        self.counters["validated"] += len(submissions)
+        return report.to_dict()
+
+    async def _route(self, method: str, path: str, body: bytes) -> dict:
+        """ Answer a request
+
+        Returns:
+            (dict): JSON response
+        """
+        if path == "/solve":
+            if method != "POST":
+                raise HTTPError(405, "Use POST to solve puzzles")
+            solutions, statuses = await self.solve(self.parse_puzzles(body))
+            return {"solutions": ["".join(map(str, solution)) for solution in solutions.tolist()],
+                    "statuses": [SolvingStatus(status).name.lower() for status in statuses.tolist()]}
+        if path == "/validate":
+            if method != "POST":
+                raise HTTPError(405, "Use POST to validate grids")
+            return self.validate(body)
+        if path == "/metrics":
+            return self.metrics()
+        if path == "/health":
+            return {"status": "ok"}
+        raise HTTPError(404, f"Unknown path {path}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """ Handle HTTP/1.1 connection, keeping it alive for following requests unless client closes it
+        """
+        self.connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                self.counters["requests"] += 1
+                status, response = 200, None
+                try:
+                    method, path, _ = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    if length > self.MAX_BODY:
+                        raise HTTPError(413, f"Body is larger than {self.MAX_BODY} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    response = await self._route(method, path.split("?")[0], body)
+                except HTTPError as error:
+                    status, response = error.status, {"error": str(error)}
+                except ValueError:
+                    status, response = 400, {"error": "Malformed request"}
+                except Exception as error:
+                    self.counters["errors"] += 1
+                    self.log_error("Request failed: %s", error)
+                    status, response = 500, {"error": "Internal error"}
+                payload = json.dumps(response).encode()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                head = [f"HTTP/1.1 {status} {self.REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(payload)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+                if status == 503:
+                    head.append("Retry-After: 1")
+                writer.write("\r\n".join(head + ["", ""]).encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections.pop(writer, None)
+            writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run local sudoku solving service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, all cores by default")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--batch-wait", type=float, default=0.005, help="seconds to wait for more puzzles in a batch")
+    parser.add_argument("--max-queue", type=int, default=10000)
+    parser.add_argument("--puzzle-timeout", type=float, default=1.0, help="seconds search of a puzzle may take")
+    arguments = parser.parse_args()
+    asyncio.run(SolvingService(arguments.host, arguments.port, arguments.workers, arguments.max_batch,
+                               arguments.batch_wait, arguments.max_queue, arguments.puzzle_timeout).serve_forever())
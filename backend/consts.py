@@ -101,37 +101,16 @@ class SquareLocation(Enum):
 
     @classmethod
     def from_position(cls, x_pos: Position, y_pos: Position):
-        position_to_square_mapping = {
-            **dict.fromkeys(Position.permutations(x_range=range(Position.ZERO, Position.THREE),
-                                                  y_range=range(Position.ZERO, Position.THREE)),
-                            cls.LEFT_TOP),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.THREE, Position.SIX),
-                                                  y_range=range(Position.ZERO, Position.THREE)),
-                            cls.CENTER_TOP),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.SIX, Position.NINE),
-                                                  y_range=range(Position.ZERO, Position.THREE)),
-                            cls.RIGHT_TOP),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.ZERO, Position.THREE),
-                                                  y_range=range(Position.THREE, Position.SIX)),
-                            cls.LEFT_CENTER),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.THREE, Position.SIX),
-                                                  y_range=range(Position.THREE, Position.SIX)),
-                            cls.CENTER),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.SIX, Position.NINE),
-                                                  y_range=range(Position.THREE, Position.SIX)),
-                            cls.RIGHT_CENTER),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.ZERO, Position.THREE),
-                                                  y_range=range(Position.SIX, Position.NINE)),
-                            cls.LEFT_BOTTOM),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.THREE, Position.SIX),
-                                                  y_range=range(Position.SIX, Position.NINE)),
-                            cls.CENTER_BOTTOM),
-            **dict.fromkeys(Position.permutations(x_range=range(Position.SIX, Position.NINE),
-                                                  y_range=range(Position.SIX, Position.NINE)),
-                            cls.RIGHT_BOTTOM),
-        }
-        
-        return position_to_square_mapping[(x_pos, y_pos)]
+        """ Get a square location containing field at given position
+
+        Args:
+            x_pos (Position | int): x position of the field
+            y_pos (Position | int): y position of the field
+
+        Returns:
+            (SquareLocation): location of the square
+        """
+        return CELL_SQUARE_LOCATION[x_pos + y_pos * 9]
 
 
 class FieldValue(IntEnum):
@@ -157,3 +136,178 @@ class FieldValue(IntEnum):
         if self.value == self.NONE:
             return False
         return True
+
+
+""" Candidates of a field are kept as integer masks, where bit (value - 1) is set if value is still possible.
+Tables below are indexed by such mask (or by value in case of VALUE_MASKS) to avoid bit-twiddling in hot paths.
+
+Topology of the board is built once per box size. Fields are indexed as `x + y * side`, units (containers) are indexed
+as rows, then columns, then squares (0-8, 9-17 and 18-26 for a standard board), so that all geometry lookups are plain
+tuple indexing. Values above 9 are written as letters (10 is 'A', up to 25 being 'P'), '0' or '.' is an empty field.
+"""
+
+SYMBOLS = "0123456789ABCDEFGHIJKLMNOP"
+
+SYMBOL_VALUES = {symbol: value for value, symbol in enumerate(SYMBOLS)}
+SYMBOL_VALUES.update({".": 0, **{symbol.lower(): value for value, symbol in enumerate(SYMBOLS) if value > 9}})
+
+
+class MaskTable(dict):
+    """ Table indexed by candidates mask, filled in on first use of every mask. Used instead of tuples covering all
+    masks for boards bigger than 9x9, where there are too many masks (2^16, 2^25) to build such tuples.
+
+    Attributes:
+        function (Callable[[int], object]): function computing an entry of the table from the mask
+    """
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, mask: int):
+        entry = self[mask] = self.function(mask)
+        return entry
+
+
+class Topology:
+    """ Geometry of a board made of `box` x `box` squares, each of them `box` x `box` fields
+
+    Attributes:
+        box (int): side of a square
+        side (int): side of the board, being also the number of values
+        size (int): number of fields
+        all_candidates (int): candidates mask with all values possible
+        value_masks (tuple[int, ...]): candidates mask of every value (0 for empty field)
+        candidates_count (tuple[int, ...] | MaskTable): number of candidates of every mask
+        lowest_candidate (tuple[int, ...] | MaskTable): lowest value of every mask (0 for empty mask)
+        mask_values (tuple[tuple[int, ...], ...] | MaskTable): values of every mask in ascending order
+        cells (tuple[int, ...]): indexes of all fields
+        cell_row (tuple[int, ...]): row of every field
+        cell_column (tuple[int, ...]): column of every field
+        cell_square (tuple[int, ...]): square of every field, counted row by row from the left top one
+        row_cells (tuple[tuple[int, ...], ...]): fields of every row
+        column_cells (tuple[tuple[int, ...], ...]): fields of every column
+        square_cells (tuple[tuple[int, ...], ...]): fields of every square
+        units (tuple[tuple[int, ...], ...]): fields of every unit
+        cell_units (tuple[tuple[int, int, int], ...]): units (row, column and square) of every field
+        peers (tuple[tuple[int, ...], ...]): fields sharing a unit with every field
+    """
+
+    # biggest box size for which mask tables are built in full, as tuples
+    MAX_TABULATED_BOX = 3
+
+    _topologies = {}
+
+    def __init__(self, box: int):
+        self.box = box
+        self.side = side = box * box
+        self.size = side * side
+        self.all_candidates = (1 << side) - 1
+        self.value_masks = tuple(0 if value == 0 else 1 << (value - 1) for value in range(side + 1))
+
+        def mask_values(mask: int) -> tuple:
+            return tuple(value for value in range(1, side + 1) if mask & self.value_masks[value])
+
+        if box <= self.MAX_TABULATED_BOX:
+            masks = range(self.all_candidates + 1)
+            self.candidates_count = tuple(bin(mask).count("1") for mask in masks)
+            self.lowest_candidate = tuple((mask & -mask).bit_length() for mask in masks)
+            self.mask_values = tuple(mask_values(mask) for mask in masks)
+        else:
+            self.candidates_count = MaskTable(int.bit_count)
+            self.lowest_candidate = MaskTable(lambda mask: (mask & -mask).bit_length())
+            self.mask_values = MaskTable(mask_values)
+
+        self.cells = tuple(range(self.size))
+        self.cell_row = tuple(index // side for index in self.cells)
+        self.cell_column = tuple(index % side for index in self.cells)
+        self.cell_square = tuple((index // (side * box)) * box + (index % side) // box for index in self.cells)
+        self.row_cells = tuple(tuple(index for index in self.cells if self.cell_row[index] == row)
+                               for row in range(side))
+        self.column_cells = tuple(tuple(index for index in self.cells if self.cell_column[index] == column)
+                                  for column in range(side))
+        self.square_cells = tuple(tuple(index for index in self.cells if self.cell_square[index] == square)
+                                  for square in range(side))
+        self.units = self.row_cells + self.column_cells + self.square_cells
+        self.cell_units = tuple((self.cell_row[index], side + self.cell_column[index],
+                                 2 * side + self.cell_square[index]) for index in self.cells)
+        self.peers = tuple(tuple(sorted(set(self.row_cells[self.cell_row[index]] +
+                                            self.column_cells[self.cell_column[index]] +
+                                            self.square_cells[self.cell_square[index]]) - {index}))
+                           for index in self.cells)
+
+    @classmethod
+    def of(cls, box: int) -> "Topology":
+        """ Get topology of given box size, built on first use
+
+        Args:
+            box (int): side of a square, 3 for a standard 9x9 board
+
+        Returns:
+            (Topology): topology of the board
+        """
+        if box not in cls._topologies:
+            if not 2 <= box <= 5:
+                raise RuntimeError(f"Box size should be between 2 and 5, got {box}")
+            cls._topologies[box] = cls(box)
+        return cls._topologies[box]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.side}x{self.side})"
+
+
+STANDARD = Topology.of(3)
+
+ALL_CANDIDATES = STANDARD.all_candidates
+
+VALUE_MASKS = STANDARD.value_masks
+
+CANDIDATES_COUNT = STANDARD.candidates_count
+
+LOWEST_CANDIDATE = STANDARD.lowest_candidate
+
+MASK_VALUES = STANDARD.mask_values
+
+CELLS = STANDARD.cells
+
+CELL_ROW = STANDARD.cell_row
+
+CELL_COLUMN = STANDARD.cell_column
+
+CELL_SQUARE = STANDARD.cell_square
+
+CELL_SQUARE_LOCATION = tuple(SquareLocation(square) for square in CELL_SQUARE)
+
+ROW_CELLS = STANDARD.row_cells
+
+COLUMN_CELLS = STANDARD.column_cells
+
+SQUARE_CELLS = STANDARD.square_cells
+
+UNITS = STANDARD.units
+
+CELL_UNITS = STANDARD.cell_units
+
+PEERS = STANDARD.peers
+
+
+class SolvingStatus(IntEnum):
+    """ Outcome of solving a single sudoku. UNSOLVABLE means that sudoku has no solution, while UNSOLVED means that
+    solver gave up before finding one (e.g. after reaching its iterations limit). TIMED_OUT and CANCELLED mean that
+    solving was stopped by its deadline or by cancellation before it finished.
+    """
+    SOLVED = 0
+    UNSOLVABLE = 1
+    UNSOLVED = 2
+    TIMED_OUT = 3
+    CANCELLED = 4
+
+
+class Difficulty(IntEnum):
+    """ Difficulty of a sudoku, decided by the simplest techniques it can be solved with, without guessing:
+    naked singles (EASY), hidden singles (MEDIUM), all implemented techniques (HARD), or guessing needed (EXPERT)
+    """
+    EASY = 1
+    MEDIUM = 2
+    HARD = 3
+    EXPERT = 4
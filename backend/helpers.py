@@ -0,0 +1,50 @@
+from typing import Iterable, Set
+
+from backend.consts import FieldValue
+
+
+def field_value(value: int) -> FieldValue | int:
+    """ Convert a value of the board into a field value
+
+    Args:
+        value (int): value, 0 for empty field
+
+    Returns:
+        (FieldValue | int): field value, values above 9 (of boards bigger than 9x9) are kept as ints
+    """
+    return FieldValue(value) if value <= FieldValue.NINE else value
+
+
+def values_to_mask(values: FieldValue | int | Iterable[FieldValue | int]) -> int:
+    """ Convert a value or a collection of values into a candidates bit mask
+
+    Args:
+        values (FieldValue | int | Iterable[FieldValue | int]): a value or values to convert
+
+    Returns:
+        (int): bit mask with a bit set for every given value
+    """
+    if isinstance(values, int):
+        return 1 << (values - 1) if values else 0
+    mask = 0
+    for value in values:
+        if value:
+            mask |= 1 << (value - 1)
+    return mask
+
+
+def mask_to_values(mask: int) -> Set[FieldValue | int]:
+    """ Convert a candidates bit mask into a set of values
+
+    Args:
+        mask (int): candidates bit mask
+
+    Returns:
+        (set[FieldValue | int]): values which bits are set in the mask
+    """
+    values = set()
+    while mask:
+        bit = mask & -mask
+        values.add(field_value(bit.bit_length()))
+        mask ^= bit
+    return values
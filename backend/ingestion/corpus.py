@@ -0,0 +1,216 @@
+import struct
+from typing import Generator, Tuple
+
+import numpy as np
+
+from backend._base import SudokuBase
+
+
+""" Compact binary format of sudoku corpora. A file consists of a 16 bytes header followed by fixed-size records:
+
+    header:  magic (4s) | version (B) | flags (B) | reserved (H) | records count (Q), little-endian
+    record:  status (B) | clues (B) | rating (H) | puzzle (41B) [| solution (41B)]
+
+Values of fields are packed as 4 bits per field (high nibble first), so a board takes 41 bytes instead of 81 characters.
+Solution column is present only if HAS_SOLUTIONS flag is set. Records are memory-mapped on read, so that a corpus of any
+size can be accessed by index without loading it into memory.
+"""
+
+MAGIC = b"SDKC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")
+HAS_SOLUTIONS = 0b1
+PACKED_SIZE = 41
+
+
+def record_dtype(with_solutions: bool) -> np.dtype:
+    """ Get a structured dtype of a single corpus record
+
+    Args:
+        with_solutions (bool): True if records contain solution column
+
+    Returns:
+        (np.dtype): record dtype
+    """
+    fields = [("status", "u1"), ("clues", "u1"), ("rating", "<u2"), ("puzzle", "u1", (PACKED_SIZE,))]
+    if with_solutions:
+        fields.append(("solution", "u1", (PACKED_SIZE,)))
+    return np.dtype(fields)
+
+
+def pack(boards: np.ndarray) -> np.ndarray:
+    """ Pack (N, 81) array of values into (N, 41) array of bytes, 4 bits per field
+
+    Args:
+        boards (np.ndarray): (N, 81) array of values
+
+    Returns:
+        (np.ndarray): (N, 41) uint8 array
+    """
+    boards = np.asarray(boards, dtype=np.uint8).reshape(-1, 81)
+    padded = np.zeros((len(boards), PACKED_SIZE * 2), dtype=np.uint8)
+    padded[:, :81] = boards
+    return (padded[:, 0::2] << 4) | padded[:, 1::2]
+
+
+def unpack(packed: np.ndarray) -> np.ndarray:
+    """ Unpack (N, 41) array of bytes into (N, 81) array of values
+
+    Args:
+        packed (np.ndarray): (N, 41) uint8 array
+
+    Returns:
+        (np.ndarray): (N, 81) uint8 array of values
+    """
+    packed = np.asarray(packed, dtype=np.uint8).reshape(-1, PACKED_SIZE)
+    boards = np.empty((len(packed), PACKED_SIZE * 2), dtype=np.uint8)
+    boards[:, 0::2] = packed >> 4
+    boards[:, 1::2] = packed & 0x0F
+    return boards[:, :81]
+
+
+class CorpusWriter(SudokuBase):
+    """ Writer of binary corpus files, appending puzzles in batches. Records count in the header is updated on close.
+
+    >>> with CorpusWriter("puzzles.sdk", with_solutions=True) as writer:
+    ...     writer.write(puzzles, solutions)
+
+    Attributes:
+        path (str): path of the corpus file
+        with_solutions (bool): True if solution column is written
+        count (int): number of records written
+    """
+
+    def __init__(self, path: str, with_solutions: bool = False, logger_name: str = "CorpusWriter",
+                 logging_level: int = 10):
+        super().__init__(logger_name, logging_level)
+        self.path = path
+        self.with_solutions = with_solutions
+        self.count = 0
+        self.dtype = record_dtype(with_solutions)
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, HAS_SOLUTIONS if self.with_solutions else 0, 0, self.count))
+        self.file.seek(0, 2)
+
+    def write(self, puzzles: np.ndarray, solutions: np.ndarray = None, statuses: np.ndarray = None,
+              ratings: np.ndarray = None):
+        """ Append a batch of puzzles to the corpus
+
+        Args:
+            puzzles (np.ndarray): (N, 81) array of values, 0 for empty fields
+            solutions (np.ndarray): (N, 81) array of solutions, required if writer was created with solutions
+            statuses (np.ndarray): (N,) array of `SolvingStatus` values
+            ratings (np.ndarray): (N,) array of difficulty ratings
+        """
+        puzzles = np.asarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+        if self.with_solutions and solutions is None:
+            self.log_error("Corpus is written with solutions, but solutions were not given")
+            raise RuntimeError("Corpus is written with solutions, but solutions were not given")
+        records = np.zeros(len(puzzles), dtype=self.dtype)
+        records["clues"] = (puzzles != 0).sum(axis=1)
+        records["puzzle"] = pack(puzzles)
+        if self.with_solutions:
+            records["solution"] = pack(solutions)
+        if statuses is not None:
+            records["status"] = statuses
+        if ratings is not None:
+            records["rating"] = ratings
+        self.file.write(records.tobytes())
+        self.count += len(records)
+
+    def close(self):
+        """ Update records count in the header and close the file
+        """
+        if not self.file.closed:
+            self._write_header()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class CorpusReader(SudokuBase):
+    """ Reader of binary corpus files, memory-mapping records instead of loading them
+
+    Attributes:
+        path (str): path of the corpus file
+        with_solutions (bool): True if corpus contains solutions
+        records (np.memmap): memory-mapped structured array of records (see `record_dtype`)
+    """
+
+    def __init__(self, path: str, logger_name: str = "CorpusReader", logging_level: int = 10):
+        super().__init__(logger_name, logging_level)
+        self.path = path
+        with open(path, "rb") as file:
+            magic, version, flags, _, count = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            self.log_error(f"{path} is not a sudoku corpus file of version {VERSION}")
+            raise RuntimeError(f"{path} is not a sudoku corpus file of version {VERSION}")
+        self.with_solutions = bool(flags & HAS_SOLUTIONS)
+        self.records = np.memmap(path, dtype=record_dtype(self.with_solutions), mode="r", offset=HEADER.size,
+                                 shape=(count,))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int | slice) -> np.ndarray:
+        """ Get puzzle (or puzzles if slice is given) of given index
+
+        Returns:
+            (np.ndarray): (81,) or (N, 81) array of values
+        """
+        if isinstance(index, slice):
+            return self.puzzles(index)
+        return unpack(self.records["puzzle"][index])[0]
+
+    def puzzles(self, index: slice = slice(None)) -> np.ndarray:
+        """ Unpack puzzles from given range of records
+
+        Args:
+            index (slice): range of records
+
+        Returns:
+            (np.ndarray): (N, 81) array of values
+        """
+        return unpack(self.records["puzzle"][index])
+
+    def solutions(self, index: slice = slice(None)) -> np.ndarray:
+        """ Unpack solutions from given range of records
+
+        Args:
+            index (slice): range of records
+
+        Returns:
+            (np.ndarray): (N, 81) array of values
+        """
+        if not self.with_solutions:
+            self.log_error(f"{self.path} does not contain solutions")
+            raise RuntimeError(f"{self.path} does not contain solutions")
+        return unpack(self.records["solution"][index])
+
+    def packed_puzzles(self) -> np.ndarray:
+        """ Get a zero-copy view of packed puzzles, to be unpacked with `unpack` when needed
+
+        Returns:
+            (np.ndarray): (N, 41) memory-mapped uint8 array
+        """
+        return self.records["puzzle"]
+
+    def iter_chunks(self, chunk_size: int = 65536) -> Generator[Tuple[int, np.ndarray], None, None]:
+        """ Iterate over unpacked puzzles in chunks, keeping only one chunk in memory
+
+        Args:
+            chunk_size (int): number of puzzles in a chunk
+
+        Yields:
+            (int, np.ndarray): index of the first puzzle in chunk and (N, 81) array of values
+        """
+        for start in range(0, len(self), chunk_size):
+            yield start, self.puzzles(slice(start, start + chunk_size))
@@ -0,0 +1,632 @@
+import os
+import re
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from backend._base import SudokuBase
+
+
+""" Reading sudoku from photos and scans with NumPy only. Every image goes through:
+
+    grid search   adaptive threshold of a downscaled image, the biggest connected component of ink is taken as the grid
+                  and its corners as the fields of the component most to the top-left, top-right, etc.
+    warping       perspective transform of the grid to a square of 9 x CELL_SIDE pixels (bilinear sampling)
+    slicing       grid lines are looked for near their expected positions and 81 cells are sampled between them,
+                  with margins (grid lines) cut off, to DIGIT_SIDE x DIGIT_SIDE ink maps
+
+Cells of all images are classified at once: cells with little ink in the middle are empty, all others go through one
+batched forward pass of a small multilayer perceptron. Its default weights are trained on first use on grids rendered
+by `render` (digits of a bitmap font, randomly scaled, moved, warped, lit and noised), better ones can be trained on
+real cells and saved:
+
+    reader = ImageReader()
+    puzzles, found = reader.read(["scan.pgm", photo_array])    # (N, 81) values and (N,) grids found
+    sudoku = Sudoku(reader.setup_strings([photo_array])[0])
+"""
+
+# longer side of the downscaled image the grid is searched in
+WORKING_SIDE = 192
+# side of a cell of the warped grid
+CELL_SIDE = 32
+GRID_SIDE = 9 * CELL_SIDE
+# pixels of a cell cut off on every side (grid lines), and pooling of what is left
+MARGIN = 3
+POOL = 2
+DIGIT_SIDE = (CELL_SIDE - 2 * MARGIN) // POOL
+# mean ink of the middle of a cell (half of its side) above which the cell is regarded as having a digit
+EMPTY_INK = 0.06
+# minimal area of the grid as a fraction of the image
+MIN_GRID_AREA = 0.05
+# relative darkness of a pixel below its neighbourhood to be regarded as ink
+THRESHOLD_OFFSET = 0.04
+
+# number in a header of PGM / PPM file, after whitespace and comments
+NETPBM_TOKEN = re.compile(rb"(?:\s|#[^\n]*\n)*(\d+)")
+
+# bitmap font of digits used to render training grids
+GLYPHS = """
+...#... .#####. .#####. ....##. ####### ..####. ####### .#####. .#####.
+..##... #.....# #.....# ...#.#. #...... .#..... ......# #.....# #.....#
+.#.#... ......# ......# ..#..#. #...... #...... .....#. #.....# #.....#
+...#... .....#. ......# .#...#. ######. #...... ....#.. #.....# #.....#
+...#... ...##.. ..####. #....#. ......# ######. ...#... .#####. .######
+...#... ..#.... ......# ####### ......# #.....# ..#.... #.....# ......#
+...#... .#..... ......# .....#. ......# #.....# ..#.... #.....# ......#
+...#... #...... #.....# .....#. #.....# #.....# ..#.... #.....# .....#.
+.#####. ####### .#####. .....#. .#####. .#####. ..#.... .#####. .####..
+"""
+GLYPH_BITMAPS = np.array([[[pixel == "#" for pixel in row.split()[digit]] for row in GLYPHS.split("\n") if row]
+                          for digit in range(9)], dtype=np.float32)
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """ Convert image to grayscale with values in [0, 1]
+
+    Args:
+        image (np.ndarray): (H, W) grayscale or (H, W, 3 | 4) color image, uint8 or float in [0, 1]
+
+    Returns:
+        (np.ndarray): (H, W) float32 image
+    """
+    image = np.asarray(image)
+    scale = 1 / 255 if image.dtype == np.uint8 else 1.0
+    if image.ndim == 3:
+        image = image[..., :3] @ np.array([0.299, 0.587, 0.114]) if image.shape[2] >= 3 else image[..., 0]
+    return (image * scale).astype(np.float32)
+
+
+def box_mean(image: np.ndarray, radius: int) -> np.ndarray:
+    """ Mean of every pixel's (2 * radius + 1) square neighbourhood, with edges repeated, using an integral image
+    """
+    size = 2 * radius + 1
+    integral = np.zeros((image.shape[0] + size, image.shape[1] + size))
+    integral[1:, 1:] = np.pad(image, radius, mode="edge").cumsum(axis=0).cumsum(axis=1)
+    return (integral[size:, size:] - integral[:-size, size:] - integral[size:, :-size] + integral[:-size, :-size]) \
+        / (size * size)
+
+
+def largest_component(mask: np.ndarray) -> np.ndarray:
+    """ Find the biggest 8-connected component of a mask. Ink pixels are linked to their right and lower neighbours and
+    every pixel is labeled with the smallest pixel of its component, by hooking labels of linked pixels to the smaller
+    one and jumping to labels of labels until links join no more labels.
+
+    Args:
+        mask (np.ndarray): (H, W) boolean mask
+
+    Returns:
+        (np.ndarray): (H, W) boolean mask of the component, empty if there is no pixel in the mask
+    """
+    height, width = mask.shape
+    pixels = np.flatnonzero(mask)
+    if not len(pixels):
+        return mask
+    index = np.full(mask.shape, -1, dtype=np.intp)
+    index.flat[pixels] = np.arange(len(pixels))
+    firsts, seconds = [], []
+    for dy, dx in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        first = index[:height - dy, max(0, -dx):width - max(0, dx)]
+        second = index[dy:, max(0, dx):width - max(0, -dx)]
+        linked = (first >= 0) & (second >= 0)
+        firsts.append(first[linked])
+        seconds.append(second[linked])
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+
+    labels = np.arange(len(pixels))
+    while True:
+        first_labels, second_labels = labels[first], labels[second]
+        joined = first_labels != second_labels
+        if not joined.any():
+            break
+        lower = np.minimum(first_labels[joined], second_labels[joined])
+        np.minimum.at(labels, first_labels[joined], lower)
+        np.minimum.at(labels, second_labels[joined], lower)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+    component = np.zeros_like(mask)
+    component.flat[pixels[labels == np.bincount(labels).argmax()]] = True
+    return component
+
+
+def find_grid(gray: np.ndarray) -> np.ndarray | None:
+    """ Find corners of the sudoku grid (see module description)
+
+    Args:
+        gray (np.ndarray): (H, W) grayscale image
+
+    Returns:
+        (np.ndarray | None): (4, 2) x, y coordinates of top-left, top-right, bottom-right and bottom-left corners of the
+                             grid's outer edge, None if no grid was found
+    """
+    factor = max(1, -(-max(gray.shape) // WORKING_SIDE))
+    height, width = gray.shape[0] // factor, gray.shape[1] // factor
+    small = gray[:height * factor, :width * factor].reshape(height, factor, width, factor).mean(axis=(1, 3))
+    ink = small < box_mean(small, max(height, width) // 16) - THRESHOLD_OFFSET
+    ys, xs = np.nonzero(largest_component(ink))
+    if not len(xs):
+        return None
+    # pixels of the corners, and their outer corners
+    sums, differences = xs + ys, xs - ys
+    corners = np.array([sums.argmin(), differences.argmax(), sums.argmax(), differences.argmin()])
+    corners = (np.stack([xs[corners], ys[corners]], axis=1) + [(0, 0), (1, 0), (1, 1), (0, 1)]) * float(factor)
+    x, y = corners[:, 0], corners[:, 1]
+    area = abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2
+    if area < MIN_GRID_AREA * gray.shape[0] * gray.shape[1]:
+        return None
+    return corners
+
+
+def homography(source: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """ Perspective transform mapping 4 source points to 4 target points
+
+    Args:
+        source (np.ndarray): (4, 2) x, y points
+        target (np.ndarray): (4, 2) x, y points
+
+    Returns:
+        (np.ndarray): (3, 3) transform matrix
+    """
+    rows = []
+    for (u, v), (x, y) in zip(source, target):
+        rows.append((u, v, 1, 0, 0, 0, -u * x, -v * x))
+        rows.append((0, 0, 0, u, v, 1, -u * y, -v * y))
+    return np.append(np.linalg.solve(np.array(rows), target.ravel()), 1).reshape(3, 3)
+
+
+def bilinear(image: np.ndarray, x: np.ndarray, y: np.ndarray, outside: float = None) -> np.ndarray:
+    """ Sample image at (fractional) pixel coordinates
+
+    Args:
+        image (np.ndarray): (H, W) image
+        x (np.ndarray): x coordinates, of any shape
+        y (np.ndarray): y coordinates, of the same shape
+        outside (float): value of points outside the image, edge pixels are repeated if not given
+
+    Returns:
+        (np.ndarray): sampled values, of the shape of coordinates
+    """
+    height, width = image.shape
+    x_clipped = np.clip(x, 0, width - 1.001)
+    y_clipped = np.clip(y, 0, height - 1.001)
+    x0, y0 = x_clipped.astype(np.intp), y_clipped.astype(np.intp)
+    fx, fy = x_clipped - x0, y_clipped - y0
+    flat = image.ravel()
+    index = y0 * width + x0
+    top = flat[index] * (1 - fx) + flat[index + 1] * fx
+    bottom = flat[index + width] * (1 - fx) + flat[index + width + 1] * fx
+    values = top * (1 - fy) + bottom * fy
+    if outside is not None:
+        values[(x < -0.5) | (x > width - 0.5) | (y < -0.5) | (y > height - 0.5)] = outside
+    return values
+
+
+def warp(image: np.ndarray, corners: np.ndarray, width: int, height: int, outside: float = None) -> np.ndarray:
+    """ Warp quadrilateral part of an image to a rectangle
+
+    Args:
+        image (np.ndarray): (H, W) image
+        corners (np.ndarray): (4, 2) x, y corners of the quadrilateral in the image, clockwise from the top-left one
+        width (int): width of the result
+        height (int): height of the result
+        outside (float): value of points outside the image, edge pixels are repeated if not given
+
+    Returns:
+        (np.ndarray): (height, width) image
+    """
+    matrix = homography(np.array([(0, 0), (width, 0), (width, height), (0, height)], dtype=np.float64), corners)
+    matrix = matrix.astype(np.float32)
+    u, v = np.meshgrid(np.arange(width, dtype=np.float32) + 0.5, np.arange(height, dtype=np.float32) + 0.5)
+    denominator = matrix[2, 0] * u + matrix[2, 1] * v + 1
+    x = (matrix[0, 0] * u + matrix[0, 1] * v + matrix[0, 2]) / denominator - 0.5
+    y = (matrix[1, 0] * u + matrix[1, 1] * v + matrix[1, 2]) / denominator - 0.5
+    return bilinear(image, x, y, outside).astype(np.float32)
+
+
+def grid_lines(grids: np.ndarray, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """ Find lines of warped grids, making up for imprecise corners. Every line is looked for in each of 3 bands of
+    boxes, as the darkest row (or column) of the band within a quarter of a cell from its expected position, and is
+    taken to run straight through these points.
+
+    Args:
+        grids (np.ndarray): (N, GRID_SIDE, GRID_SIDE) warped grayscale grids
+        points (np.ndarray): (P,) pixel coordinates along lines to get positions of lines at
+
+    Returns:
+        (np.ndarray, np.ndarray): (N, 10, P) y coordinates of horizontal lines and x coordinates of vertical lines
+    """
+    count = len(grids)
+    band = GRID_SIDE // 3
+    window = np.arange(-(CELL_SIDE // 4), CELL_SIDE // 4 + 1)
+    candidates = np.clip(np.arange(10)[:, None] * CELL_SIDE + window, 0, GRID_SIDE - 1)
+    # points in bands from the middle of the first one, split into a band to interpolate from and a fraction of the way
+    # to the next one (extrapolated in outer halves of outer bands)
+    along = (points - (band - 1) / 2) / band
+    segment = np.clip(np.floor(along), 0, 1).astype(np.intp)
+    along = (along - segment).astype(np.float32)
+    lines = []
+    for bands in (grids.reshape(count, GRID_SIDE, 3, band).mean(axis=3),
+                  grids.reshape(count, 3, band, GRID_SIDE).mean(axis=2).transpose(0, 2, 1)):
+        # (N, 10, 3) positions of lines in every band
+        positions = candidates[np.arange(10)[:, None], bands[:, candidates].argmin(axis=2)].astype(np.float32)
+        lines.append(positions[:, :, segment] * (1 - along) + positions[:, :, segment + 1] * along)
+    return lines[0], lines[1]
+
+
+def slice_cells(grids: np.ndarray) -> np.ndarray:
+    """ Slice warped grids into ink maps of cells. Cells are sampled between lines found by `grid_lines`, at centers
+    of POOL x POOL blocks (so that bilinear sampling averages blocks), without MARGIN pixels along lines. Ink is
+    normalized between the paper of every cell (so that uneven lighting does not show up as ink) and the darkest
+    pixels of its grid.
+
+    Args:
+        grids (np.ndarray): (N, GRID_SIDE, GRID_SIDE) warped grayscale grids
+
+    Returns:
+        (np.ndarray): (N * 81, DIGIT_SIDE, DIGIT_SIDE) ink of cells in [0, 1], row by row
+    """
+    count = len(grids)
+    offsets = MARGIN + POOL * np.arange(DIGIT_SIDE) + (POOL - 1) / 2
+    points = (np.arange(9)[:, None] * CELL_SIDE + offsets).ravel()
+    # line before every sampled point and fraction of the way to the next one
+    line = np.arange(9).repeat(DIGIT_SIDE)
+    across = np.tile(offsets / CELL_SIDE, 9).astype(np.float32)
+    horizontal, vertical = grid_lines(grids, points)
+    # (N, P, P) coordinates of sampled points, rows being the first axis of both of them
+    y = horizontal[:, line] + (horizontal[:, line + 1] - horizontal[:, line]) * across[:, None]
+    x = (vertical[:, line] + (vertical[:, line + 1] - vertical[:, line]) * across[:, None]).transpose(0, 2, 1)
+    y = np.clip(y, 0, GRID_SIDE - 1.001) + (np.arange(count, dtype=np.float32) * GRID_SIDE)[:, None, None]
+    samples = bilinear(grids.reshape(count * GRID_SIDE, GRID_SIDE), x, y)
+
+    cells = samples.reshape(count, 9, DIGIT_SIDE, 9, DIGIT_SIDE).transpose(0, 1, 3, 2, 4)
+    cells = cells.reshape(count * 81, DIGIT_SIDE * DIGIT_SIDE)
+    dark = np.percentile(grids[:, ::4, ::4].reshape(count, -1), 1, axis=1).repeat(81)
+    paper = np.percentile(cells, 90, axis=1)
+    ink = np.clip((paper[:, None] - cells) / np.maximum(paper - dark, 0.1)[:, None], 0, 1)
+    return ink.reshape(count * 81, DIGIT_SIDE, DIGIT_SIDE)
+
+
+def has_digit(cells: np.ndarray) -> np.ndarray:
+    """ Check which cells contain a digit
+
+    Args:
+        cells (np.ndarray): (M, DIGIT_SIDE, DIGIT_SIDE) ink of cells
+
+    Returns:
+        (np.ndarray): (M,) boolean array
+    """
+    quarter = DIGIT_SIDE // 4
+    return cells[:, quarter:DIGIT_SIDE - quarter, quarter:DIGIT_SIDE - quarter].mean(axis=(1, 2)) > EMPTY_INK
+
+
+def render(puzzles: np.ndarray, seed: int = None) -> List[np.ndarray]:
+    """ Render puzzles as photos of printed grids: bitmap font digits, randomly scaled and moved in their cells, a grid
+    of thin and thick lines, perspective distortion, uneven lighting and noise
+
+    Args:
+        puzzles (np.ndarray): (N, 81) array of values, 0 for empty fields
+        seed (int): seed of random distortions
+
+    Returns:
+        (list[np.ndarray]): (H, W) uint8 grayscale images
+    """
+    rng = np.random.default_rng(seed)
+    glyph_height, glyph_width = GLYPH_BITMAPS.shape[1:]
+    # glyphs stacked in a column, with empty borders, to be sampled as a single image
+    atlas = np.pad(GLYPH_BITMAPS, ((0, 0), (1, 1), (1, 1))).reshape(-1, glyph_width + 2)
+    images = []
+    for puzzle in np.asarray(puzzles).reshape(-1, 81):
+        cell = int(rng.integers(20, 40))
+        side = 9 * cell
+        grid = np.ones((side, side), dtype=np.float32)
+        for line in range(10):
+            thickness = int(rng.integers(3, 5)) if line % 3 == 0 else int(rng.integers(1, 3))
+            start = min(line * cell, side - thickness)
+            grid[start:start + thickness] = 0
+            grid[:, start:start + thickness] = 0
+
+        filled = np.flatnonzero(puzzle)
+        count = len(filled)
+        height = (cell * rng.uniform(0.5, 0.7, count)).astype(np.float32)
+        width = height * glyph_width / glyph_height * rng.uniform(0.8, 1.1, count)
+        center_x = cell * (0.5 + rng.uniform(-0.06, 0.06, count))
+        center_y = cell * (0.5 + rng.uniform(-0.06, 0.06, count))
+        pixels = np.arange(cell, dtype=np.float32) + 0.5
+        x = ((pixels[None, None, :] - (center_x - width / 2)[:, None, None]) / width[:, None, None]) * glyph_width
+        y = ((pixels[None, :, None] - (center_y - height / 2)[:, None, None]) / height[:, None, None]) * glyph_height
+        x = np.clip(x + 0.5, 0, glyph_width + 1)
+        y = np.clip(y + 0.5, 0, glyph_height + 1) + ((puzzle[filled] - 1) * (glyph_height + 2))[:, None, None]
+        strokes = bilinear(atlas, np.broadcast_to(x, (count, cell, cell)), np.broadcast_to(y, (count, cell, cell)))
+        boldness = rng.uniform(0.2, 0.5, count)[:, None, None]
+        strokes = np.clip((strokes - boldness) / 0.2, 0, 1)
+        digits = np.zeros((81, cell, cell), dtype=np.float32)
+        digits[filled] = strokes
+        grid = np.minimum(grid, 1 - digits.reshape(9, 9, cell, cell).transpose(0, 2, 1, 3).reshape(side, side))
+
+        page = int(side * rng.uniform(1.15, 1.5))
+        margin = (page - side) / 2
+        corners = np.array([(margin, margin), (margin + side, margin), (margin + side, margin + side),
+                            (margin, margin + side)]) + rng.uniform(-0.06, 0.06, (4, 2)) * side
+        # the page is warped from the quadrilateral of the grid image its corners are mapped to
+        to_grid = homography(corners, np.array([(0, 0), (side, 0), (side, side), (0, side)], dtype=np.float64))
+        page_corners = np.array([(0, 0, 1), (page, 0, 1), (page, page, 1), (0, page, 1)], dtype=np.float64) @ to_grid.T
+        photo = warp(grid, page_corners[:, :2] / page_corners[:, 2:], page, page, outside=1.0)
+        paper, ink = rng.uniform(0.75, 0.95), rng.uniform(0.05, 0.3)
+        gradient = np.linspace(-1, 1, page, dtype=np.float32)
+        lighting = 1 + rng.uniform(-0.15, 0.15) * gradient[None, :] + rng.uniform(-0.15, 0.15) * gradient[:, None]
+        photo = (ink + (paper - ink) * photo) * lighting + rng.normal(0, 0.02, (page, page)).astype(np.float32)
+        images.append((np.clip(photo, 0, 1) * 255).astype(np.uint8))
+    return images
+
+
+class DigitClassifier(SudokuBase):
+    """ Multilayer perceptron (one hidden ReLU layer, softmax output) classifying ink maps of cells into digits 1-9,
+    with weights kept as NumPy arrays
+
+    Attributes:
+        weights (list[np.ndarray]): hidden layer weights and biases, output layer weights and biases
+    """
+
+    # classifiers trained on rendered grids, by seed and number of grids
+    _synthetic = {}
+
+    def __init__(self, weights: List[np.ndarray] = None, hidden: int = 128, seed: int = 0,
+                 logger_name: str = "DigitClassifier", logging_level: int = 10):
+        """
+        Args:
+            weights (list[np.ndarray]): weights of a trained classifier, random ones are made if not given
+            hidden (int): number of hidden units of random weights
+            seed (int): seed of random weights
+            logger_name (str): logger name
+            logging_level (int): logging level
+        """
+        super().__init__(logger_name, logging_level)
+        if weights is None:
+            rng = np.random.default_rng(seed)
+            features = DIGIT_SIDE * DIGIT_SIDE
+            weights = [rng.normal(0, np.sqrt(2 / features), (features, hidden)), np.zeros(hidden),
+                       rng.normal(0, np.sqrt(1 / hidden), (hidden, 9)), np.zeros(9)]
+        self.weights = [np.asarray(weight, dtype=np.float32) for weight in weights]
+
+    @classmethod
+    def synthetic(cls, seed: int = 0, images: int = 200, logging_level: int = 10) -> "DigitClassifier":
+        """ Get classifier trained on grids rendered by `render`, trained on first use in the process
+
+        Args:
+            seed (int): seed of rendered grids and weights
+            images (int): number of rendered grids to train on
+            logging_level (int): logging level
+
+        Returns:
+            (DigitClassifier): trained classifier
+        """
+        if (seed, images) not in cls._synthetic:
+            rng = np.random.default_rng(seed)
+            puzzles = np.where(rng.random((images, 81)) < 0.8, rng.integers(1, 10, (images, 81)), 0)
+            grids, found = [], []
+            for index, image in enumerate(render(puzzles, seed)):
+                gray = to_gray(image)
+                corners = find_grid(gray)
+                if corners is not None:
+                    grids.append(warp(gray, corners, GRID_SIDE, GRID_SIDE))
+                    found.append(index)
+            labels = puzzles[found].ravel()
+            classifier = cls(seed=seed, logging_level=logging_level)
+            classifier.train(slice_cells(np.array(grids))[labels != 0], labels[labels != 0], seed=seed)
+            cls._synthetic[seed, images] = classifier
+        return cls._synthetic[seed, images]
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> "DigitClassifier":
+        """ Load classifier saved with `save`
+
+        Args:
+            path (str): path of `.npz` file
+            kwargs: other arguments of the classifier
+
+        Returns:
+            (DigitClassifier): loaded classifier
+        """
+        with np.load(path) as data:
+            return cls([data[f"weight_{index}"] for index in range(len(data.files))], **kwargs)
+
+    def save(self, path: str):
+        """ Save weights to `.npz` file
+
+        Args:
+            path (str): path of the file
+        """
+        np.savez(path, **{f"weight_{index}": weight for index, weight in enumerate(self.weights)})
+
+    @staticmethod
+    def features(cells: np.ndarray) -> np.ndarray:
+        """ Flatten ink maps of cells and standardize every one of them
+
+        Args:
+            cells (np.ndarray): (M, DIGIT_SIDE, DIGIT_SIDE) ink of cells
+
+        Returns:
+            (np.ndarray): (M, DIGIT_SIDE * DIGIT_SIDE) float32 features
+        """
+        features = cells.reshape(len(cells), -1).astype(np.float32)
+        features -= features.mean(axis=1, keepdims=True)
+        features /= features.std(axis=1, keepdims=True) + 1e-3
+        return features
+
+    def _forward(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        hidden = np.maximum(features @ self.weights[0] + self.weights[1], 0)
+        return hidden, hidden @ self.weights[2] + self.weights[3]
+
+    def predict(self, cells: np.ndarray) -> np.ndarray:
+        """ Classify cells having a digit, in a single forward pass
+
+        Args:
+            cells (np.ndarray): (M, DIGIT_SIDE, DIGIT_SIDE) ink of cells
+
+        Returns:
+            (np.ndarray): (M,) uint8 digits 1-9
+        """
+        if not len(cells):
+            return np.zeros(0, dtype=np.uint8)
+        return (self._forward(self.features(cells))[1].argmax(axis=1) + 1).astype(np.uint8)
+
+    def train(self, cells: np.ndarray, labels: np.ndarray, epochs: int = 20, batch_size: int = 128,
+              learning_rate: float = 0.003, seed: int = 0) -> float:
+        """ Train the classifier with Adam on cross-entropy loss, in mini-batches
+
+        Args:
+            cells (np.ndarray): (M, DIGIT_SIDE, DIGIT_SIDE) ink of cells
+            labels (np.ndarray): (M,) digits 1-9
+            epochs (int): passes over the data
+            batch_size (int): cells per update
+            learning_rate (float): Adam step size
+            seed (int): seed of shuffling
+
+        Returns:
+            (float): accuracy on the training data after training
+        """
+        features = self.features(cells)
+        targets = np.asarray(labels, dtype=np.intp) - 1
+        rng = np.random.default_rng(seed)
+        moments = [(np.zeros_like(weight), np.zeros_like(weight)) for weight in self.weights]
+        step = 0
+        for epoch in range(epochs):
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                hidden, scores = self._forward(features[batch])
+                probabilities = np.exp(scores - scores.max(axis=1, keepdims=True))
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+                probabilities[np.arange(len(batch)), targets[batch]] -= 1
+                output_gradient = probabilities / len(batch)
+                hidden_gradient = (output_gradient @ self.weights[2].T) * (hidden > 0)
+                gradients = [features[batch].T @ hidden_gradient, hidden_gradient.sum(axis=0),
+                             hidden.T @ output_gradient, output_gradient.sum(axis=0)]
+                step += 1
+                for weight, gradient, (first, second) in zip(self.weights, gradients, moments):
+                    first *= 0.9
+                    first += 0.1 * gradient
+                    second *= 0.999
+                    second += 0.001 * gradient * gradient
+                    weight -= learning_rate * (first / (1 - 0.9 ** step)) / (np.sqrt(second / (1 - 0.999 ** step))
+                                                                           + 1e-8)
+        accuracy = float((self._forward(features)[1].argmax(axis=1) == targets).mean())
+        self.log_debug("Trained on %s cells in %s epochs, training accuracy %s", len(features), epochs, accuracy)
+        return accuracy
+
+
+class ImageReader(SudokuBase):
+    """ Reader of sudoku grids from images (see module description)
+
+    Attributes:
+        classifier (DigitClassifier): classifier of digits, trained on rendered grids (on first use, which takes a few
+                                      seconds once per process) if not given
+        batch_size (int): number of images warped and sliced at once, which bounds memory of reading (cells of all
+                          images are still classified at once)
+        not_found (int): number of images without a grid found so far
+    """
+
+    def __init__(self, classifier: DigitClassifier = None, batch_size: int = 64, logger_name: str = "ImageReader",
+                 logging_level: int = 10):
+        super().__init__(logger_name, logging_level)
+        self._classifier = classifier
+        self.batch_size = batch_size
+        self.not_found = 0
+
+    @property
+    def classifier(self) -> DigitClassifier:
+        if self._classifier is None:
+            self._classifier = DigitClassifier.synthetic(logging_level=self.logging_level)
+        return self._classifier
+
+    def load(self, path: str) -> np.ndarray:
+        """ Load image file. Binary PGM / PPM files are read with NumPy, other formats need Pillow.
+
+        Args:
+            path (str): path of the image
+
+        Returns:
+            (np.ndarray): (H, W) or (H, W, 3) uint8 image
+        """
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:2] in (b"P5", b"P6"):
+            # width, height and maximal value, separated by whitespace and comments, then a single whitespace
+            values, position = [], 2
+            for _ in range(3):
+                match = NETPBM_TOKEN.match(data, position)
+                values.append(int(match.group(1)))
+                position = match.end() + 1
+            width, height, maximum = values
+            pixels = np.frombuffer(data[position:], dtype=np.uint8 if maximum < 256 else ">u2")
+            shape = (height, width) if data[:2] == b"P5" else (height, width, 3)
+            return (pixels[:np.prod(shape)].reshape(shape) * (255 / maximum)).astype(np.uint8)
+        try:
+            from PIL import Image
+        except ImportError:
+            extension = os.path.splitext(path)[1]
+            self.log_error(f"Reading {extension} images needs Pillow, only PGM / PPM are read without it")
+            raise RuntimeError(f"Reading {extension} images needs Pillow, only PGM / PPM are read without it")
+        with Image.open(path) as image:
+            return np.asarray(image.convert("L"))
+
+    def grids(self, images: Sequence[np.ndarray | str]) -> Tuple[np.ndarray, np.ndarray]:
+        """ Find grids in images and warp them to squares
+
+        Args:
+            images (Sequence[np.ndarray | str]): images as arrays or paths
+
+        Returns:
+            (np.ndarray, np.ndarray): (N, GRID_SIDE, GRID_SIDE) warped grids (blank for images without a grid) and (N,)
+                                      boolean array, True for images a grid was found in
+        """
+        grids = np.ones((len(images), GRID_SIDE, GRID_SIDE), dtype=np.float32)
+        found = np.zeros(len(images), dtype=bool)
+        for index, image in enumerate(images):
+            gray = to_gray(self.load(image) if isinstance(image, str) else image)
+            corners = find_grid(gray)
+            if corners is not None:
+                grids[index] = warp(gray, corners, GRID_SIDE, GRID_SIDE)
+                found[index] = True
+        return grids, found
+
+    def read(self, images: Sequence[np.ndarray | str]) -> Tuple[np.ndarray, np.ndarray]:
+        """ Read sudoku from images, classifying cells of all of them at once
+
+        Args:
+            images (Sequence[np.ndarray | str]): images as arrays or paths
+
+        Returns:
+            (np.ndarray, np.ndarray): (N, 81) uint8 values, 0 for empty fields (all of them for images without a grid),
+                                      and (N,) boolean array, True for images a grid was found in
+        """
+        if not len(images):
+            return np.zeros((0, 81), dtype=np.uint8), np.zeros(0, dtype=bool)
+        cells, found = [], []
+        for start in range(0, len(images), self.batch_size):
+            grids, batch_found = self.grids(images[start:start + self.batch_size])
+            cells.append(slice_cells(grids))
+            found.append(batch_found)
+        cells, found = np.concatenate(cells), np.concatenate(found)
+        digits = has_digit(cells)
+        values = np.zeros(len(cells), dtype=np.uint8)
+        if digits.any():
+            values[digits] = self.classifier.predict(cells[digits])
+        if not found.all():
+            self.not_found += int((~found).sum())
+            self.log_warning("No grid found in %s of %s images", int((~found).sum()), len(images))
+        return values.reshape(-1, 81), found
+
+    def setup_strings(self, images: Sequence[np.ndarray | str]) -> List[str | None]:
+        """ Read sudoku from images as strings for `Sudoku.setup`
+
+        Args:
+            images (Sequence[np.ndarray | str]): images as arrays or paths
+
+        Returns:
+            (list[str | None]): 81 digits strings, 0 for empty fields, None for images without a grid
+        """
+        values, found = self.read(images)
+        return ["".join(map(str, puzzle)) if grid else None for puzzle, grid in zip(values.tolist(), found.tolist())]
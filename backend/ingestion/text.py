@@ -0,0 +1,160 @@
+import gzip
+from typing import Generator, Tuple, BinaryIO
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.ingestion.corpus import CorpusWriter
+
+
+""" Bulk loading of text corpora with one puzzle per line: 81 characters of digits with '0' or '.' for empty fields,
+optionally followed by a comma and a solution in the same format (as e.g. `quizzes,solutions` csv files). Header
+lines and comments (starting with a letter or '#') and empty lines are skipped. Files are read in chunks of bytes,
+which are parsed with array operations only, so that corpora larger than memory can be streamed:
+
+    for puzzles, solutions in TextReader("puzzles.csv").iter_chunks():
+        ...
+"""
+
+# value of every byte: digits are values, '.' is an empty field, other bytes are invalid
+VALUES = np.full(256, 255, dtype=np.uint8)
+VALUES[np.frombuffer(b"0123456789", dtype=np.uint8)] = np.arange(10, dtype=np.uint8)
+VALUES[ord(".")] = 0
+
+# lines starting with these bytes (header lines and comments) are skipped
+SKIPPED = np.zeros(256, dtype=bool)
+SKIPPED[np.frombuffer(b"#abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)] = True
+
+TRAILING = np.zeros(256, dtype=bool)
+TRAILING[np.frombuffer(b"\r\t ", dtype=np.uint8)] = True
+
+BOARD_LENGTH = 81
+LINE_WITH_SOLUTION = 2 * BOARD_LENGTH + 1
+
+
+def parse(data: bytes | np.ndarray, with_solutions: bool = None) -> Tuple[np.ndarray, np.ndarray | None, int]:
+    """ Parse complete lines of text into arrays of puzzles (and solutions)
+
+    Args:
+        data (bytes | np.ndarray): text of whole lines
+        with_solutions (bool): True to parse solution column, detected from the first puzzle line if not given
+
+    Returns:
+        (np.ndarray, np.ndarray | None, int): (N, 81) uint8 puzzles, (N, 81) uint8 solutions (None if not parsed,
+                                              rows of zeros for lines without solution) and number of invalid lines
+    """
+    buffer = np.frombuffer(data, dtype=np.uint8) if isinstance(data, (bytes, bytearray, memoryview)) else data
+    # a space at the end makes every line end with a separator and keeps gathered indexes within the buffer
+    buffer = np.concatenate((buffer, np.full(LINE_WITH_SOLUTION + 1, ord(" "), dtype=np.uint8)))
+    ends = np.flatnonzero(buffer[:-LINE_WITH_SOLUTION] == ord("\n"))
+    if not len(ends) or ends[-1] != len(buffer) - LINE_WITH_SOLUTION - 2:
+        ends = np.append(ends, len(buffer) - LINE_WITH_SOLUTION - 1)
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    # windows line endings and trailing whitespace are not a part of the line
+    while True:
+        trailing = (ends > starts) & TRAILING[buffer[ends - 1]]
+        if not trailing.any():
+            break
+        ends = ends - trailing
+    lengths = ends - starts
+    skipped = (lengths == 0) | SKIPPED[buffer[starts]]
+    starts, lengths = starts[~skipped], lengths[~skipped]
+    if with_solutions is None:
+        with_solutions = bool(len(lengths)) and lengths[0] == LINE_WITH_SOLUTION
+
+    offsets = np.arange(BOARD_LENGTH)
+    has_solution = (lengths == LINE_WITH_SOLUTION) & (buffer[starts + BOARD_LENGTH] == ord(","))
+    valid = (lengths == BOARD_LENGTH) | has_solution
+    puzzles = VALUES[buffer[starts[:, None] + offsets]]
+    valid &= (puzzles != 255).all(axis=1)
+    solutions = None
+    if with_solutions:
+        solutions = VALUES[buffer[(starts + BOARD_LENGTH + 1)[:, None] + offsets]]
+        solutions[~has_solution] = 0
+        valid &= (solutions != 255).all(axis=1)
+        solutions = solutions[valid]
+    return puzzles[valid], solutions, int((~valid).sum())
+
+
+class TextReader(SudokuBase):
+    """ Reader of text corpora (see module description), plain or gzip compressed (`.gz`)
+
+    Attributes:
+        path (str): path of the text file
+        chunk_size (int): number of bytes read at once
+        with_solutions (bool): True if solution column is parsed, detected from the first puzzle line if not given
+        invalid (int): number of invalid lines skipped so far
+    """
+
+    def __init__(self, path: str, chunk_size: int = 1 << 24, with_solutions: bool = None,
+                 logger_name: str = "TextReader", logging_level: int = 10):
+        super().__init__(logger_name, logging_level)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.with_solutions = with_solutions
+        self.invalid = 0
+
+    def _open(self) -> BinaryIO:
+        return gzip.open(self.path, "rb") if self.path.endswith(".gz") else open(self.path, "rb")
+
+    def iter_chunks(self) -> Generator[Tuple[np.ndarray, np.ndarray | None], None, None]:
+        """ Iterate over puzzles in chunks, keeping only one chunk of the file in memory
+
+        Yields:
+            (np.ndarray, np.ndarray | None): (N, 81) uint8 puzzles and solutions (None if not parsed)
+        """
+        remainder = b""
+        with self._open() as file:
+            while True:
+                data = file.read(self.chunk_size)
+                if not data:
+                    break
+                data = remainder + data
+                end = data.rfind(b"\n") + 1
+                remainder = data[end:]
+                if end:
+                    yield from self._parse(data[:end])
+            if remainder:
+                yield from self._parse(remainder)
+
+    def _parse(self, data: bytes) -> Generator[Tuple[np.ndarray, np.ndarray | None], None, None]:
+        puzzles, solutions, invalid = parse(data, self.with_solutions)
+        if self.with_solutions is None and len(puzzles):
+            self.with_solutions = solutions is not None
+        if invalid:
+            self.invalid += invalid
+            self.log_warning("Skipped %s invalid lines of %s", invalid, self.path)
+        if len(puzzles):
+            yield puzzles, solutions
+
+    def read(self) -> Tuple[np.ndarray, np.ndarray | None]:
+        """ Read the whole file
+
+        Returns:
+            (np.ndarray, np.ndarray | None): (N, 81) uint8 puzzles and solutions (None if not parsed)
+        """
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return np.zeros((0, BOARD_LENGTH), dtype=np.uint8), None
+        puzzles = np.concatenate([puzzles for puzzles, _ in chunks])
+        solutions = np.concatenate([solutions for _, solutions in chunks]) if self.with_solutions else None
+        return puzzles, solutions
+
+    def to_corpus(self, path: str) -> int:
+        """ Convert the text file to a binary corpus (see `backend.ingestion.corpus`), chunk by chunk
+
+        Args:
+            path (str): path of the corpus file
+
+        Returns:
+            (int): number of puzzles written
+        """
+        chunks = self.iter_chunks()
+        first = next(chunks, None)
+        with CorpusWriter(path, with_solutions=bool(self.with_solutions), logging_level=self.logging_level) as writer:
+            if first is not None:
+                writer.write(*first)
+                for puzzles, solutions in chunks:
+                    writer.write(puzzles, solutions)
+            self.log_info("Converted %s puzzles from %s to %s", writer.count, self.path, path)
+            return writer.count
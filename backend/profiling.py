@@ -0,0 +1,194 @@
+import cProfile
+import os
+import pstats
+import random
+import re
+from collections import defaultdict
+from typing import Callable, Dict, Tuple
+
+from backend._base import SudokuBase
+
+
+""" Opt-in profiling of solves. Profiling is turned on by passing a `Profiler` to an entry point (e.g. `Sudoku.solve`)
+or by attaching it to a solver instance, nothing is wrapped (so nothing is paid) otherwise:
+
+    profiler = Profiler("profiles", sample_rate=0.01)
+    solver = profiler.attach(ClassicSolver())
+
+Every profiled call writes a cProfile dump (`.prof`, to be read with `pstats` or snakeviz) and collapsed stacks
+(`.collapsed`, one `caller;callee;... microseconds` line per stack, as read by flamegraph.pl or speedscope), named
+after the process, number of the call and its label (the puzzle string).
+"""
+
+# function key of pstats: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+class Profiler(SudokuBase):
+    """ Profiler of a sampled fraction of calls
+
+    Attributes:
+        directory (str): directory to write profiles to
+        sample_rate (float): fraction of calls to profile, 1 to profile all of them
+        random (random.Random): random generator used to sample calls
+        calls (int): number of calls seen
+        profiled (int): number of calls profiled
+    """
+
+    # stacks with less time are left out of collapsed stacks
+    MIN_STACK_SECONDS = 1e-6
+
+    def __init__(self, directory: str, sample_rate: float = 1.0, seed: int = None, logger_name: str = "Profiler",
+                 logging_level: int = 10):
+        """
+        Args:
+            directory (str): directory to write profiles to, created if it does not exist
+            sample_rate (float): fraction of calls to profile, 1 to profile all of them
+            seed (int): seed of sampling
+            logger_name (str): logger name
+            logging_level (int): logging level
+        """
+        super().__init__(logger_name, logging_level)
+        if not 0 < sample_rate <= 1:
+            self.log_error(f"Sample rate should be in (0, 1] range, got {sample_rate}")
+            raise RuntimeError(f"Sample rate should be in (0, 1] range, got {sample_rate}")
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.profiled = 0
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_environment(cls, **kwargs) -> "Profiler | None":
+        """ Create profiler configured with `SUDOKU_PROFILE_DIR` and `SUDOKU_PROFILE_RATE` environment variables,
+        e.g. to profile production-like batches without changing the code
+
+        Returns:
+            (Profiler | None): profiler, None if `SUDOKU_PROFILE_DIR` is not set
+        """
+        directory = os.environ.get("SUDOKU_PROFILE_DIR")
+        if not directory:
+            return None
+        return cls(directory, float(os.environ.get("SUDOKU_PROFILE_RATE", 1.0)), **kwargs)
+
+    def sample(self) -> bool:
+        """ Decide if the next call is profiled
+
+        Returns:
+            (bool): True if the call should be profiled
+        """
+        self.calls += 1
+        return self.sample_rate >= 1 or self.random.random() < self.sample_rate
+
+    def profile(self, label: str, function: Callable, *args, **kwargs):
+        """ Call function, profiling the call if it is sampled
+
+        Args:
+            label (str): label of the call, used in file names
+            function (Callable): function to call
+            args: arguments of the function
+            kwargs: keyword arguments of the function
+
+        Returns:
+            result of the function
+        """
+        if not self.sample():
+            return function(*args, **kwargs)
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            self.dump(profile, label)
+
+    def attach(self, solver):
+        """ Profile calls of `solve` of given solver instance (labeled with `solver.profile_label`)
+
+        Args:
+            solver (Solver): solver to profile
+
+        Returns:
+            (Solver): the same solver
+        """
+        solve = solver.solve
+
+        def profiled_solve(*args, **kwargs):
+            return self.profile(solver.profile_label(*args, **kwargs), solve, *args, **kwargs)
+
+        solver.solve = profiled_solve
+        return solver
+
+    def dump(self, profile: cProfile.Profile, label: str) -> str:
+        """ Write cProfile dump and collapsed stacks of a profiled call
+
+        Args:
+            profile (cProfile.Profile): profile of the call
+            label (str): label of the call
+
+        Returns:
+            (str): path of the files without extension
+        """
+        self.profiled += 1
+        name = re.sub(r"[^\w.-]", "_", label)[:100]
+        path = os.path.join(self.directory, f"{os.getpid()}_{self.calls:06d}_{name}")
+        profile.dump_stats(f"{path}.prof")
+        stacks = collapsed_stacks(pstats.Stats(profile), self.MIN_STACK_SECONDS)
+        with open(f"{path}.collapsed", "w") as file:
+            for stack, seconds in sorted(stacks.items()):
+                file.write(f"{stack} {round(seconds * 1e6)}\n")
+        self.log_debug("Profile of %s written to %s", label, path)
+        return path
+
+
+def function_name(function: FunctionKey) -> str:
+    """ Name of a function in collapsed stacks
+
+    Args:
+        function (tuple[str, int, str]): pstats function key
+
+    Returns:
+        (str): `file:function` name, built-in functions keep their own names
+    """
+    filename, _, name = function
+    if filename == "~":
+        return name
+    return f"{os.path.basename(filename)}:{name}"
+
+
+def collapsed_stacks(stats: pstats.Stats, min_seconds: float = 0.0) -> Dict[str, float]:
+    """ Convert cProfile statistics to collapsed stacks.
+
+    cProfile records time of caller -> callee edges only, not of whole stacks, so stacks are reconstructed walking
+    the call graph from its roots, splitting time of a function between its callers in proportion to the time spent
+    in it under each of them. Recursive calls are folded into the first occurrence of the function on the stack.
+
+    Args:
+        stats (pstats.Stats): statistics of a profile
+        min_seconds (float): stacks with less time are left out
+
+    Returns:
+        (dict[str, float]): self time in seconds by `;`-joined stack
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)  # type: Dict[FunctionKey, Dict[FunctionKey, float]]
+    for function, (_, _, _, _, callers) in entries.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees[caller][function] = cumulative
+    stacks = defaultdict(float)
+
+    def walk(function: FunctionKey, stack: Tuple[str, ...], on_stack: frozenset, share: float):
+        _, _, own, cumulative, _ = entries[function]
+        stack += (function_name(function),)
+        on_stack |= {function}
+        if own * share >= min_seconds:
+            stacks[";".join(stack)] += own * share
+        for callee, edge in callees[function].items():
+            callee_cumulative = entries[callee][3]
+            if callee in on_stack or not callee_cumulative or edge * share < min_seconds:
+                continue
+            walk(callee, stack, on_stack, share * min(1.0, edge / callee_cumulative))
+
+    for function, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(function, (), frozenset(), 1.0)
+    return dict(stacks)
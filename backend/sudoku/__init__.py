@@ -1,3 +1,4 @@
+from backend.sudoku.board import Board
 from backend.sudoku.field import Field
 from backend.sudoku.containers.line import Row, Column
 from backend.sudoku.containers.square import Square
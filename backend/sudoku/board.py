@@ -0,0 +1,382 @@
+from typing import List, Iterable, Tuple
+
+from backend.consts import Topology, STANDARD, SYMBOLS
+
+
+class Board:
+    """ Engine keeping the state of the whole sudoku as flat lists of integers, indexed by `x + y * SIDE`.
+    `Field` objects are views over a single cell of the board.
+
+    `Board` itself is a standard 9x9 board, boards of other sizes (16x16, 25x25) are its subclasses made by `sized`,
+    which differ only by topology tables kept as class attributes, so that the engine is the same for all sizes.
+
+    Every change done by `assign` and `eliminate` is recorded on the undo trail as a pair of ints: field index and its
+    previous candidates mask. Assignments are recorded with index shifted by `SIZE`, as the previous value of an
+    assigned field is always empty. Rolling back to a `mark` restores the board in place, without copying it.
+
+    Fields left with a single candidate by `assign` or `eliminate` are pushed to the `singles` work queue, which is
+    drained by `propagate`, so that only fields affected by a change are ever visited.
+
+    Once `track_buckets` is called, empty fields are also kept in buckets by their number of candidates, to choose
+    a branching field without scanning the board (see `branching_field`). Buckets are not touched by `assign` and
+    `eliminate` themselves: changes recorded on the trail since the last choice are applied to them in bulk when the
+    next field is chosen, and changes rolled back by `undo` are reverted in them right away, so that they stay correct
+    when search backtracks. Changes made to `values` and `candidates` directly (not recorded on the trail) require
+    calling `track_buckets` again.
+
+    Attributes:
+        values (list[int]): value of every field, 0 for empty fields
+        candidates (list[int]): bit mask of possible values of every field (see `VALUE_MASKS`)
+        trail (list[int]): undo trail of changes
+        singles (list[int]): queue of fields indexes left with a single candidate
+        buckets (list[set[int]] | None): empty fields by their number of candidates, None if not tracked
+        counts (list[int] | None): number of candidates of every field as known to buckets, -1 for filled fields
+        degrees (list[int] | None): number of empty peers of every field, None if not tracked
+        synced (int): length of the undo trail applied to buckets
+    """
+
+    __slots__ = ("values", "candidates", "trail", "singles", "buckets", "counts", "degrees", "synced")
+
+    TOPOLOGY = STANDARD
+    BOX = STANDARD.box
+    SIDE = STANDARD.side
+    SIZE = STANDARD.size
+    ALL_CANDIDATES = STANDARD.all_candidates
+    VALUE_MASKS = STANDARD.value_masks
+    CANDIDATES_COUNT = STANDARD.candidates_count
+    LOWEST_CANDIDATE = STANDARD.lowest_candidate
+    MASK_VALUES = STANDARD.mask_values
+    PEERS = STANDARD.peers
+    UNITS = STANDARD.units
+    CELL_UNITS = STANDARD.cell_units
+
+    _sized = {}
+
+    def __init__(self, values: Iterable[int] = None, candidates: Iterable[int] = None):
+        """
+        Args:
+            values (Iterable[int]): initial values of fields, all empty if not given
+            candidates (Iterable[int]): initial candidates masks, all values possible for empty fields if not given
+        """
+        self.values = [int(value) for value in values] if values is not None else [0] * self.SIZE
+        if candidates is not None:
+            self.candidates = list(candidates)
+        else:
+            self.candidates = [0 if value else self.ALL_CANDIDATES for value in self.values]
+        self.trail = []
+        self.singles = []
+        self.buckets = self.counts = self.degrees = None
+        self.synced = 0
+
+    @classmethod
+    def sized(cls, box: int) -> type:
+        """ Get board class of given box size, made on first use
+
+        Args:
+            box (int): side of a square, 3 for a standard 9x9 board, 4 for 16x16, 5 for 25x25
+
+        Returns:
+            (type): `Board` or its subclass
+        """
+        if box == STANDARD.box:
+            return Board
+        if box not in Board._sized:
+            topology = Topology.of(box)
+            Board._sized[box] = type(f"Board{topology.side}", (Board,), {
+                "__slots__": (), "TOPOLOGY": topology, "BOX": box, "SIDE": topology.side, "SIZE": topology.size,
+                "ALL_CANDIDATES": topology.all_candidates, "VALUE_MASKS": topology.value_masks,
+                "CANDIDATES_COUNT": topology.candidates_count, "LOWEST_CANDIDATE": topology.lowest_candidate,
+                "MASK_VALUES": topology.mask_values, "PEERS": topology.peers, "UNITS": topology.units,
+                "CELL_UNITS": topology.cell_units})
+        return Board._sized[box]
+
+    def copy(self) -> "Board":
+        """ Create an independent copy of the board
+
+        Returns:
+            (Board): copied board
+        """
+        board = self.__class__.__new__(self.__class__)
+        board.values = self.values[:]
+        board.candidates = self.candidates[:]
+        board.trail = []
+        board.singles = []
+        board.buckets = board.counts = board.degrees = None
+        board.synced = 0
+        if self.buckets is not None:
+            board.track_buckets(self.degrees is not None)
+        return board
+
+    def _taken(self) -> Tuple[List[int], bool]:
+        """ Collect values taken in every unit
+
+        Returns:
+            (list[int], bool): mask of values taken in every unit, and False if a value is given twice in a unit
+        """
+        value_masks = self.VALUE_MASKS
+        cell_units = self.CELL_UNITS
+        taken = [0] * len(self.UNITS)
+        consistent = True
+        for index, value in enumerate(self.values):
+            if value:
+                mask = value_masks[value]
+                for unit in cell_units[index]:
+                    if taken[unit] & mask:
+                        consistent = False
+                    taken[unit] |= mask
+        return taken, consistent
+
+    def consistent(self) -> bool:
+        """ Check that no value is given twice in a row, column or square (candidates cannot show it, as they are
+        kept for empty fields only)
+
+        Returns:
+            (bool): True if values do not conflict with each other
+        """
+        return self._taken()[1]
+
+    def limit_candidates(self) -> bool:
+        """ Recalculate candidates of all empty fields based on the values of their peers. Clears the undo trail.
+
+        Returns:
+            (bool): False if a value is given twice in a row, column or square, so that the board has no solution
+        """
+        self.trail.clear()
+        all_candidates = self.ALL_CANDIDATES
+        taken, consistent = self._taken()
+        self.candidates[:] = [0 if value else all_candidates & ~(taken[row] | taken[column] | taken[square])
+                              for value, (row, column, square) in zip(self.values, self.CELL_UNITS)]
+        if self.buckets is not None:
+            self.track_buckets(self.degrees is not None)
+        return consistent
+
+    def track_buckets(self, degrees: bool = False):
+        """ Start keeping empty fields in buckets by their number of candidates (or rebuild buckets from scratch)
+
+        Args:
+            degrees (bool): True to keep number of empty peers of every field as well
+        """
+        values = self.values
+        candidates_count = self.CANDIDATES_COUNT
+        self.buckets = [set() for _ in range(self.SIDE + 1)]
+        self.counts = [-1 if value else candidates_count[mask] for value, mask in zip(values, self.candidates)]
+        self.degrees = None
+        if degrees:
+            self.degrees = [sum(1 for peer in peers if not values[peer]) for peers in self.PEERS]
+        for index, count in enumerate(self.counts):
+            if count >= 0:
+                self.buckets[count].add(index)
+        self.synced = len(self.trail)
+
+    def _rebucket(self, indexes: Iterable[int]):
+        """ Move fields changed since buckets were synced to buckets of their current number of candidates
+
+        Args:
+            indexes (Iterable[int]): indexes of changed fields, as recorded on the trail (shifted by `SIZE` for
+                                     assignments)
+        """
+        size = self.SIZE
+        values = self.values
+        candidates = self.candidates
+        candidates_count = self.CANDIDATES_COUNT
+        buckets, counts, degrees = self.buckets, self.counts, self.degrees
+        for index in indexes:
+            if index >= size:
+                index -= size
+            count = -1 if values[index] else candidates_count[candidates[index]]
+            previous = counts[index]
+            if count == previous:
+                continue
+            counts[index] = count
+            if previous >= 0:
+                buckets[previous].discard(index)
+            if count >= 0:
+                buckets[count].add(index)
+            if degrees is not None and (count < 0 or previous < 0):
+                change = -1 if count < 0 else 1
+                for peer in self.PEERS[index]:
+                    degrees[peer] += change
+
+    def branching_field(self, by_degree: bool = False) -> int | None:
+        """ Choose a field to branch on - an empty one with the least candidates left, without scanning the board.
+        Buckets are tracked from the first call on.
+
+        Args:
+            by_degree (bool): True to break ties by the number of empty peers (the most constrained field first),
+                              which takes time proportional to the number of tied fields
+
+        Returns:
+            (int | None): index of the field, None if there is no empty field
+        """
+        if self.buckets is None or by_degree and self.degrees is None:
+            self.track_buckets(by_degree)
+        elif self.synced < len(self.trail):
+            self._rebucket(self.trail[self.synced::2])
+            self.synced = len(self.trail)
+        for bucket in self.buckets:
+            if bucket:
+                if by_degree:
+                    return max(bucket, key=self.degrees.__getitem__)
+                return next(iter(bucket))
+        return None
+
+    def assign(self, index: int, value: int) -> bool:
+        """ Set a value of the field and remove it from candidates of all its peers. Peers left with a single candidate
+        are queued in `singles`.
+
+        Args:
+            index (int): field index
+            value (int): value to set
+
+        Returns:
+            (bool): False if assignment led to contradiction (a peer has the same value or no candidates left)
+        """
+        values = self.values
+        candidates = self.candidates
+        trail = self.trail
+        bit = self.VALUE_MASKS[value]
+        trail.append(index + self.SIZE)
+        trail.append(candidates[index])
+        values[index] = value
+        candidates[index] = 0
+        for peer in self.PEERS[index]:
+            if values[peer] == value:
+                return False
+            if candidates[peer] & bit:
+                trail.append(peer)
+                trail.append(candidates[peer])
+                mask = candidates[peer] & ~bit
+                candidates[peer] = mask
+                if not mask:
+                    return False
+                if not mask & (mask - 1):
+                    self.singles.append(peer)
+        return True
+
+    def eliminate(self, index: int, value: int) -> int:
+        """ Remove a value from candidates of the field
+
+        Args:
+            index (int): field index
+            value (int): value to remove
+
+        Returns:
+            (int): candidates mask left
+        """
+        mask = self.candidates[index]
+        bit = self.VALUE_MASKS[value]
+        if mask & bit:
+            self.trail.append(index)
+            self.trail.append(mask)
+            mask &= ~bit
+            self.candidates[index] = mask
+            if mask and not mask & (mask - 1):
+                self.singles.append(index)
+        return mask
+
+    def eliminate_mask(self, index: int, mask: int) -> int:
+        """ Remove all values of given candidates mask from candidates of the field
+
+        Args:
+            index (int): field index
+            mask (int): candidates mask of values to remove
+
+        Returns:
+            (int): candidates mask left
+        """
+        candidates = self.candidates[index]
+        if candidates & mask:
+            self.trail.append(index)
+            self.trail.append(candidates)
+            candidates &= ~mask
+            self.candidates[index] = candidates
+            if candidates and not candidates & (candidates - 1):
+                self.singles.append(index)
+        return candidates
+
+    def queue_singles(self):
+        """ Queue all empty fields having a single candidate, e.g. after the board was set up
+        """
+        self.singles = [index for index, mask in enumerate(self.candidates)
+                        if not self.values[index] and mask and not mask & (mask - 1)]
+
+    def propagate(self) -> bool:
+        """ Fill queued single-candidate fields, until the queue is empty. Filling a field may queue its peers.
+
+        Returns:
+            (bool): False if a contradiction was found, the queue is cleared then
+        """
+        singles = self.singles
+        values = self.values
+        candidates = self.candidates
+        while singles:
+            index = singles.pop()
+            mask = candidates[index]
+            if values[index] or not mask or mask & (mask - 1):
+                continue
+            # the only candidate left is the highest bit of the mask
+            if not self.assign(index, mask.bit_length()):
+                singles.clear()
+                return False
+        return True
+
+    def mark(self) -> int:
+        """ Get a mark of the current state, to roll back to it later with `undo`
+
+        Returns:
+            (int): current length of the undo trail
+        """
+        return len(self.trail)
+
+    def undo(self, mark: int):
+        """ Roll back all changes recorded after given mark
+
+        Args:
+            mark (int): mark returned by `mark`, the `singles` queue is cleared as well
+        """
+        trail = self.trail
+        candidates = self.candidates
+        size = self.SIZE
+        self.singles.clear()
+        # changes already applied to buckets are reverted in them as well
+        reverted = trail[mark:self.synced:2] if self.buckets is not None and mark < self.synced else None
+        while len(trail) > mark:
+            mask = trail.pop()
+            index = trail.pop()
+            if index >= size:
+                index -= size
+                self.values[index] = 0
+            candidates[index] = mask
+        if reverted is not None:
+            self.synced = mark
+            self._rebucket(reverted)
+
+    def is_complete(self) -> bool:
+        """ Check if all fields have values
+
+        Returns:
+            (bool): True if there is no empty field
+        """
+        return 0 not in self.values
+
+    def solution_string(self) -> str:
+        """ Create a string built from all fields' values
+
+        Returns:
+            (str): string containing all fields' values
+        """
+        return "".join([SYMBOLS[value] for value in self.values])
+
+    @classmethod
+    def from_fields(cls, fields: List) -> "Board":
+        """ Create a new board with values and candidates taken from given fields
+
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+
+        Returns:
+            (Board): new board of the same size as the board of fields
+        """
+        board_class = fields[0].board.__class__ if fields else cls
+        return board_class([field.board.values[field.index] for field in fields],
+                   [field.board.candidates[field.index] for field in fields])
@@ -0,0 +1,306 @@
+import sys
+from collections import OrderedDict
+from itertools import permutations, product
+from math import factorial
+from typing import List, NamedTuple, Tuple
+
+from backend._base import SudokuBase
+
+
+class Transform(NamedTuple):
+    """ Validity-preserving transformation of a sudoku board: optional transposition, then reordering of rows and
+    columns (bands, stacks and lines within them), then relabeling of values.
+
+    Attributes:
+        transposed (bool): True if board is transposed first
+        rows (tuple[int, ...]): source row for every row of transformed board
+        columns (tuple[int, ...]): source column for every column of transformed board
+        labels (tuple[int, ...]): new value for every value 0-9 (0 is always mapped to 0)
+    """
+    transposed: bool
+    rows: Tuple[int, ...]
+    columns: Tuple[int, ...]
+    labels: Tuple[int, ...]
+
+    def apply(self, board: str) -> str:
+        """ Transform a board string
+
+        Args:
+            board (str): 81 characters board string
+
+        Returns:
+            (str): transformed board string
+        """
+        values = [int(value) for value in board]
+        if self.transposed:
+            values = [values[x * 9 + y] for y in range(9) for x in range(9)]
+        return "".join(str(self.labels[values[row * 9 + column]]) for row in self.rows for column in self.columns)
+
+    def invert(self, board: str) -> str:
+        """ Map a transformed board string back to the original layout and values
+
+        Args:
+            board (str): 81 characters transformed board string
+
+        Returns:
+            (str): board string before transformation
+        """
+        original_labels = [0] * 10
+        for value, label in enumerate(self.labels):
+            original_labels[label] = value
+        values = [0] * 81
+        for y, row in enumerate(self.rows):
+            for x, column in enumerate(self.columns):
+                values[row * 9 + column] = original_labels[int(board[y * 9 + x])]
+        if self.transposed:
+            values = [values[x * 9 + y] for y in range(9) for x in range(9)]
+        return "".join(map(str, values))
+
+
+class SolutionCache(SudokuBase):
+    """ LRU cache of solutions, keyed by canonical form of the puzzle, so that a puzzle equivalent to an already solved
+    one (under relabeling of values, permutations of rows / columns within bands / stacks, band / stack swaps or
+    transposition) is answered without solving.
+
+    Canonical form is the lexicographically smallest transformed board among transformations that order bands, rows,
+    stacks and columns by clue-count invariants (clues of a line, grouped by block and weighted by clues of crossing
+    lines). Lines with equal invariants are tried in every order as long as the number of candidate transformations of
+    both axes together fits `tie_budget`, otherwise their original order is kept - this may only lead to a miss for an
+    equivalent puzzle, never to a wrong solution. Orders are not expanded before their number is known to fit, so highly
+    symmetric grids cannot blow the work up.
+
+    Puzzles with fewer than `min_clues` clues (an empty board, a single given) bypass the cache: they have many
+    solutions and are solved by a few guesses, faster than they are canonicalized.
+
+    Attributes:
+        max_bytes (int): memory budget of cached entries
+        tie_budget (int): maximal number of candidate transformations tried when canonicalizing
+        min_clues (int): minimal number of clues of puzzles looked up and stored
+        size_bytes (int): estimated memory taken by cached entries
+        hits (int): number of lookups answered from cache
+        misses (int): number of lookups not found in cache
+        evictions (int): number of entries evicted to stay within memory budget
+        skipped (int): number of lookups of puzzles bypassing the cache
+    """
+
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, tie_budget: int = 128, logger_name: str = "SolutionCache",
+                 logging_level: int = 10, min_clues: int = 17):
+        super().__init__(logger_name, logging_level)
+        self.max_bytes = max_bytes
+        self.tie_budget = tie_budget
+        self.min_clues = min_clues
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.skipped = 0
+        self._entries = OrderedDict()  # type: OrderedDict[str, str]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """ Get cache counters
+
+        Returns:
+            (dict): entries, size_bytes, hits, misses, evictions, skipped and hit_ratio
+        """
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "size_bytes": self.size_bytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions, "skipped": self.skipped,
+                "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+    def get(self, puzzle: str) -> str | None:
+        """ Get a solution of puzzle equivalent to given one, mapped back to the puzzle's layout
+
+        Args:
+            puzzle (str): 81 characters board string
+
+        Returns:
+            (str | None): solution string, None if not cached (or if the puzzle bypasses the cache)
+        """
+        if not self.cacheable(puzzle):
+            self.skipped += 1
+            return None
+        key, transform = self.canonical(puzzle)
+        solution = self._entries.get(key)
+        if solution is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return transform.invert(solution)
+
+    def put(self, puzzle: str, solution: str):
+        """ Cache a solution of the puzzle, evicting least recently used entries if memory budget is exceeded
+
+        Args:
+            puzzle (str): 81 characters board string
+            solution (str): 81 characters solution string
+        """
+        if not self.cacheable(puzzle):
+            return
+        key, transform = self.canonical(puzzle)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        self._entries[key] = transform.apply(solution)
+        self.size_bytes += self._entry_size(key)
+        while self.size_bytes > self.max_bytes and self._entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self.size_bytes -= self._entry_size(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        """ Remove all entries, keeping counters
+        """
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def cacheable(self, puzzle: str) -> bool:
+        """ Check if the puzzle has enough clues to be looked up and stored (see class description)
+
+        Args:
+            puzzle (str): 81 characters board string
+
+        Returns:
+            (bool): True if the puzzle goes through the cache
+        """
+        return 81 - puzzle.count("0") >= self.min_clues
+
+    @classmethod
+    def _entry_size(cls, key: str) -> int:
+        return 2 * sys.getsizeof(key) + cls.ENTRY_OVERHEAD
+
+    def canonical(self, puzzle: str) -> Tuple[str, Transform]:
+        """ Find canonical form of the puzzle
+
+        Args:
+            puzzle (str): 81 characters board string
+
+        Returns:
+            (str, Transform): canonical board string and transformation mapping the puzzle to it
+        """
+        values = [int(value) for value in puzzle]
+        transposed_values = [values[x * 9 + y] for y in range(9) for x in range(9)]
+
+        layouts = []
+        for transposed, grid in ((False, values), (True, transposed_values)):
+            rows = self._line_groups(grid, transposed=False)
+            columns = self._line_groups(grid, transposed=True)
+            layouts.append(((rows[-1], columns[-1]), transposed, grid, rows, columns))
+        signature = min(layout[0] for layout in layouts)
+        layouts = [layout for layout in layouts if layout[0] == signature]
+
+        # ties of an axis are expanded if its orders fit the budget, and only if candidates of all layouts fit it too
+        budget = self.tie_budget
+
+        def fitting(count: int) -> int:
+            return count if count <= budget else 1
+
+        if sum(fitting(rows[2]) * fitting(columns[2]) for _, _, _, rows, columns in layouts) > budget:
+            layouts = [(signature, transposed, grid, rows[:2] + (budget + 1,), columns[:2] + (budget + 1,))
+                       for signature, transposed, grid, rows, columns in layouts[:1]]
+        layouts = [(signature, transposed, grid, self._line_orders(*rows[:2], rows[2] <= budget),
+                    self._line_orders(*columns[:2], columns[2] <= budget))
+                   for signature, transposed, grid, rows, columns in layouts]
+
+        best = None
+        for _, transposed, grid, row_orders, column_orders in layouts:
+            for rows, columns in product(row_orders, column_orders):
+                labels = [0] * 10
+                next_label = 1
+                board = []
+                for row in rows:
+                    offset = row * 9
+                    for column in columns:
+                        value = grid[offset + column]
+                        if value and not labels[value]:
+                            labels[value] = next_label
+                            next_label += 1
+                        board.append(labels[value])
+                if best is None or board < best[0]:
+                    best = (board, transposed, rows, columns, labels)
+
+        board, transposed, rows, columns, labels = best
+        next_label = max(labels) + 1
+        for value in range(1, 10):
+            if not labels[value]:
+                labels[value] = next_label
+                next_label += 1
+        return "".join(map(str, board)), Transform(transposed, rows, columns, tuple(labels))
+
+    def _line_groups(self, grid: List[int], transposed: bool) -> tuple:
+        """ Order blocks and rows (or columns if transposed) by clue-count invariants, grouping ones with equal
+        invariants
+
+        Args:
+            grid (list[int]): board values
+            transposed (bool): True to order columns instead of rows
+
+        Returns:
+            (tuple): groups of blocks, groups of lines of every block, number of orders of lines with ties expanded and
+                     signature of the layout
+        """
+        def clue(line, position):
+            return 1 if grid[position * 9 + line if transposed else line * 9 + position] else 0
+
+        crossing_counts = [sum(clue(line, position) for line in range(9)) for position in range(9)]
+        line_keys = [(sum(clue(line, position) for position in range(9)),
+                      tuple(sorted(tuple(sorted(crossing_counts[position]
+                                                for position in range(block * 3, block * 3 + 3)
+                                                if clue(line, position)))
+                                   for block in range(3))))
+                     for line in range(9)]
+        block_keys = [tuple(sorted(line_keys[line] for line in range(block * 3, block * 3 + 3))) for block in range(3)]
+
+        block_groups = self._tie_groups(range(3), block_keys)
+        line_groups = [self._tie_groups(range(block * 3, block * 3 + 3), line_keys) for block in range(3)]
+        count = 1
+        for groups in [block_groups] + line_groups:
+            for group in groups:
+                count *= factorial(len(group))
+        return block_groups, line_groups, count, tuple(sorted(block_keys))
+
+    def _line_orders(self, block_groups: List[Tuple[int, ...]], line_groups: List[List[Tuple[int, ...]]],
+                     expand: bool) -> List[Tuple[int, ...]]:
+        """ Make line orders of grouped blocks and lines
+
+        Args:
+            block_groups (list[tuple[int, ...]]): groups of blocks with equal invariants
+            line_groups (list[list[tuple[int, ...]]]): groups of lines with equal invariants of every block
+            expand (bool): True to try every order of lines in a group, False to keep their original order
+
+        Returns:
+            (list[tuple[int, ...]]): possible line orders
+        """
+        if expand:
+            block_options = self._expand(block_groups)
+            line_options = [self._expand(groups) for groups in line_groups]
+        else:
+            block_options = [tuple(block for group in block_groups for block in group)]
+            line_options = [[tuple(line for group in groups for line in group)] for groups in line_groups]
+
+        orders = []
+        for blocks in block_options:
+            for lines in product(*(line_options[block] for block in blocks)):
+                orders.append(tuple(line for block_lines in lines for line in block_lines))
+        return orders
+
+    @staticmethod
+    def _tie_groups(items: range, keys: list) -> List[Tuple[int, ...]]:
+        ordered = sorted(items, key=lambda item: keys[item])
+        groups = []
+        for item in ordered:
+            if groups and keys[groups[-1][-1]] == keys[item]:
+                groups[-1] = groups[-1] + (item,)
+            else:
+                groups.append((item,))
+        return groups
+
+    @staticmethod
+    def _expand(groups: List[Tuple[int, ...]]) -> List[Tuple[int, ...]]:
+        return [tuple(item for group in arrangement for item in group)
+                for arrangement in product(*(list(permutations(group)) for group in groups))]
@@ -11,10 +11,33 @@ class SudokuContainer(SudokuBase):
     Attributes:
         fields (list): a list of fields in the container
     """
+
+    __slots__ = ("fields",)
+
     def __init__(self, logger_name: str = "SudokuContainer", logging_level: int = 10):
         super().__init__(logger_name, logging_level)
         self.fields = []  # type: list[Field]
 
+    def view(self, fields: List[Field], logging_level: int = None) -> "SudokuContainer":
+        """ Create the same container holding fields of another sudoku (e.g. of a clone), sharing its logger
+
+        Args:
+            fields (list[Field]): all fields of the other sudoku, ordered by index
+            logging_level (int): logging level of the view (e.g. of the sudoku owning it), level of this container if
+                                 not given
+
+        Returns:
+            (SudokuContainer): container of the same kind and position
+        """
+        container = self.__class__.__new__(self.__class__)
+        for cls in type(self).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                setattr(container, name, getattr(self, name))
+        container.fields = [fields[field.index] for field in self.fields]
+        if logging_level is not None:
+            container.logging_level = logging_level
+        return container
+
     def get_fields_values(self) -> List[FieldValue]:
         """ Get values from all fields in the container
 
@@ -51,7 +74,7 @@ class SudokuContainer(SudokuBase):
             value (FieldValue): a value to remove
         """
         for field in self.fields:
-            if value in field.possible_values:
+            if field.is_possible(value):
                 field.eliminate(value)
 
     def empty_fields(self) -> List[Field]:
@@ -1,5 +1,6 @@
-from backend._base import SudokuBase
-from backend.consts import Position, FieldValue
+from bisect import insort
+
+from backend.consts import Position
 from backend.sudoku.containers.container import SudokuContainer
 from backend.sudoku.field import Field
 
@@ -10,6 +11,9 @@ class Line(SudokuContainer):
     Attributes:
         number (int): a distinctive number of a line (it's position)
     """
+
+    __slots__ = ("number",)
+
     def __init__(self, number: int = None, logger_name: str = "Line", logging_level: int = 10):
         super().__init__(logger_name, logging_level)
         self.number = number
@@ -19,6 +23,9 @@ class Line(SudokuContainer):
 
 
 class Row(Line):
+
+    __slots__ = ()
+
     def __init__(self, number: Position, logger_name: str = "Row", logging_level: int = 10):
         super().__init__(number, f"{logger_name}_{number}", logging_level)
 
@@ -26,11 +33,13 @@ class Row(Line):
         if field.y_pos != self.number:
             self.log_warning(f"{field} in row {field.y_pos} can't be added to row {self.number}")
             return
-        super().add(field)
-        self.fields = sorted(self.fields, key=lambda f: f.x_pos)
+        insort(self.fields, field, key=lambda f: f.x_pos)
 
 
 class Column(Line):
+
+    __slots__ = ()
+
     def __init__(self, number: Position, logger_name: str = "Column", logging_level: int = 10):
         super().__init__(number, f"{logger_name}_{number}", logging_level)
 
@@ -38,5 +47,4 @@ class Column(Line):
         if field.x_pos != self.number:
             self.log_warning(f"{field} in column {field.x_pos} can't be added to column {self.number}")
             return
-        super().add(field)
-        self.fields = sorted(self.fields, key=lambda f: f.y_pos)
+        insort(self.fields, field, key=lambda f: f.y_pos)
@@ -4,6 +4,9 @@ from backend.sudoku.field import Field
 
 
 class Square(SudokuContainer):
+
+    __slots__ = ("location",)
+
     def __init__(self, location: SquareLocation, logger_name: str = "Square", logging_level: int = 10):
         super().__init__(f"{logger_name}_{location}", logging_level)
         self.location = location
@@ -1,24 +1,32 @@
 from backend._base import SudokuBase
-from backend.consts import FieldValue, Position
+from backend.consts import FieldValue, Position, SYMBOLS
+from backend.helpers import values_to_mask, mask_to_values, field_value
+from backend.sudoku.board import Board
 from typing import Set, Tuple, Iterable
 
 
 class Field(SudokuBase):
-    """ Class implementing a single field in sudoku.
+    """ Class implementing a single field in sudoku, being a view over one cell of a `Board`.
 
     Attributes:
         x_pos (Position): x position
         y_pos (Position): y position
-        value (FieldValue): value of the field
+        board (Board): board keeping the state of the field
+        index (int): index of the field on the board
+        value (FieldValue | int): value of the field (int for values above 9 of bigger boards)
         guessed (bool): True if value of the field is not certain (not solved using classical methods), but guessed
         given (bool): True if value is set from the beginning
+        candidates (int): bit mask of possible values for the field
         possible_values (set): a set of possible values for the field
         possible_values_before_guess (set): helper set to save state of possible values when guessing
         possible_values_while_guessing (set): helper set to keep ytack of possible values after guessing
     """
 
+    __slots__ = ("x_pos", "y_pos", "board", "index", "guessed", "given", "_candidates_before_guess",
+                 "_candidates_while_guessing")
+
     def __init__(self, x_pos: Position, y_pos: Position, value: FieldValue = FieldValue.NONE,
-                 logger_name: str = "Field", logging_level: int = 10):
+                 logger_name: str = "Field", logging_level: int = 10, board: Board = None):
         """
         Args:
             x_pos (Position | int): x position of the field
@@ -26,16 +34,81 @@ class Field(SudokuBase):
             value (FieldValue): field's value
             logger_name (str): logger name
             logging_level (int): logging level
+            board (Board): board to view, a new one is created if not given (existing state is kept otherwise)
         """
         super().__init__(logger_name=f"{logger_name} ({x_pos},{y_pos})", logging_level=logging_level)
         self.x_pos = x_pos
         self.y_pos = y_pos
-        self.value = value
+        self.board = board if board is not None else Board()
+        self.index = x_pos + y_pos * self.board.SIDE
         self.guessed = False
         self.given = False
-        self.possible_values = FieldValue.get_possible_values() if self.value == FieldValue.NONE else set()
-        self.possible_values_before_guess = set()
-        self.possible_values_while_guessing = self.possible_values.copy()
+        if value or board is None:
+            self.value = value
+            self.candidates = 0 if value else self.candidates
+        self._candidates_before_guess = 0
+        self._candidates_while_guessing = self.candidates
+
+    def view(self, board: Board, logging_level: int = None) -> "Field":
+        """ Create the same field viewing another board (e.g. a copy of its board), sharing its logger
+
+        Args:
+            board (Board): board to view
+            logging_level (int): logging level of the view (e.g. of the sudoku owning it), level of this field if not
+                                 given
+
+        Returns:
+            (Field): field at the same position, with the same flags
+        """
+        field = Field.__new__(Field)
+        field.logger, field.logger_name = self.logger, self.logger_name
+        field.logging_level = self.logging_level if logging_level is None else logging_level
+        field.x_pos, field.y_pos, field.index = self.x_pos, self.y_pos, self.index
+        field.board = board
+        field.guessed, field.given = self.guessed, self.given
+        field._candidates_before_guess = self._candidates_before_guess
+        field._candidates_while_guessing = self._candidates_while_guessing
+        return field
+
+    @property
+    def value(self) -> FieldValue | int:
+        return field_value(self.board.values[self.index])
+
+    @value.setter
+    def value(self, value: FieldValue):
+        self.board.values[self.index] = int(value)
+
+    @property
+    def candidates(self) -> int:
+        return self.board.candidates[self.index]
+
+    @candidates.setter
+    def candidates(self, mask: int):
+        self.board.candidates[self.index] = mask
+
+    @property
+    def possible_values(self) -> Set[FieldValue]:
+        return mask_to_values(self.candidates)
+
+    @possible_values.setter
+    def possible_values(self, values: Iterable[FieldValue]):
+        self.candidates = values_to_mask(values)
+
+    @property
+    def possible_values_before_guess(self) -> Set[FieldValue]:
+        return mask_to_values(self._candidates_before_guess)
+
+    @possible_values_before_guess.setter
+    def possible_values_before_guess(self, values: Iterable[FieldValue]):
+        self._candidates_before_guess = values_to_mask(values)
+
+    @property
+    def possible_values_while_guessing(self) -> Set[FieldValue]:
+        return mask_to_values(self._candidates_while_guessing)
+
+    @possible_values_while_guessing.setter
+    def possible_values_while_guessing(self, values: Iterable[FieldValue]):
+        self._candidates_while_guessing = values_to_mask(values)
 
     def set(self, value: FieldValue):
         """ Set a value of the Field as given from the start
@@ -55,11 +128,11 @@ class Field(SudokuBase):
         Returns:
             (FieldValue): a value of the field
         """
-        self.log_debug(f"Guessing with value {value}")
+        self.log_debug("Guessing with value %s", value)
         self.value = value
         self.guessed = True
-        self.possible_values_before_guess = self.possible_values.copy()
-        self.possible_values = set()
+        self._candidates_before_guess = self.candidates
+        self.candidates = 0
         return self.value
 
     def restore_guess(self):
@@ -67,8 +140,8 @@ class Field(SudokuBase):
         """
         self.value = FieldValue.NONE
         self.guessed = False
-        self.possible_values = self.possible_values_before_guess.copy()
-        self.possible_values_before_guess = set()
+        self.candidates = self._candidates_before_guess
+        self._candidates_before_guess = 0
 
     def position(self) -> Tuple[Position, Position]:
         """ Get a tuple with field's position
@@ -81,7 +154,7 @@ class Field(SudokuBase):
     def print_position(self):
         """ Return a string with field's position
         """
-        return f"Field ({self.x_pos.value}, {self.y_pos.value})"
+        return f"Field ({int(self.x_pos)}, {int(self.y_pos)})"
 
     def eliminate(self, values: FieldValue | Iterable[FieldValue], guess: bool = False):
         """ Remove possible values from the field
@@ -90,13 +163,23 @@ class Field(SudokuBase):
             values (FieldValue | Iterable[FieldValue]): a value or a list of values to remove
             guess (bool): decide which set to eliminate value from
         """
-        self.log_debug(f"Removing values {values} from field {self.position()}")
-        if isinstance(values, FieldValue):
-            values = [values.value]
+        self.log_debug("Removing values %s from field (%s, %s)", values, self.x_pos, self.y_pos)
+        mask = values_to_mask(values)
         if guess:
-            self.possible_values_while_guessing -= set(values)
+            self._candidates_while_guessing &= ~mask
         else:
-            self.possible_values -= set(values)
+            self.candidates &= ~mask
+
+    def is_possible(self, value: FieldValue) -> bool:
+        """ Check if value is still possible for the field
+
+        Args:
+            value (FieldValue): value to check
+
+        Returns:
+            (bool): True if value is among field's candidates
+        """
+        return bool(self.candidates & self.board.VALUE_MASKS[value])
 
     def get_random_possible_value(self) -> FieldValue:
         """ Get a random value from possible ones
@@ -104,7 +187,7 @@ class Field(SudokuBase):
         Returns:
             (FieldValue): a value from possible_values set
         """
-        return list(self.possible_values)[0]
+        return field_value(self.board.LOWEST_CANDIDATE[self.candidates])
 
     def get_last_possible_value(self) -> FieldValue:
         """ Get last possible value that a field can have
@@ -112,10 +195,10 @@ class Field(SudokuBase):
         Returns:
             (FieldValue): a value
         """
-        if len(self.possible_values) > 1:
+        if self.board.CANDIDATES_COUNT[self.candidates] > 1:
             raise RuntimeError("There are more possible values than one")
-        for value in self.possible_values:
-            return value
+        if self.candidates:
+            return field_value(self.board.LOWEST_CANDIDATE[self.candidates])
 
     def limit(self,
               vals_in_square: list[FieldValue] | Set[FieldValue] = None,
@@ -134,16 +217,13 @@ class Field(SudokuBase):
             (set[FieldValue]): set of possible values
         """
         if self.value:
-            if self.possible_values:
-                self.possible_values = set()
+            self.candidates = 0
 
         else:
-            if any(value in self.possible_values for value in vals_in_square):
-                self.eliminate(vals_in_square, guess)
-            if any(value in self.possible_values for value in vals_in_row):
-                self.eliminate(vals_in_row, guess)
-            if any(value in self.possible_values for value in vals_in_column):
-                self.eliminate(vals_in_column, guess)
+            taken = values_to_mask(vals_in_square or ()) | values_to_mask(vals_in_row or ()) | \
+                values_to_mask(vals_in_column or ())
+            if taken & (self.candidates if not guess else self._candidates_while_guessing):
+                self.eliminate(mask_to_values(taken), guess)
 
         return self.possible_values if not guess else self.possible_values_while_guessing
 
@@ -155,24 +235,23 @@ class Field(SudokuBase):
         """
         if not self.value:
             if value:
-                if value not in self.possible_values:
+                if not self.is_possible(value):
                     self.log_error(f"Value {value} is not in possible values for this field ({self.possible_values})")
                     raise RuntimeError(f"Value {value} is not in possible values for this field ({self.possible_values})")
                 self.value = value
-                self.log_debug(f"Field ({self.x_pos}, {self.y_pos}) filled with {self.value}")
+                self.log_debug("Field (%s, %s) filled with %s", self.x_pos, self.y_pos, self.value)
 
-            elif len(self.possible_values) == 1:
-                for value in self.possible_values:
-                    self.value = value
-                self.possible_values = set()
-                self.log_debug(f"Field ({self.x_pos}, {self.y_pos}) filled with {self.value}")
+            elif self.board.CANDIDATES_COUNT[self.candidates] == 1:
+                self.value = field_value(self.board.LOWEST_CANDIDATE[self.candidates])
+                self.candidates = 0
+                self.log_debug("Field (%s, %s) filled with %s", self.x_pos, self.y_pos, self.value)
         return self.value
 
     def __str__(self):
-        return str(self.value)
+        return SYMBOLS[self.board.values[self.index]]
 
     def __repr__(self):
         return f"Field ({self.x_pos}, {self.y_pos}), value: {self.value}"
 
     def __bool__(self):
-        return bool(self.value.value)
+        return bool(self.board.values[self.index])
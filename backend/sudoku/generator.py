@@ -0,0 +1,271 @@
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple, List
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.consts import Difficulty, CELLS, SQUARE_CELLS, SYMBOLS
+from backend.ingestion.corpus import CorpusWriter
+from backend.sudoku.board import Board
+from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.techniques import HiddenSingles, ALL_TECHNIQUES
+
+
+class PuzzleGenerator(SudokuBase):
+    """ Generator of sudoku puzzles with a unique solution.
+
+    A random complete grid is made by filling three diagonal squares (which are independent of each other) with random
+    permutations and solving the rest. Clues are then removed in random order, as long as the solution stays unique (and
+    the puzzle does not get harder than target difficulty), until target number of clues is reached.
+
+    Attributes:
+        seed (int): seed of the random generator
+        random (random.Random): random generator
+        solver (ClassicSolver): solver used to complete grids and check uniqueness
+    """
+
+    MIN_CLUES = 17
+    MAX_ATTEMPTS = 100
+
+    DIFFICULTY_TECHNIQUES = {
+        Difficulty.EASY: (),
+        Difficulty.MEDIUM: (HiddenSingles(),),
+        Difficulty.HARD: ALL_TECHNIQUES,
+    }
+
+    def __init__(self, seed: int = None, logger_name: str = "PuzzleGenerator", logging_level: int = 10):
+        super().__init__(logger_name, logging_level)
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.solver = ClassicSolver(logging_level=logging_level)
+
+    def grid(self) -> List[int]:
+        """ Create a random complete grid
+
+        Returns:
+            (list[int]): values of all 81 fields
+        """
+        board = Board()
+        for square in (0, 4, 8):
+            for index, value in zip(SQUARE_CELLS[square], self.random.sample(range(1, 10), 9)):
+                board.values[index] = value
+        board.limit_candidates()
+        self.solver.solve_board(board)
+        return board.values[:]
+
+    def is_unique(self, values: List[int]) -> bool:
+        """ Check if board with given values has exactly one solution
+
+        Args:
+            values (list[int]): values of all 81 fields, 0 for empty ones
+
+        Returns:
+            (bool): True if there is exactly one solution
+        """
+        board = Board(values)
+        board.limit_candidates()
+        return sum(1 for _ in self.solver.board_solutions(board, limit=2)) == 1
+
+    @classmethod
+    def rate(cls, values: List[int]) -> Difficulty:
+        """ Rate difficulty of a puzzle by the simplest set of techniques solving it without guessing
+
+        Args:
+            values (list[int]): values of all 81 fields, 0 for empty ones
+
+        Returns:
+            (Difficulty): difficulty of the puzzle
+        """
+        for difficulty, techniques in cls.DIFFICULTY_TECHNIQUES.items():
+            board = Board(values)
+            board.limit_candidates()
+            board.queue_singles()
+            if ClassicSolver.deduce(board, techniques) and board.is_complete():
+                return difficulty
+        return Difficulty.EXPERT
+
+    def puzzle(self, clues: int = None, difficulty: Difficulty = None) -> Tuple[str, str, Difficulty]:
+        """ Generate a puzzle with a unique solution
+
+        Args:
+            clues (int): target number of clues, as few as possible if not given (and no difficulty is given)
+            difficulty (Difficulty): target difficulty, clues are not removed if puzzle would get harder
+
+        Returns:
+            (str, str, Difficulty): puzzle string, solution string and difficulty of the puzzle
+        """
+        clues = max(clues or self.MIN_CLUES, self.MIN_CLUES)
+        for _ in range(self.MAX_ATTEMPTS):
+            solution = self.grid()
+            values = solution[:]
+            remaining = len(CELLS)
+            for index in self.random.sample(CELLS, len(CELLS)):
+                if remaining <= clues:
+                    break
+                value = values[index]
+                values[index] = 0
+                if not self.is_unique(values) or (difficulty is not None and self.rate(values) > difficulty):
+                    values[index] = value
+                    continue
+                remaining -= 1
+            rating = self.rate(values)
+            if difficulty is None or rating == difficulty:
+                return "".join(map(str, values)), "".join(map(str, solution)), rating
+        self.log_error(f"Could not generate a puzzle with {clues} clues and {difficulty} difficulty")
+        raise RuntimeError(f"Could not generate a puzzle with {clues} clues and {difficulty} difficulty")
+
+    def pattern_grid(self, box_size: int = 3) -> List[int]:
+        """ Create a random complete grid of any size, by shuffling a patterned grid: values are relabeled, rows and
+        columns are permuted within their bands and stacks, and bands and stacks are permuted as well
+
+        Args:
+            box_size (int): side of a square, 3 for a 9x9 grid
+
+        Returns:
+            (list[int]): values of all fields
+        """
+        side = box_size * box_size
+
+        def shuffled_lines() -> List[int]:
+            bands = self.random.sample(range(box_size), box_size)
+            return [band * box_size + line for band in bands for line in self.random.sample(range(box_size), box_size)]
+
+        labels = [0] + self.random.sample(range(1, side + 1), side)
+        rows, columns = shuffled_lines(), shuffled_lines()
+        return [labels[(box_size * (row % box_size) + row // box_size + column) % side + 1]
+                for row in rows for column in columns]
+
+    def sized_puzzle(self, box_size: int, empty_ratio: float = 0.5, needs_guess: bool = False) -> Tuple[str, str]:
+        """ Generate a puzzle of any size, emptying random fields of a `pattern_grid`. Unlike `puzzle`, uniqueness of
+        the solution is not checked (which is too slow for 25x25 boards), such puzzles are meant for benchmarks.
+
+        A fixed ratio of empty fields does not give puzzles of the same difficulty at every size (larger boards are
+        left to singles alone at ratios making 9x9 boards need a search), so with `needs_guess` as many fields are
+        emptied as needed for the techniques of `solver` to get stuck, making the search of any size start with a guess.
+
+        Args:
+            box_size (int): side of a square, 4 for 16x16 puzzle, 5 for 25x25 puzzle
+            empty_ratio (float): fraction of fields to empty, ignored if `needs_guess` is True
+            needs_guess (bool): True to empty fields (in random order) until the puzzle cannot be solved without
+                                guessing
+
+        Returns:
+            (str, str): puzzle string and solution string
+        """
+        solution = self.pattern_grid(box_size)
+        order = self.random.sample(range(len(solution)), len(solution))
+        if needs_guess:
+            # solving gets only harder with more fields emptied, so the fewest of them making deduction get stuck are
+            # found with a binary search over emptied prefixes of the random order
+            low, high = 0, len(order)
+            while low < high:
+                middle = (low + high) // 2
+                if self._deduced(self._emptied(solution, order[:middle]), box_size):
+                    low = middle + 1
+                else:
+                    high = middle
+            values = self._emptied(solution, order[:low])
+        else:
+            values = self._emptied(solution, order[:round(len(solution) * empty_ratio)])
+        return "".join([SYMBOLS[value] for value in values]), "".join([SYMBOLS[value] for value in solution])
+
+    @staticmethod
+    def _emptied(values: List[int], indexes: List[int]) -> List[int]:
+        """ Copy values with fields of given indexes emptied
+        """
+        values = values[:]
+        for index in indexes:
+            values[index] = 0
+        return values
+
+    def _deduced(self, values: List[int], box_size: int) -> bool:
+        """ Check if techniques of the solver complete the board of given values without guessing
+        """
+        board = Board.sized(box_size)(values)
+        board.limit_candidates()
+        board.queue_singles()
+        return ClassicSolver.deduce(board, self.solver.techniques) and board.is_complete()
+
+    def puzzles(self, count: int, clues: int = None, difficulty: Difficulty = None) -> Tuple[np.ndarray, ...]:
+        """ Generate many puzzles
+
+        Args:
+            count (int): number of puzzles
+            clues (int): target number of clues
+            difficulty (Difficulty): target difficulty
+
+        Returns:
+            (np.ndarray, np.ndarray, np.ndarray): (N, 81) puzzles, (N, 81) solutions and (N,) difficulties
+        """
+        puzzles = np.zeros((count, 81), dtype=np.uint8)
+        solutions = np.zeros((count, 81), dtype=np.uint8)
+        ratings = np.zeros(count, dtype=np.uint16)
+        for idx in range(count):
+            puzzle, solution, rating = self.puzzle(clues, difficulty)
+            puzzles[idx] = [int(value) for value in puzzle]
+            solutions[idx] = [int(value) for value in solution]
+            ratings[idx] = rating
+        return puzzles, solutions, ratings
+
+
+def _generate_chunk(seed: int, count: int, clues: int, difficulty: Difficulty,
+                    logging_level: int) -> Tuple[np.ndarray, ...]:
+    """ Generate a chunk of puzzles in a worker process
+
+    Returns:
+        (np.ndarray, np.ndarray, np.ndarray): puzzles, solutions and difficulties
+    """
+    return PuzzleGenerator(seed=seed, logging_level=logging_level).puzzles(count, clues, difficulty)
+
+
+def generate_to_file(path: str, count: int, clues: int = None, difficulty: Difficulty = None, seed: int = 0,
+                     workers: int = None, chunk_size: int = 100, logging_level: int = 20) -> float:
+    """ Generate puzzles in a pool of processes and stream them to a binary corpus file (see `CorpusWriter`), with
+    solutions and difficulties. Chunk `n` is generated with seed `seed + n`, so output is reproducible for given seed.
+
+    Args:
+        path (str): path of the corpus file
+        count (int): number of puzzles
+        clues (int): target number of clues
+        difficulty (Difficulty): target difficulty
+        seed (int): base seed
+        workers (int): number of worker processes, all cores if not given
+        chunk_size (int): number of puzzles generated by a worker at once
+        logging_level (int): logging level
+
+    Returns:
+        (float): generated boards per second per worker
+    """
+    workers = workers or os.cpu_count() or 1
+    logger = SudokuBase("PuzzleGenerator", logging_level)
+    start_time = time.time()
+    chunks = [(seed + number, min(chunk_size, count - start))
+              for number, start in enumerate(range(0, count, chunk_size))]
+    with CorpusWriter(path, with_solutions=True, logging_level=logging_level) as writer, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        for puzzles, solutions, ratings in executor.map(_generate_chunk, *zip(*chunks), [clues] * len(chunks),
+                                                        [difficulty] * len(chunks), [logging_level] * len(chunks)):
+            writer.write(puzzles, solutions, ratings=ratings)
+            logger.log_debug("%s/%s puzzles written to %s", writer.count, count, path)
+    rate = count / (time.time() - start_time) / workers
+    logger.log_info("Generated %s puzzles in %s seconds, %s boards/s per core", count, time.time() - start_time, rate)
+    return rate
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate sudoku puzzles with unique solutions into a corpus file")
+    parser.add_argument("path")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--clues", type=int, default=None)
+    parser.add_argument("--difficulty", choices=[difficulty.name for difficulty in Difficulty], default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    arguments = parser.parse_args()
+    generate_to_file(arguments.path, arguments.count, arguments.clues,
+                     Difficulty[arguments.difficulty] if arguments.difficulty else None, arguments.seed,
+                     arguments.workers, arguments.chunk_size)
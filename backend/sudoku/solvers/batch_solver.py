@@ -0,0 +1,150 @@
+import time
+from typing import Tuple
+
+import numpy as np
+
+from backend.consts import SolvingStatus, UNITS, CELL_UNITS, ROW_CELLS, COLUMN_CELLS, SQUARE_CELLS
+from backend.sudoku.board import Board
+from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.solver import Solver, SolverStats
+
+
+class BatchSolver(Solver):
+    """ Solver working on many sudokus at once, given as (N, 81) uint8 array of values (0 for empty fields).
+
+    Candidates of the whole batch are kept as (N, 81, 9) boolean tensor and naked / hidden singles are propagated
+    with array operations. Only sudokus left unsolved after propagation are passed to `ClassicSolver` search.
+    Statistics of a batch are statistics of the vectorized propagation summed up with statistics of all searches.
+    Statuses of single sudokus are returned by `solve`, while `status` is SOLVED once the whole batch is processed
+    (or TIMED_OUT / CANCELLED if the batch was stopped).
+    """
+
+    UNITS = np.array(UNITS, dtype=np.intp)
+    CELL_UNITS = np.array(CELL_UNITS, dtype=np.intp)
+    # cells of every kind of units (rows, columns, squares) in unit order, and its inverse mapping back to cell order
+    PARTITIONS = tuple(np.array(cells, dtype=np.intp).ravel() for cells in (ROW_CELLS, COLUMN_CELLS, SQUARE_CELLS))
+    INVERSE_PARTITIONS = tuple(np.argsort(partition) for partition in PARTITIONS)
+    BITS = 1 << np.arange(9, dtype=np.int64)
+
+    def __init__(self, logger_name: str = "BatchSolver", logging_level: int = 10):
+        super().__init__(logger_name=logger_name, logging_level=logging_level)
+        self.search_solver = ClassicSolver(logging_level=logging_level)
+
+    def solve(self, puzzles: np.ndarray, timeout: float = None, deadline: float = None, cancel=None,
+              puzzle_timeout: float = None) -> Tuple[np.ndarray, np.ndarray]:
+        """ Solve a batch of sudokus. Limits are checked by the search of every sudoku, sudokus not searched before
+        the batch is stopped get its status (TIMED_OUT or CANCELLED), left with values found by propagation.
+
+        Args:
+            puzzles (np.ndarray): (N, 81) array of values, 0 for empty fields
+            timeout (float): seconds the whole batch may take
+            deadline (float): `time.monotonic()` value to stop the batch at
+            cancel (threading.Event): event cancelling the batch when set
+            puzzle_timeout (float): seconds search of a single sudoku may take, so that one hard sudoku does not
+                                    use up time of the whole batch
+
+        Returns:
+            (np.ndarray, np.ndarray): (N, 81) uint8 array of solutions (or partially filled boards if not solved)
+                                      and (N,) uint8 array of `SolvingStatus` values
+        """
+        puzzles = np.asarray(puzzles, dtype=np.uint8)
+        if puzzles.ndim != 2 or puzzles.shape[1] != 81 or (puzzles > 9).any():
+            self.log_error(f"Puzzles should be given as (N, 81) array of values 0-9, got {puzzles.shape}")
+            raise RuntimeError(f"Puzzles should be given as (N, 81) array of values 0-9, got {puzzles.shape}")
+
+        start_time = time.time()
+        self.limit(timeout, deadline, cancel)
+        self.stats = SolverStats()
+        propagation_start = time.perf_counter()
+        candidates = self.candidates(puzzles)
+        consistent = self.propagate(candidates)
+        self.stats.propagation_time += time.perf_counter() - propagation_start
+
+        solutions = np.where(candidates.sum(axis=2) == 1, candidates.argmax(axis=2) + 1, 0).astype(np.uint8)
+        statuses = np.full(len(puzzles), SolvingStatus.UNSOLVABLE, dtype=np.uint8)
+        solved = consistent & (solutions != 0).all(axis=1)
+        statuses[solved] = SolvingStatus.SOLVED
+
+        to_search = np.flatnonzero(consistent & ~solved)
+        masks = (candidates[to_search].astype(np.int64) * self.BITS).sum(axis=2)
+        for idx, puzzle_masks in zip(to_search, masks):
+            board = Board(solutions[idx].tolist(), [0 if value else int(mask) for value, mask
+                                                    in zip(solutions[idx].tolist(), puzzle_masks.tolist())])
+            if self.interrupted():
+                statuses[idx] = self.status
+                continue
+            self.search_solver.solve_board(board, timeout=puzzle_timeout, deadline=self.deadline, cancel=self.cancel)
+            self.stats.add(self.search_solver.stats)
+            statuses[idx] = self.search_solver.status
+            solutions[idx] = board.values
+
+        if self.status is None:
+            self.status = SolvingStatus.SOLVED
+        self.log_info("Solved %s of %s sudokus (%s with search) in %s seconds",
+                      int((statuses == SolvingStatus.SOLVED).sum()), len(puzzles), len(to_search),
+                      time.time() - start_time)
+        return solutions, statuses
+
+    def profile_label(self, puzzles: np.ndarray = None, *args, **kwargs) -> str:
+        """ Label of a batch in profiles, its size and the first puzzle string
+        """
+        puzzles = np.asarray(puzzles, dtype=np.uint8).reshape(-1, 81)
+        first = "".join(map(str, puzzles[0].tolist())) if len(puzzles) else ""
+        return f"batch{len(puzzles)}_{first}"
+
+    @staticmethod
+    def candidates(puzzles: np.ndarray) -> np.ndarray:
+        """ Create candidates tensor for given puzzles, given fields having only their value as candidate
+
+        Args:
+            puzzles (np.ndarray): (N, 81) array of values
+
+        Returns:
+            (np.ndarray): (N, 81, 9) boolean array of candidates
+        """
+        given = puzzles != 0
+        candidates = np.ones(puzzles.shape + (9,), dtype=bool)
+        candidates[given] = np.eye(9, dtype=bool)[puzzles[given].astype(np.intp) - 1]
+        return candidates
+
+    def propagate(self, candidates: np.ndarray) -> np.ndarray:
+        """ Propagate naked and hidden singles in place, until nothing changes in any of sudokus
+
+        Args:
+            candidates (np.ndarray): (N, 81, 9) boolean array of candidates
+
+        Returns:
+            (np.ndarray): (N,) boolean array, False for sudokus where contradiction was found
+        """
+        consistent = np.ones(len(candidates), dtype=bool)
+        active = np.arange(len(candidates))
+        while active.size:
+            self.stats.propagation_passes += 1
+            cands = candidates[active]
+            before = cands.copy()
+
+            # naked singles: values of fields with single candidate are removed from all units of the field
+            filled = cands & (cands.sum(axis=2, keepdims=True) == 1)
+            units_filled = filled[:, self.UNITS, :].sum(axis=2)
+            cands &= ~(units_filled > 0)[:, self.CELL_UNITS, :].any(axis=2) | filled
+
+            # hidden singles: a value that has only one possible field in a unit is set in that field
+            units_count = cands[:, self.UNITS, :].sum(axis=2)
+            multiple_hidden = np.zeros(len(active), dtype=bool)
+            for kind, (partition, inverse) in enumerate(zip(self.PARTITIONS, self.INVERSE_PARTITIONS)):
+                single = np.repeat(units_count[:, kind * 9:(kind + 1) * 9, :] == 1, 9, axis=1)
+                hidden = (cands[:, partition, :] & single)[:, inverse, :]
+                hidden_count = hidden.sum(axis=2, keepdims=True)
+                multiple_hidden |= (hidden_count > 1).any(axis=(1, 2))
+                cands = np.where(hidden_count > 0, hidden, cands)
+
+            count = cands.sum(axis=2)
+            units_count = cands[:, self.UNITS, :].sum(axis=2)
+            broken = (count == 0).any(axis=1) | (units_count == 0).any(axis=(1, 2)) | \
+                (units_filled > 1).any(axis=(1, 2)) | multiple_hidden
+            consistent[active[broken]] = False
+
+            candidates[active] = cands
+            changed = (cands != before).any(axis=(1, 2)) & ~broken
+            active = active[changed]
+        return consistent
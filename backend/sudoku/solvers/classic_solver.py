@@ -1,111 +1,280 @@
 import time
-from copy import deepcopy
-from typing import List, Dict, Tuple
+from typing import List, Tuple, Sequence, Generator
 
-from backend.sudoku import Field, Row, Column, Square
-from backend.consts import FieldValue, SquareLocation, Position
-from backend.sudoku.solvers.solver import Solver
+from backend.sudoku import Field
+from backend.sudoku.board import Board
+from backend.consts import SolvingStatus
+from backend.sudoku.solvers.solver import Solver, SolverStats
+from backend.sudoku.solvers.techniques import Technique, DEFAULT_TECHNIQUES
 
 
 class ClassicSolver(Solver):
 
     MAX_ITERATIONS = 81*9*9
 
-    def __init__(self, logger_name: str = "ClassicSolver", logging_level: int = 10):
+    def __init__(self, logger_name: str = "ClassicSolver", logging_level: int = 10,
+                 techniques: Sequence[Technique] = DEFAULT_TECHNIQUES, by_degree: bool = False):
+        """ Solver branches on the empty field with the least candidates left (see `Board.branching_field`)
+
+        Args:
+            logger_name (str): logger name
+            logging_level (int): logging level
+            techniques (Sequence[Technique]): ordered techniques run before each branching decision
+            by_degree (bool): True to break ties of branching fields by their number of empty peers
+        """
         super().__init__(logger_name=logger_name, logging_level=logging_level)
         self.iterations = 0
-        self.stop = False
-
-    @staticmethod
-    def _get_rows_columns_squares(fields: List[Field]) -> Tuple[List[Row], List[Column], Dict[SquareLocation, Square]]:
-        rows = [Row(x) for x in Position.get_possible_values()]
-        columns = [Column(x) for x in Position.get_possible_values()]
-        squares = {x: Square(x) for x in SquareLocation.get_possible_values()}
+        self.techniques = tuple(techniques)
+        self.by_degree = by_degree
+        self.best = None  # type: List[int] | None
+        self.best_empty = 0
 
-        for row in rows:
-            row.add_many([field for field in fields if field.y_pos.value == row.number])
+    def solve(self, fields: List[Field], techniques: Sequence[Technique] = None, timeout: float = None,
+              deadline: float = None, cancel=None) -> Tuple[str, List[Field]]:
+        """ Solve sudoku given as list of fields
 
-        for column in columns:
-            column.add_many([field for field in fields if field.x_pos.value == column.number])
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+            techniques (Sequence[Technique]): techniques to use in this solve instead of ones given on init
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
 
-        for location, square in squares.items():
-            square.add_many([field for field in fields
-                             if SquareLocation.from_position(field.x_pos, field.y_pos) == location])
-        return rows, columns, squares
-
-    @staticmethod
-    def _field_for_check(fields, rows, columns, squares) -> Field:
-        most_full_containers = sorted((cnt for cnt in rows + columns + list(squares.values())),
-                                      key=lambda c: len(c.empty_fields()))
-        least_options_fields = sorted((f for f in fields if len(f.possible_values) > 1),
-                                      key=lambda f: f.possible_values)
-        guessing_field = None
-        for cnt in most_full_containers:
-            for field in least_options_fields:
-                if field in cnt.fields and (guessing_field is None or
-                                            len(field.possible_values) < len(guessing_field.possible_values)):
-                    guessing_field = field
-        return guessing_field
-
-    def solve(self, fields: List[Field]) -> Tuple[str, List[Field]]:
+        Returns:
+            (str, list[Field]): solution string and list of fields being a solution (or the most filled board reached
+                                if not solved, see `solve_board`)
+        """
         start_time = time.time()
-        solved, solution, fields = self._backtrack_solve(fields)
+        board = Board.from_fields(fields)
+        solved = self.solve_board(board, techniques, timeout, deadline, cancel)
+        solution = board.solution_string()
+        fields = self.board_fields(board, fields)
 
         solving_time = time.time() - start_time
         if solving_time > 61:
             solving_time = f"{round(solving_time // 60, 0)} minutes {solving_time % 60}"
         if solved:
-            self.log_info(f"Solved in {self.iterations} iterations")
+            self.log_info("Solved in %s iterations", self.iterations)
+            self.log_debug("Statistics: %s", self.stats)
         else:
-            self.log_warning(f"Sudoku could not be solved within {self.iterations} iterations")
-        self.log_info(f"Solving time using {self.__class__.__name__}: {solving_time} seconds")
+            self.log_warning("Sudoku could not be solved within %s iterations: %s", self.iterations,
+                             self.status.name)
+        self.log_info("Solving time using %s: %s seconds", self.__class__.__name__, solving_time)
         return solution, fields
 
-    def _backtrack_solve(self, fields: List[Field]) -> Tuple[bool, str, List[Field]]:
-        current_solution = self.solution_string(fields)
-        if self.is_complete(fields):
-            return True, current_solution, fields
-
-        if self.iterations > self.MAX_ITERATIONS:
-            return False, current_solution, fields
-
-        rows, columns, squares = self._get_rows_columns_squares(fields)
-        diff = 1
-        while diff != 0:
-            for field in fields:
-                if not field.value:
-                    if len(field.possible_values) == 1:
-                        field.fill()
-                        square = squares[SquareLocation.from_position(field.x_pos, field.y_pos)]
-                        row = rows[field.y_pos]
-                        column = columns[field.x_pos]
-                        for r_field in row.fields:
-                            self._limit_field(r_field, rows, columns, squares)
-                        for c_field in column.fields:
-                            self._limit_field(c_field, rows, columns, squares)
-                        for s_field in square.fields:
-                            self._limit_field(s_field, rows, columns, squares)
-            new_solution = self.solution_string(fields)
-            diff = int("".join('1' if cf != nf else '0' for cf, nf in zip(current_solution, new_solution)))
-            current_solution = new_solution
-
-        field_to_check = self._field_for_check(fields, rows, columns, squares)
-        row = rows[field_to_check.y_pos]
-        column = columns[field_to_check.x_pos]
-        square = squares[SquareLocation.from_position(field_to_check.x_pos, field_to_check.y_pos)]
-        for value in field_to_check.possible_values:
-            if self.safe_to_place(row, column, square, value):
-                self.iterations += 1
-                field_to_check.guess(value)
-                solved, solution, fs = self._backtrack_solve(deepcopy(fields))
-                if solved:
-                    return solved, solution, fs
-                field_to_check.restore_guess()
-                field_to_check.eliminate(value)
-        return False, current_solution, fields
-
-    def _limit_field(self, field: Field, rows: List[Row], columns: List[Column], squares: Dict[SquareLocation, Square]):
-        square = squares[SquareLocation.from_position(field.x_pos, field.y_pos)]
-        row = rows[field.y_pos]
-        column = columns[field.x_pos]
-        return field.limit(square.get_fields_values(), row.get_fields_values(), column.get_fields_values())
+    def solve_board(self, board: Board, techniques: Sequence[Technique] = None, timeout: float = None,
+                    deadline: float = None, cancel=None) -> bool:
+        """ Solve given board in place. Search is limited by `MAX_ITERATIONS` guesses (per 81 fields), unless a timeout
+        or a deadline is given, which then limits it instead. If search is stopped, the board is left with the most
+        filled consistent state reached (which may contain guesses), its outcome is kept in `status`.
+
+        Args:
+            board (Board): board to solve, with candidates limited to what is allowed by its values
+            techniques (Sequence[Technique]): techniques to use in this solve instead of ones given on init
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
+
+        Returns:
+            (bool): True if solution was found
+        """
+        self.limit(timeout, deadline, cancel)
+        start_time = self._start()
+        if not board.consistent():
+            # conflicting givens are never revisited by the search, which would only run out of iterations
+            self.status = SolvingStatus.UNSOLVABLE
+            self._finish(start_time)
+            return False
+        board.queue_singles()
+        techniques = self.techniques if techniques is None else tuple(techniques)
+        max_iterations = self.MAX_ITERATIONS * board.SIZE // Board.SIZE if self.deadline is None else None
+        solved = next(self._search(board, techniques, max_iterations), None) is not None
+        if solved:
+            self.status = SolvingStatus.SOLVED
+        elif self.status is None:
+            self.status = SolvingStatus.UNSOLVABLE
+        elif self.best is not None:
+            board.values[:] = self.best
+            board.limit_candidates()
+        self._finish(start_time)
+        return solved
+
+    def solutions(self, fields: List[Field], limit: int = None,
+                  techniques: Sequence[Technique] = None) -> Generator[str, None, None]:
+        """ Lazily generate solutions of sudoku, searching for the next one only when it is requested.
+        Unlike `solve`, search is not limited by `MAX_ITERATIONS`, so that all solutions are found.
+
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+            limit (int): maximal number of solutions to generate, all if not given
+            techniques (Sequence[Technique]): techniques to use instead of ones given on init
+
+        Yields:
+            (str): solution string
+        """
+        for solution in self.board_solutions(Board.from_fields(fields), limit, techniques):
+            yield solution.solution_string()
+
+    def board_solutions(self, board: Board, limit: int = None,
+                        techniques: Sequence[Technique] = None) -> Generator[Board, None, None]:
+        """ Lazily generate solutions of given board, see `solutions`. Board is changed in place and is yielded
+        itself every time it gets solved, so it has to be copied if a solution is to be kept.
+
+        Args:
+            board (Board): board to solve, with candidates limited to what is allowed by its values
+            limit (int): maximal number of solutions to generate, all if not given
+            techniques (Sequence[Technique]): techniques to use instead of ones given on init
+
+        Yields:
+            (Board): solved board
+        """
+        self.limit()
+        start_time = self._start()
+        if not board.consistent():
+            self._finish(start_time)
+            return
+        board.queue_singles()
+        techniques = self.techniques if techniques is None else tuple(techniques)
+        for found, solution in enumerate(self._search(board, techniques)):
+            self._finish(start_time)
+            yield solution
+            if limit is not None and found + 1 >= limit:
+                return
+        self._finish(start_time)
+
+    def count_solutions(self, fields: List[Field], limit: int = None,
+                        techniques: Sequence[Technique] = None) -> int:
+        """ Count solutions of sudoku, stopping as soon as `limit` of them is found (e.g. limit=2 to check uniqueness)
+
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+            limit (int): number of solutions to stop at, all are counted if not given
+            techniques (Sequence[Technique]): techniques to use instead of ones given on init
+
+        Returns:
+            (int): number of solutions found, up to `limit`
+        """
+        return sum(1 for _ in self.board_solutions(Board.from_fields(fields), limit, techniques))
+
+    def _start(self) -> float:
+        """ Reset iterations, statistics and the best board before a solve
+
+        Returns:
+            (float): start time of the solve
+        """
+        self.iterations = 0
+        self.stats = SolverStats()
+        self.best = None
+        return time.perf_counter()
+
+    def _finish(self, start_time: float):
+        """ Set search time of the statistics, as time since start of the solve spent outside of propagation
+
+        Args:
+            start_time (float): start time of the solve
+        """
+        self.stats.search_time = time.perf_counter() - start_time - self.stats.propagation_time
+
+    @staticmethod
+    def deduce(board: Board, techniques: Tuple[Technique, ...], stats: SolverStats = None) -> bool:
+        """ Propagate naked singles and run techniques in order, starting over from the first one after any of them
+        changes the board, until none of them does. Candidates eliminated by naked singles are counted in statistics
+        as entries added to the undo trail (eliminations in peers and assignments of fields left with one candidate).
+
+        Args:
+            board (Board): board to analyze, changed in place
+            techniques (tuple[Technique, ...]): techniques to run
+            stats (SolverStats): statistics to record passes, eliminations and time in, if given
+
+        Returns:
+            (bool): False if a contradiction was found
+        """
+        if stats is not None:
+            start_time = time.perf_counter()
+        consistent = ClassicSolver._propagate(board, stats)
+        step = 0
+        while consistent and step < len(techniques):
+            eliminated = techniques[step].apply(board)
+            if eliminated == Technique.CONTRADICTION:
+                consistent = False
+                break
+            if stats is not None:
+                stats.record(techniques[step].name, eliminated)
+            consistent = ClassicSolver._propagate(board, stats)
+            step = 0 if eliminated else step + 1
+        if not consistent:
+            board.singles.clear()
+        if stats is not None:
+            stats.propagation_time += time.perf_counter() - start_time
+        return consistent
+
+    @staticmethod
+    def _propagate(board: Board, stats: SolverStats = None) -> bool:
+        """ Propagate naked singles of the board, recording the pass in statistics if given
+
+        Returns:
+            (bool): False if a contradiction was found
+        """
+        if stats is None:
+            return board.propagate()
+        trail_size = len(board.trail)
+        consistent = board.propagate()
+        stats.propagation_passes += 1
+        stats.record("naked_singles", (len(board.trail) - trail_size) // 2)
+        return consistent
+
+    def _search(self, board: Board, techniques: Tuple[Technique, ...], max_iterations: int = None,
+                depth: int = 0) -> Generator[Board, None, None]:
+        """ Search the board depth-first, yielding it every time it gets solved. Board is changed in place: it stays
+        solved while the generator is suspended and failed branches are rolled back with the undo trail.
+
+        Args:
+            board (Board): board to search
+            techniques (tuple[Technique, ...]): techniques to run before each branching decision
+            max_iterations (int): number of guesses to stop searching at, no limit if not given
+            depth (int): depth of the node in search tree
+
+        Yields:
+            (Board): solved board
+        """
+        if self.stop or self.interrupted():
+            return
+        if max_iterations is not None and self.iterations > max_iterations:
+            self.status = SolvingStatus.UNSOLVED
+            self.stop = True
+            return
+        stats = self.stats
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+        if self.on_node_enter is not None:
+            self.on_node_enter(depth)
+
+        if not self.deduce(board, techniques, stats):
+            if self.on_node_exit is not None:
+                self.on_node_exit(depth, False)
+            return
+        empty = board.values.count(0)
+        if not empty:
+            if self.on_node_exit is not None:
+                self.on_node_exit(depth, True)
+            yield board
+            return
+        if self.best is None or empty < self.best_empty:
+            self.best = board.values[:]
+            self.best_empty = empty
+
+        index = board.branching_field(self.by_degree)
+        for value in board.MASK_VALUES[board.candidates[index]]:
+            self.iterations += 1
+            stats.guesses += 1
+            mark = board.mark()
+            if board.assign(index, value):
+                yield from self._search(board, techniques, max_iterations, depth + 1)
+            board.undo(mark)
+            if self.stop:
+                break
+            stats.backtracks += 1
+            board.eliminate(index, value)
+        if self.on_node_exit is not None:
+            self.on_node_exit(depth, False)
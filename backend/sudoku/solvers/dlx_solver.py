@@ -0,0 +1,230 @@
+import time
+from typing import List, Tuple, Generator, Callable
+
+from backend.consts import SolvingStatus
+from backend.sudoku import Field
+from backend.sudoku.board import Board
+from backend.sudoku.solvers.solver import Solver, SolverStats
+
+
+class DancingLinks:
+    """ Exact cover matrix of sudoku kept as circular doubly linked lists (Knuth's Dancing Links), searched with
+    Algorithm X. Links are kept in flat lists indexed by node, node 0 is the root and nodes 1-324 are column headers
+    (for a 9x9 board, there are 4 * SIZE columns in general).
+
+    Columns represent constraints: a field has a value (0-80), a row has a value (81-161), a column has a value
+    (162-242) and a square has a value (243-323). Matrix rows are (field, value) placements allowed by the board.
+
+    Attributes:
+        stats (SolverStats): statistics of the search
+        interrupted (Callable[[], bool]): called at every node if set, search stops when it returns True
+        stop (bool): True when search was stopped by `interrupted`
+        best (list[tuple[int, int]]): longest list of placements reached by the search
+        on_node_enter (Callable[[int], None]): called with depth of a search node when it is entered, if set
+        on_node_exit (Callable[[int, bool], None]): called with depth of a search node when it is left, if set
+    """
+
+    def __init__(self, board: Board):
+        """
+        Args:
+            board (Board): board to encode, only values of empty fields which are among their candidates are placed
+        """
+        self.topology = board.TOPOLOGY
+        columns = 4 * board.SIZE
+        headers = columns + 1
+        self.left = [index - 1 for index in range(headers)]
+        self.right = [index + 1 for index in range(headers)]
+        self.left[0] = columns
+        self.right[columns] = 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        self.size = [0] * headers
+        self.placement = [None] * headers  # type: list[tuple[int, int] | None]
+        self.stats = SolverStats()
+        self.interrupted = None  # type: Callable[[], bool] | None
+        self.stop = False
+        self.best = []  # type: List[Tuple[int, int]]
+        self.on_node_enter = None
+        self.on_node_exit = None
+
+        for index, value in enumerate(board.values):
+            for option in ((value,) if value else board.MASK_VALUES[board.candidates[index]]):
+                self._add_row(index, option)
+
+    def _add_row(self, index: int, value: int):
+        topology = self.topology
+        size, side = topology.size, topology.side
+        columns = (1 + index,
+                   1 + size + topology.cell_row[index] * side + value - 1,
+                   1 + 2 * size + topology.cell_column[index] * side + value - 1,
+                   1 + 3 * size + topology.cell_square[index] * side + value - 1)
+        first = len(self.column)
+        for offset, column in enumerate(columns):
+            node = first + offset
+            self.column.append(column)
+            self.placement.append((index, value))
+            self.up.append(self.up[column])
+            self.down.append(column)
+            self.down[self.up[column]] = node
+            self.up[column] = node
+            self.size[column] += 1
+            self.left.append(first + (offset - 1) % 4)
+            self.right.append(first + (offset + 1) % 4)
+
+    def cover(self, column: int):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        row = down[column]
+        while row != column:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                self.size[self.column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, column: int):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        row = up[column]
+        while row != column:
+            node = left[row]
+            while node != row:
+                self.size[self.column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+        right[left[column]] = column
+        left[right[column]] = column
+
+    def search(self, placements: List[Tuple[int, int]] = None) -> Generator[List[Tuple[int, int]], None, None]:
+        """ Search for exact covers, choosing the column with the least rows first
+
+        Args:
+            placements (list[tuple[int, int]]): placements chosen so far
+
+        Yields:
+            (list[tuple[int, int]]): (field index, value) placements of a solution
+        """
+        placements = placements if placements is not None else []
+        right, down = self.right, self.down
+        if self.interrupted is not None and self.interrupted():
+            self.stop = True
+            return
+        stats = self.stats
+        depth = len(placements)
+        stats.nodes += 1
+        if depth > stats.max_depth:
+            stats.max_depth = depth
+            self.best = list(placements)
+        if self.on_node_enter is not None:
+            self.on_node_enter(depth)
+        if right[0] == 0:
+            if self.on_node_exit is not None:
+                self.on_node_exit(depth, True)
+            yield list(placements)
+            return
+
+        column = right[0]
+        chosen, least = column, self.size[column]
+        while column and least > 1:
+            if self.size[column] < least:
+                chosen, least = column, self.size[column]
+            column = right[column]
+        if least:
+            self.cover(chosen)
+            row = down[chosen]
+            while row != chosen:
+                stats.guesses += 1
+                placements.append(self.placement[row])
+                node = right[row]
+                while node != row:
+                    self.cover(self.column[node])
+                    node = right[node]
+                yield from self.search(placements)
+                if self.stop:
+                    return
+                placements.pop()
+                stats.backtracks += 1
+                node = self.left[row]
+                while node != row:
+                    self.uncover(self.column[node])
+                    node = self.left[node]
+                row = down[row]
+            self.uncover(chosen)
+        if self.on_node_exit is not None:
+            self.on_node_exit(depth, False)
+
+
+class DLXSolver(Solver):
+    """ Solver encoding sudoku as exact cover problem and searching it with Dancing Links
+    """
+
+    def __init__(self, logger_name: str = "DLXSolver", logging_level: int = 10):
+        super().__init__(logger_name=logger_name, logging_level=logging_level)
+        self.iterations = 0
+
+    def solve(self, fields: List[Field], timeout: float = None, deadline: float = None,
+              cancel=None) -> Tuple[str, List[Field]]:
+        """ Solve sudoku given as list of fields
+
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
+
+        Returns:
+            (str, list[Field]): solution string and list of fields being a solution (or the most filled board reached
+                                if not solved)
+        """
+        start_time = time.time()
+        board = Board.from_fields(fields)
+        solved = self.solve_board(board, timeout, deadline, cancel)
+
+        if solved:
+            self.log_info("Solved in %s iterations", self.iterations)
+            self.log_debug("Statistics: %s", self.stats)
+        else:
+            self.log_warning("Sudoku could not be solved within %s iterations: %s", self.iterations,
+                             self.status.name)
+        self.log_info("Solving time using %s: %s seconds", self.__class__.__name__, time.time() - start_time)
+        return board.solution_string(), self.board_fields(board, fields)
+
+    def solve_board(self, board: Board, timeout: float = None, deadline: float = None, cancel=None) -> bool:
+        """ Solve given board in place. If search is stopped by the deadline or cancellation, the board is left with
+        the most filled state reached (which may contain guesses), outcome is kept in `status`.
+
+        Args:
+            board (Board): board to solve, with candidates limited to what is allowed by its values
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
+
+        Returns:
+            (bool): True if solution was found
+        """
+        self.limit(timeout, deadline, cancel)
+        start_time = time.perf_counter()
+        links = DancingLinks(board)
+        links.on_node_enter, links.on_node_exit = self.on_node_enter, self.on_node_exit
+        if self.deadline is not None or self.cancel is not None:
+            links.interrupted = self.interrupted
+        solution = next(links.search(), None)
+        self.stats = links.stats
+        self.stats.search_time = time.perf_counter() - start_time
+        self.iterations = self.stats.nodes
+        if solution is not None:
+            self.status = SolvingStatus.SOLVED
+        elif self.status is None:
+            self.status = SolvingStatus.UNSOLVABLE
+            return False
+        for index, value in solution or links.best:
+            board.values[index] = value
+            board.candidates[index] = 0
+        if solution is None:
+            board.limit_candidates()
+        return solution is not None
@@ -0,0 +1,121 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Tuple, Iterable
+
+import numpy as np
+
+from backend.consts import STANDARD
+from backend.sudoku.solvers.batch_solver import BatchSolver
+
+
+""" Solving many sudokus using all cores. Puzzles, solutions and statuses are kept in shared memory buffers, so that
+workers only receive buffer names and a range of puzzles to solve, and write results in place (keeping input order).
+"""
+
+_solvers = {}
+
+
+def puzzles_array(puzzles: np.ndarray | Iterable[str]) -> np.ndarray:
+    """ Convert puzzles given as array-like or 81-characters strings to (N, 81) uint8 array. Strings may contain
+    whitespace, which is skipped, and '.' or '0' for empty fields.
+
+    Args:
+        puzzles (np.ndarray | Iterable[str]): puzzles to convert
+
+    Returns:
+        (np.ndarray): (N, 81) array of values
+
+    Raises:
+        ValueError: if a puzzle string has other number of fields or characters other than digits and '.'
+    """
+    if isinstance(puzzles, np.ndarray):
+        return np.ascontiguousarray(puzzles, dtype=np.uint8).reshape(-1, STANDARD.size)
+    puzzles = list(puzzles)
+    if puzzles and isinstance(puzzles[0], str):
+        puzzles = ["".join(puzzle.split()) for puzzle in puzzles]
+        for index, puzzle in enumerate(puzzles):
+            if len(puzzle) != STANDARD.size:
+                raise ValueError(f"Puzzle {index} has {len(puzzle)} fields instead of {STANDARD.size}")
+        # characters out of ASCII are replaced with '?', so that they are found by the range check below
+        data = "".join(puzzles).replace(".", "0").encode("ascii", errors="replace")
+        values = (np.frombuffer(data, dtype=np.uint8) - ord("0")).reshape(-1, STANDARD.size)
+        invalid = (values > 9).any(axis=1)
+        if invalid.any():
+            index = int(np.argmax(invalid))
+            raise ValueError(f"Puzzle {index} should contain only digits, 0 or '.' for empty fields: {puzzles[index]}")
+        return values
+    return np.array(puzzles, dtype=np.uint8).reshape(-1, STANDARD.size)
+
+
+def _solve_chunk(names: Tuple[str, str, str], count: int, start: int, stop: int, logging_level: int,
+                 deadline: float = None, puzzle_timeout: float = None):
+    """ Solve puzzles[start:stop] from shared memory buffers and write results in place. Run in worker process.
+
+    Args:
+        names (tuple[str, str, str]): names of puzzles, solutions and statuses shared memory buffers
+        count (int): number of puzzles in buffers
+        start (int): first puzzle to solve
+        stop (int): puzzle to stop at (excluded)
+        logging_level (int): logging level of the solver
+        deadline (float): `time.monotonic()` value to stop at (monotonic clock is shared by processes of the system)
+        puzzle_timeout (float): seconds search of a single sudoku may take
+    """
+    buffers = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        puzzles = np.ndarray((count, 81), dtype=np.uint8, buffer=buffers[0].buf)
+        solutions = np.ndarray((count, 81), dtype=np.uint8, buffer=buffers[1].buf)
+        statuses = np.ndarray((count,), dtype=np.uint8, buffer=buffers[2].buf)
+        if logging_level not in _solvers:
+            _solvers[logging_level] = BatchSolver(logging_level=logging_level)
+        solutions[start:stop], statuses[start:stop] = _solvers[logging_level].solve(
+            puzzles[start:stop], deadline=deadline, puzzle_timeout=puzzle_timeout)
+        del puzzles, solutions, statuses
+    finally:
+        for buffer in buffers:
+            buffer.close()
+
+
+def solve_many(puzzles: np.ndarray | Iterable[str], workers: int = None, chunk_size: int = None,
+               logging_level: int = 30, timeout: float = None,
+               puzzle_timeout: float = None) -> Tuple[np.ndarray, np.ndarray]:
+    """ Solve many sudokus using a pool of processes, each running `BatchSolver` on chunks of puzzles
+
+    Args:
+        puzzles (np.ndarray | Iterable[str]): (N, 81) array of values or 81-characters strings, 0 for empty fields
+        workers (int): number of worker processes, all cores if not given; 1 solves in current process
+        chunk_size (int): number of puzzles sent to a worker at once, by default each worker gets ~4 chunks
+        logging_level (int): logging level of solvers
+        timeout (float): seconds solving of all puzzles may take, puzzles not solved in time get TIMED_OUT status
+        puzzle_timeout (float): seconds search of a single sudoku may take
+
+    Returns:
+        (np.ndarray, np.ndarray): (N, 81) uint8 array of solutions and (N,) uint8 array of `SolvingStatus` values,
+                                  in input order
+    """
+    puzzles = puzzles_array(puzzles)
+    count = len(puzzles)
+    workers = workers or os.cpu_count() or 1
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    if workers == 1 or count == 0:
+        return BatchSolver(logging_level=logging_level).solve(puzzles, deadline=deadline, puzzle_timeout=puzzle_timeout)
+    chunk_size = chunk_size or max(1, -(-count // (workers * 4)))
+
+    buffers = [shared_memory.SharedMemory(create=True, size=max(1, size)) for size in (count * 81, count * 81, count)]
+    try:
+        np.ndarray((count, 81), dtype=np.uint8, buffer=buffers[0].buf)[:] = puzzles
+        names = tuple(buffer.name for buffer in buffers)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_solve_chunk, names, count, start, min(start + chunk_size, count),
+                                       logging_level, deadline, puzzle_timeout)
+                       for start in range(0, count, chunk_size)]
+            for future in futures:
+                future.result()
+        solutions = np.ndarray((count, 81), dtype=np.uint8, buffer=buffers[1].buf).copy()
+        statuses = np.ndarray((count,), dtype=np.uint8, buffer=buffers[2].buf).copy()
+    finally:
+        for buffer in buffers:
+            buffer.close()
+            buffer.unlink()
+    return solutions, statuses
@@ -1,9 +1,71 @@
-from typing import List, Dict, Tuple
+import dataclasses
+import time
+from typing import List, Dict, Tuple, Callable
 from collections import Counter
 
 from backend._base import SudokuBase
-from backend.consts import FieldValue, SquareLocation
+from backend.consts import FieldValue, SquareLocation, Position, SolvingStatus
 from backend.sudoku import Field, Row, Column, Square
+from backend.sudoku.board import Board
+
+
+@dataclasses.dataclass
+class SolverStats:
+    """ Statistics of a single solve, collected by solvers while solving
+
+    Attributes:
+        nodes (int): search nodes entered
+        guesses (int): values tried in branching decisions
+        backtracks (int): guesses rolled back because they led to a contradiction
+        propagation_passes (int): naked singles propagation passes (queue drains, or array passes of batch solver)
+        max_depth (int): maximal depth of the search tree
+        eliminated (dict[str, int]): candidates eliminated by each technique, by technique name
+        propagation_time (float): seconds spent in propagation and techniques
+        search_time (float): seconds spent in search itself (everything apart from propagation)
+    """
+
+    nodes: int = 0
+    guesses: int = 0
+    backtracks: int = 0
+    propagation_passes: int = 0
+    max_depth: int = 0
+    eliminated: Dict[str, int] = dataclasses.field(default_factory=dict)
+    propagation_time: float = 0.0
+    search_time: float = 0.0
+
+    def record(self, technique: str, eliminated: int):
+        """ Add candidates eliminated by a technique
+
+        Args:
+            technique (str): name of the technique
+            eliminated (int): number of eliminated candidates
+        """
+        if eliminated > 0:
+            self.eliminated[technique] = self.eliminated.get(technique, 0) + eliminated
+
+    def add(self, other: "SolverStats"):
+        """ Add statistics of another solve to these ones (e.g. to sum up a batch)
+
+        Args:
+            other (SolverStats): statistics to add
+        """
+        self.nodes += other.nodes
+        self.guesses += other.guesses
+        self.backtracks += other.backtracks
+        self.propagation_passes += other.propagation_passes
+        self.max_depth = max(self.max_depth, other.max_depth)
+        for technique, eliminated in other.eliminated.items():
+            self.record(technique, eliminated)
+        self.propagation_time += other.propagation_time
+        self.search_time += other.search_time
+
+    def to_dict(self) -> dict:
+        """ Return statistics as a JSON serializable dict
+
+        Returns:
+            (dict): statistics by name
+        """
+        return dataclasses.asdict(self)
 
 
 class Solver(SudokuBase):
@@ -12,9 +74,34 @@ class Solver(SudokuBase):
     - is completed (all fields have values),
     - is valid (no repeating value in either row, column or square),
     - is value safe to place in given field (there is no such value in row, column or square
+
+    Every solve collects `SolverStats` in `stats` attribute, which stays available until the next solve. Search can be
+    observed by setting `on_node_enter(depth)` and `on_node_exit(depth, solved)` callbacks, they are not called (and
+    cost nothing but a check) if not set. When search stops at a solution, nodes on the path to it are not exited.
+
+    Solves can be limited with `timeout` (seconds) or `deadline` (`time.monotonic()` value) and cancelled from another
+    thread or task by setting `cancel` event (`threading.Event`, or any object with `is_set` method, e.g. of
+    `multiprocessing`). Solvers check them at every search node, stop and report it in `status`.
+
+    Attributes:
+        stats (SolverStats): statistics of the last solve
+        status (SolvingStatus): outcome of the last solve, None while solving
+        stop (bool): True when running solve has to stop
+        deadline (float): `time.monotonic()` value to stop running solve at, if any
+        cancel (threading.Event): event cancelling running solve when set, if any
+        on_node_enter (Callable[[int], None]): called with depth of a search node when it is entered
+        on_node_exit (Callable[[int, bool], None]): called with depth of a search node when it is left, and whether it
+                                                    was left with a solution
     """
     def __init__(self, logger_name: str, logging_level: int):
         super().__init__(logger_name=logger_name, logging_level=logging_level)
+        self.stats = SolverStats()
+        self.status = None  # type: SolvingStatus | None
+        self.stop = False
+        self.deadline = None  # type: float | None
+        self.cancel = None
+        self.on_node_enter = None  # type: Callable[[int], None] | None
+        self.on_node_exit = None  # type: Callable[[int, bool], None] | None
 
     def solve(self, *args, **kwargs) -> Tuple[bool, List[Field]]:
         """ Solve sudoku using algorithm implemented by specific Solver
@@ -22,12 +109,12 @@ class Solver(SudokuBase):
         exists or not, only if it was found.
 
         Args:
-             depends on implementation
+             depends on implementation, usually with `timeout`, `deadline` and `cancel` limits (see `limit`)
 
         Returns:
             (bool, list[Field]): a tuple containing boolean information if solution was found or not (as True or False)
                                  and list of fields being a solution (or at point when it was decided that Solver
-                                 can't solve it)
+                                 can't solve it), outcome of the solve is kept in `status`
         """
         raise NotImplementedError
 
@@ -45,6 +132,64 @@ class Solver(SudokuBase):
         """
         return self.solve(*args, **kwargs)
 
+    def limit(self, timeout: float = None, deadline: float = None, cancel=None):
+        """ Set limits of the next solve and reset its status
+
+        Args:
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at, the earlier one is used if both are given
+            cancel (threading.Event): event cancelling the solve when set
+        """
+        if timeout is not None:
+            deadline = min(deadline, time.monotonic() + timeout) if deadline is not None else time.monotonic() + timeout
+        self.deadline = deadline
+        self.cancel = cancel
+        self.status = None
+        self.stop = False
+
+    def interrupted(self) -> bool:
+        """ Check if running solve was cancelled or reached its deadline, and stop it if so
+
+        Returns:
+            (bool): True if solve has to stop
+        """
+        if self.cancel is not None and self.cancel.is_set():
+            self.status = SolvingStatus.CANCELLED
+            self.stop = True
+        elif self.deadline is not None and time.monotonic() > self.deadline:
+            self.status = SolvingStatus.TIMED_OUT
+            self.stop = True
+        return self.stop
+
+    def profile_label(self, fields: List[Field] = None, *args, **kwargs) -> str:
+        """ Label of a solve call in profiles (see `backend.profiling.Profiler.attach`)
+
+        Args:
+            fields (list[Field]): fields being solved, first argument of `solve`
+
+        Returns:
+            (str): puzzle string
+        """
+        return self.solution_string(fields) if fields else self.__class__.__name__
+
+    @staticmethod
+    def board_fields(board: Board, fields: List[Field] = None) -> List[Field]:
+        """ Create a list of fields being views over given board
+
+        Args:
+            board (Board): board to view
+            fields (list[Field]): fields to view the board with, keeping their positions and flags, if any
+
+        Returns:
+            (list[Field]): list of fields ordered by index
+        """
+        if fields:
+            return [field.view(board) for field in fields]
+        # positions of bigger boards do not fit in `Position`, they are kept as ints
+        position = Position if board.SIDE == Board.SIDE else int
+        return [Field(position(index % board.SIDE), position(index // board.SIDE), board=board)
+                for index in range(board.SIZE)]
+
     @staticmethod
     def solution_string(fields: List[Field]) -> str:
         """ Create a string built from all fields' values
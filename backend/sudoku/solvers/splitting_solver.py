@@ -0,0 +1,354 @@
+import multiprocessing
+import os
+import queue
+import time
+from typing import List, Tuple, Sequence
+
+from backend.consts import SolvingStatus
+from backend.sudoku import Field
+from backend.sudoku.board import Board
+from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.solver import Solver, SolverStats
+from backend.sudoku.solvers.techniques import Technique, DEFAULT_TECHNIQUES
+
+
+""" Parallel search of a single hard sudoku. The first levels of the search tree are expanded in the solving process
+into independent subproblems (boards with a few fields guessed), which are searched depth-first by worker processes
+pulling them from a shared queue. When a worker is waiting for work and the queue is empty, busy workers give away
+untried branches of their shallowest open nodes (the biggest pieces of work they have), so that unbalanced subtrees get
+split further. The first solution found stops all workers.
+
+Workers are started on first solve and kept for further ones, so the solver should be closed when it is not needed:
+
+    with SplittingSolver(workers=8) as solver:
+        solution, fields = solver.solve(sudoku.fields, timeout=10)
+"""
+
+# counters shared by the solver and its workers: number of the running job (solve), subproblems created for it,
+# subproblems waiting in the queue and workers waiting for a subproblem
+JOB, CREATED, QUEUED, HUNGRY = range(4)
+
+
+def _count(state, job: int, created: int = 0, queued: int = 0) -> bool:
+    """ Update counters of a job, unless another job has started since
+
+    Returns:
+        (bool): True if the job is still running
+    """
+    with state.get_lock():
+        if state[JOB] != job:
+            return False
+        state[CREATED] += created
+        state[QUEUED] += queued
+        return True
+
+
+def _donate(frames: list, job: int, box: int, state, tasks) -> bool:
+    """ Give away an untried branch of the shallowest open node as a new subproblem
+
+    Args:
+        frames (list): open nodes of the search, as (values, trail mark, field index, values left to try)
+        job (int): number of the job
+        box (int): box size of the board
+        state (multiprocessing.Array): shared counters
+        tasks (multiprocessing.Queue): queue of subproblems
+
+    Returns:
+        (bool): True if a branch was given away
+    """
+    for values, _, index, left in frames:
+        if left:
+            if not _count(state, job, created=1, queued=1):
+                return False
+            subproblem = values[:]
+            subproblem[index] = left.pop()
+            tasks.put((job, box, subproblem))
+            return True
+    return False
+
+
+def _search(board: Board, job: int, techniques: Tuple[Technique, ...], by_degree: bool, stats: SolverStats,
+            stop, state, tasks) -> List[int] | None:
+    """ Search a subproblem depth-first, with an explicit stack of open nodes, so that their untried branches can be
+    given away to other workers
+
+    Returns:
+        (list[int] | None): values of the solution, None if there is none or search was stopped
+    """
+    board.limit_candidates()
+    board.queue_singles()
+    if not ClassicSolver.deduce(board, techniques, stats):
+        return None
+    counters = state.get_obj()
+    frames = []
+    while True:
+        stats.nodes += 1
+        if stop.is_set() or counters[JOB] != job:
+            return None
+        if frames and counters[HUNGRY] > counters[QUEUED]:
+            _donate(frames, job, board.BOX, state, tasks)
+        index = board.branching_field(by_degree)
+        if index is None:
+            return board.values
+        frames.append((board.values[:], board.mark(), index, list(board.MASK_VALUES[board.candidates[index]])))
+        stats.max_depth = max(stats.max_depth, len(frames))
+        while frames:
+            _, mark, index, left = frames[-1]
+            board.undo(mark)
+            if not left:
+                frames.pop()
+                continue
+            stats.guesses += 1
+            if board.assign(index, left.pop(0)) and ClassicSolver.deduce(board, techniques, stats):
+                break
+            stats.backtracks += 1
+        else:
+            return None
+
+
+def _work(tasks, results, stop, state, techniques: Tuple[Technique, ...], by_degree: bool):
+    """ Search subproblems from the queue until `None` is received. Run in worker process.
+    """
+    while True:
+        with state.get_lock():
+            state[HUNGRY] += 1
+        task = tasks.get()
+        with state.get_lock():
+            state[HUNGRY] -= 1
+        if task is None:
+            return
+        job, box, values = task
+        if not _count(state, job, queued=-1):
+            continue
+        stats = SolverStats()
+        start_time = time.perf_counter()
+        solution = _search(Board.sized(box)(values), job, techniques, by_degree, stats, stop, state, tasks)
+        stats.search_time = time.perf_counter() - start_time - stats.propagation_time
+        if solution is not None:
+            # a late solution of a previous job must not stop the next one
+            with state.get_lock():
+                if state[JOB] == job:
+                    stop.set()
+        results.put((job, solution, stats))
+
+
+class SplittingSolver(Solver):
+    """ Solver splitting search tree of a single sudoku between worker processes (see module description)
+
+    Attributes:
+        workers (int): number of worker processes
+        subproblems (int): minimal number of subproblems to expand the search tree into before searching it in parallel
+        techniques (tuple[Technique, ...]): techniques run before each branching decision
+        by_degree (bool): True to break ties of branching fields by their number of empty peers
+        iterations (int): number of guesses of the last solve
+    """
+
+    # seconds between checks of the deadline and cancellation while waiting for workers
+    POLL_INTERVAL = 0.01
+
+    def __init__(self, workers: int = None, subproblems: int = None,
+                 techniques: Sequence[Technique] = DEFAULT_TECHNIQUES, by_degree: bool = False,
+                 logger_name: str = "SplittingSolver", logging_level: int = 10):
+        """
+        Args:
+            workers (int): number of worker processes, all cores if not given; 1 solves in current process
+            subproblems (int): minimal number of subproblems, 8 per worker if not given
+            techniques (Sequence[Technique]): ordered techniques run before each branching decision
+            by_degree (bool): True to break ties of branching fields by their number of empty peers
+            logger_name (str): logger name
+            logging_level (int): logging level
+        """
+        super().__init__(logger_name=logger_name, logging_level=logging_level)
+        self.workers = workers or os.cpu_count() or 1
+        self.subproblems = subproblems or 8 * self.workers
+        self.techniques = tuple(techniques)
+        self.by_degree = by_degree
+        self.iterations = 0
+        self._processes = []  # type: List[multiprocessing.Process]
+        self._tasks = self._results = self._stop = self._state = None
+
+    def _start_workers(self):
+        """ Start worker processes, if they are not running yet
+        """
+        if self._processes:
+            return
+        context = multiprocessing.get_context()
+        self._tasks, self._results = context.Queue(), context.Queue()
+        self._stop = context.Event()
+        self._state = context.Array("q", 4)
+        self._processes = [context.Process(target=_work, daemon=True,
+                                           args=(self._tasks, self._results, self._stop, self._state,
+                                                 self.techniques, self.by_degree))
+                           for _ in range(self.workers)]
+        for process in self._processes:
+            process.start()
+        self.log_debug("Started %s workers", self.workers)
+
+    def close(self):
+        """ Stop worker processes
+        """
+        if not self._processes:
+            return
+        self._stop.set()
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for shared_queue in (self._tasks, self._results):
+            shared_queue.close()
+            shared_queue.join_thread()
+        self._processes = []
+        self.log_debug("Workers stopped")
+
+    def __enter__(self) -> "SplittingSolver":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def solve(self, fields: List[Field], timeout: float = None, deadline: float = None,
+              cancel=None) -> Tuple[str, List[Field]]:
+        """ Solve sudoku given as list of fields
+
+        Args:
+            fields (list[Field]): list of all fields of a board, ordered by index
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
+
+        Returns:
+            (str, list[Field]): solution string and list of fields being a solution (or the board as it was given, if
+                                not solved)
+        """
+        start_time = time.time()
+        board = Board.from_fields(fields)
+        solved = self.solve_board(board, timeout, deadline, cancel)
+        if solved:
+            self.log_info("Solved in %s iterations", self.iterations)
+            self.log_debug("Statistics: %s", self.stats)
+        else:
+            self.log_warning("Sudoku could not be solved: %s", self.status.name)
+        self.log_info("Solving time using %s: %s seconds", self.__class__.__name__, time.time() - start_time)
+        return board.solution_string(), self.board_fields(board, fields)
+
+    def solve_board(self, board: Board, timeout: float = None, deadline: float = None, cancel=None) -> bool:
+        """ Solve given board in place. If search is stopped by the deadline or cancellation, the board is left with
+        values it was given with, outcome is kept in `status`.
+
+        Args:
+            board (Board): board to solve, with candidates limited to what is allowed by its values
+            timeout (float): seconds the solve may take
+            deadline (float): `time.monotonic()` value to stop the solve at
+            cancel (threading.Event): event cancelling the solve when set
+
+        Returns:
+            (bool): True if solution was found
+        """
+        if self.workers == 1:
+            solver = ClassicSolver(logging_level=self.logging_level, techniques=self.techniques,
+                                   by_degree=self.by_degree)
+            solved = solver.solve_board(board, timeout=timeout, deadline=deadline, cancel=cancel)
+            self.stats, self.status, self.iterations = solver.stats, solver.status, solver.iterations
+            return solved
+
+        self.limit(timeout, deadline, cancel)
+        self.stats = SolverStats()
+        start_time = time.perf_counter()
+        if not board.consistent():
+            # conflicting givens are never revisited by propagation, workers would search the whole tree
+            self.status = SolvingStatus.UNSOLVABLE
+            return False
+        solution, subproblems = self._split(board)
+        if solution is None and subproblems:
+            solution = self._search(board.BOX, subproblems)
+        elif solution is None:
+            self.status = SolvingStatus.UNSOLVABLE
+        if solution is not None:
+            self.status = SolvingStatus.SOLVED
+            board.values[:] = solution
+            board.candidates[:] = [0] * board.SIZE
+        self.iterations = self.stats.guesses
+        self.stats.search_time = time.perf_counter() - start_time - self.stats.propagation_time
+        return solution is not None
+
+    def _split(self, board: Board) -> Tuple[List[int] | None, List[List[int]]]:
+        """ Expand the search tree breadth-first, level by level, until there are at least `subproblems` open nodes
+
+        Args:
+            board (Board): board to split
+
+        Returns:
+            (list[int] | None, list[list[int]]): values of the solution if it was found while expanding, and values of
+                                                 subproblems otherwise
+        """
+        board = board.copy()
+        board.queue_singles()
+        if not ClassicSolver.deduce(board, self.techniques, self.stats):
+            return None, []
+        frontier = [board]
+        depth = 0
+        while len(frontier) < self.subproblems:
+            expanded = []
+            for node in frontier:
+                self.stats.nodes += 1
+                index = node.branching_field(self.by_degree)
+                if index is None:
+                    return node.values, []
+                for value in node.MASK_VALUES[node.candidates[index]]:
+                    child = node.copy()
+                    self.stats.guesses += 1
+                    if child.assign(index, value) and ClassicSolver.deduce(child, self.techniques, self.stats):
+                        expanded.append(child)
+                    else:
+                        self.stats.backtracks += 1
+            if not expanded:
+                return None, []
+            frontier = expanded
+            depth += 1
+        self.stats.max_depth = depth
+        self.log_debug("Search tree split into %s subproblems at depth %s", len(frontier), depth)
+        return None, [node.values for node in frontier]
+
+    def _search(self, box: int, subproblems: List[List[int]]) -> List[int] | None:
+        """ Search subproblems in worker processes, until a solution is found, all of them are searched, or the solve
+        is interrupted
+
+        Args:
+            box (int): box size of the board
+            subproblems (list[list[int]]): values of subproblems
+
+        Returns:
+            (list[int] | None): values of the solution, None if there is none or search was interrupted
+        """
+        self._start_workers()
+        state = self._state
+        with state.get_lock():
+            state[JOB] += 1
+            state[CREATED] = state[QUEUED] = len(subproblems)
+            job = state[JOB]
+        self._stop.clear()
+        for values in subproblems:
+            self._tasks.put((job, box, values))
+
+        finished = 0
+        solution = None
+        while not self.interrupted():
+            try:
+                message_job, solution, stats = self._results.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if message_job != job:
+                continue
+            finished += 1
+            self.stats.add(stats)
+            if solution is not None:
+                break
+            with state.get_lock():
+                if finished == state[CREATED]:
+                    self.status = SolvingStatus.UNSOLVABLE
+                    break
+        self._stop.set()
+        self.log_debug("%s of %s subproblems searched", finished, state[CREATED])
+        return solution
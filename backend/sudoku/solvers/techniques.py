@@ -0,0 +1,230 @@
+from itertools import combinations
+
+from backend.sudoku.board import Board
+
+
+""" Human solving techniques, run by solvers on the board before each branching decision. Every technique works on
+containers of the board (rows, columns and squares, given as `UNITS` cells) and makes its deductions through
+`Board.assign` / `Board.eliminate_mask`, so that they are recorded on the undo trail and queue new naked singles.
+Tables of the board's topology are taken from the board, so techniques work on boards of any size.
+"""
+
+
+class Technique:
+    """ Base class of deduction techniques
+
+    Attributes:
+        name (str): name of the technique, used in statistics
+    """
+
+    CONTRADICTION = -1
+
+    name = "technique"
+
+    def apply(self, board: Board) -> int:
+        """ Apply technique to all containers of the board once
+
+        Args:
+            board (Board): board to analyze, changed in place
+
+        Returns:
+            (int): number of eliminated candidates, `CONTRADICTION` if board was found to have no solution
+        """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return self.__class__.__name__
+
+
+class HiddenSingles(Technique):
+    """ A value that can be placed in only one field of a container is placed there
+    """
+
+    name = "hidden_singles"
+
+    def apply(self, board: Board) -> int:
+        values = board.values
+        candidates = board.candidates
+        value_masks = board.VALUE_MASKS
+        all_candidates = board.ALL_CANDIDATES
+        eliminated = 0
+        for unit in board.UNITS:
+            once = more = placed = 0
+            for index in unit:
+                mask = candidates[index]
+                more |= once & mask
+                once |= mask
+                placed |= value_masks[values[index]]
+            if all_candidates & ~(once | placed):
+                return self.CONTRADICTION
+            singles = once & ~more & ~placed
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for index in unit:
+                    mask = candidates[index]
+                    if mask & bit:
+                        if not board.assign(index, bit.bit_length()):
+                            return self.CONTRADICTION
+                        eliminated += board.CANDIDATES_COUNT[mask] - 1
+                        break
+        return eliminated
+
+
+class NakedSubset(Technique):
+    """ If `size` fields of a container have only `size` values in total, these values are removed from other fields
+    of the container (naked pairs for size 2, naked triples for size 3)
+
+    Attributes:
+        size (int): number of fields in a subset
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.name = f"naked_subsets_{size}"
+
+    def apply(self, board: Board) -> int:
+        candidates = board.candidates
+        candidates_count = board.CANDIDATES_COUNT
+        size = self.size
+        eliminated = 0
+        for unit in board.UNITS:
+            cells = [index for index in unit if 1 < candidates_count[candidates[index]] <= size]
+            if len(cells) < size:
+                continue
+            for subset in combinations(cells, size):
+                union = 0
+                for index in subset:
+                    union |= candidates[index]
+                if candidates_count[union] < size:
+                    return self.CONTRADICTION
+                if candidates_count[union] > size:
+                    continue
+                for index in unit:
+                    mask = candidates[index]
+                    if mask & union and index not in subset:
+                        eliminated += candidates_count[mask & union]
+                        if not board.eliminate_mask(index, union):
+                            return self.CONTRADICTION
+        return eliminated
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.size})"
+
+
+class HiddenSubset(Technique):
+    """ If `size` values of a container can be placed only in the same `size` fields, all other values are removed from
+    these fields (hidden pairs for size 2, hidden triples for size 3)
+
+    Attributes:
+        size (int): number of values in a subset
+    """
+
+    def __init__(self, size: int = 2):
+        self.size = size
+        self.name = f"hidden_subsets_{size}"
+
+    def apply(self, board: Board) -> int:
+        candidates = board.candidates
+        candidates_count = board.CANDIDATES_COUNT
+        mask_values = board.MASK_VALUES
+        size = self.size
+        eliminated = 0
+        for unit in board.UNITS:
+            # positions of every value in the container, as a mask of positions within the unit (0-8 for 9x9 board)
+            positions = [0] * (board.SIDE + 1)
+            for position, index in enumerate(unit):
+                for value in mask_values[candidates[index]]:
+                    positions[value] |= 1 << position
+            subset_values = [value for value in range(1, board.SIDE + 1)
+                             if 1 < candidates_count[positions[value]] <= size]
+            if len(subset_values) < size:
+                continue
+            for subset in combinations(subset_values, size):
+                union = 0
+                keep = 0
+                for value in subset:
+                    union |= positions[value]
+                    keep |= board.VALUE_MASKS[value]
+                if candidates_count[union] != size:
+                    continue
+                for position in mask_values[union]:
+                    index = unit[position - 1]
+                    extra = candidates[index] & ~keep
+                    if extra:
+                        eliminated += candidates_count[extra]
+                        board.eliminate_mask(index, extra)
+        return eliminated
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.size})"
+
+
+class PointingPairs(Technique):
+    """ If all fields of a square that can have a value lie in the same row (or column), the value is removed from
+    fields of that row (or column) outside the square
+    """
+
+    name = "pointing_pairs"
+
+    def apply(self, board: Board) -> int:
+        candidates = board.candidates
+        topology = board.TOPOLOGY
+        cell_row, cell_column, cell_square = topology.cell_row, topology.cell_column, topology.cell_square
+        eliminated = 0
+        for square, cells in enumerate(topology.square_cells):
+            for bit in board.VALUE_MASKS[1:]:
+                rows = columns = 0
+                for index in cells:
+                    if candidates[index] & bit:
+                        rows |= 1 << cell_row[index]
+                        columns |= 1 << cell_column[index]
+                if not rows:
+                    continue
+                for lines, line_cells in ((rows, topology.row_cells), (columns, topology.column_cells)):
+                    if lines & (lines - 1):
+                        continue
+                    for index in line_cells[lines.bit_length() - 1]:
+                        if cell_square[index] != square and candidates[index] & bit:
+                            eliminated += 1
+                            if not board.eliminate_mask(index, bit):
+                                return self.CONTRADICTION
+        return eliminated
+
+
+class BoxLineReduction(Technique):
+    """ If all fields of a row (or column) that can have a value lie in the same square, the value is removed from
+    fields of that square outside the row (or column)
+    """
+
+    name = "box_line_reduction"
+
+    def apply(self, board: Board) -> int:
+        candidates = board.candidates
+        topology = board.TOPOLOGY
+        cell_square = topology.cell_square
+        eliminated = 0
+        for line_cells in topology.row_cells + topology.column_cells:
+            for bit in board.VALUE_MASKS[1:]:
+                squares = 0
+                for index in line_cells:
+                    if candidates[index] & bit:
+                        squares |= 1 << cell_square[index]
+                if not squares or squares & (squares - 1):
+                    continue
+                for index in topology.square_cells[squares.bit_length() - 1]:
+                    if index not in line_cells and candidates[index] & bit:
+                        eliminated += 1
+                        if not board.eliminate_mask(index, bit):
+                            return self.CONTRADICTION
+        return eliminated
+
+
+""" Hidden singles cut most of the search tree at the lowest cost per node, further techniques save few search nodes
+compared to their cost in Python, so they are used only on request.
+"""
+
+DEFAULT_TECHNIQUES = (HiddenSingles(),)
+
+ALL_TECHNIQUES = (HiddenSingles(), PointingPairs(), BoxLineReduction(), NakedSubset(2), HiddenSubset(2),
+                  NakedSubset(3), HiddenSubset(3))
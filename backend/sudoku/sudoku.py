@@ -1,55 +1,172 @@
 import re
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Generator
 
 from backend._base import SudokuBase
-from backend.consts import Position, FieldValue, SquareLocation
+from backend.profiling import Profiler
+from backend.consts import Position, SquareLocation, SYMBOL_VALUES
+from backend.sudoku.board import Board
 from backend.sudoku.field import Field
 from backend.sudoku.containers.line import Row, Column
+from backend.sudoku.cache import SolutionCache
+from backend.sudoku.solvers.solver import Solver
 from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.dlx_solver import DLXSolver
 from backend.sudoku.containers.square import Square
 
 
 class Sudoku(SudokuBase):
 
-    def __init__(self, setup: str = None, logger_name: str = "Sudoku", logging_level: int = 10):
-        super().__init__(logger_name, logging_level)
-
-        self.fields = [Field(x, y) for y in Position.get_possible_values() for x in Position.get_possible_values()]
-        self.rows = [Row(x) for x in Position.get_possible_values()]
-        self.columns = [Column(x) for x in Position.get_possible_values()]
-        self.squares = {x: Square(x) for x in SquareLocation.get_possible_values()}
+    SOLVERS = {
+        "classic": ClassicSolver,
+        "dlx": DLXSolver,
+    }
 
-        for row in self.rows:
-            row.add_many([field for field in self.fields if field.y_pos.value == row.number])
+    _templates = {}  # type: Dict[int, Sudoku]
 
-        for column in self.columns:
-            column.add_many([field for field in self.fields if field.x_pos.value == column.number])
+    def __init__(self, setup: str = None, logger_name: str = "Sudoku", logging_level: int = 10, box_size: int = 3):
+        """ Sudoku keeps its state on a `Board` only. Fields and containers are views over the board, taken from
+        an empty template sudoku built once per process when they are first used, so that creating a sudoku (or its
+        `clone`) does not create any objects apart from the board.
 
-        for location, square in self.squares.items():
-            square.add_many([field for field in self.fields
-                             if SquareLocation.from_position(field.x_pos, field.y_pos) == location])
+        Args:
+            setup (str): sudoku board string with values to set, '0' or '.' for empty fields, letters for values
+                         above 9 ('A' for 10, 'G' for 16, 'P' for 25)
+            logger_name (str): logger name
+            logging_level (int): logging level
+            box_size (int): side of a square, 3 for a standard 9x9 sudoku, 4 for 16x16, 5 for 25x25
+        """
+        super().__init__(logger_name, logging_level)
+        self.board = Board.sized(box_size)()
+        self._given = False
+        self._fields = None  # type: List[Field] | None
+        self._rows = None  # type: List[Row] | None
+        self._columns = None  # type: List[Column] | None
+        self._squares = None  # type: Dict[SquareLocation | int, Square] | None
 
         if setup:
             self.setup(setup)
 
+    def _build(self):
+        """ Create fields and containers of an empty sudoku from scratch. Positions and square locations of boards
+        bigger than 9x9 do not fit in `Position` and `SquareLocation`, they are kept as ints.
+        """
+        topology = self.board.TOPOLOGY
+        if self.board.SIDE == Board.SIDE:
+            positions = list(Position.get_possible_values())
+            locations = list(SquareLocation.get_possible_values())
+        else:
+            positions = locations = list(range(self.board.SIDE))
+        self._fields = [Field(x, y, board=self.board) for y in positions for x in positions]
+        self._rows = [Row(x) for x in positions]
+        self._columns = [Column(x) for x in positions]
+        self._squares = {x: Square(x) for x in locations}
+
+        for row in self._rows:
+            row.add_many([self._fields[index] for index in topology.row_cells[row.number]])
+
+        for column in self._columns:
+            column.add_many([self._fields[index] for index in topology.column_cells[column.number]])
+
+        for square_cells, square in zip(topology.square_cells, self._squares.values()):
+            square.add_many([self._fields[index] for index in square_cells])
+
+    def _view(self, sudoku: "Sudoku"):
+        """ Take fields and containers of another sudoku as views over the board of this one. Views log with the level
+        of this sudoku, not with levels of the objects they are taken from (e.g. of the shared template).
+
+        Args:
+            sudoku (Sudoku): sudoku to take fields and containers from
+        """
+        level = self.logging_level
+        self._fields = [field.view(self.board, level) for field in sudoku.fields]
+        self._rows = [row.view(self._fields, level) for row in sudoku.rows]
+        self._columns = [column.view(self._fields, level) for column in sudoku.columns]
+        self._squares = {location: square.view(self._fields, level) for location, square in sudoku.squares.items()}
+        if self._given:
+            for field in self._fields:
+                field.given = True
+
+    @classmethod
+    def template(cls, box_size: int = 3) -> "Sudoku":
+        """ Return an empty sudoku built once per process, which sudokus take their fields and containers from
+
+        Args:
+            box_size (int): side of a square of the sudoku
+
+        Returns:
+            (Sudoku): empty sudoku
+        """
+        if box_size not in Sudoku._templates:
+            template = Sudoku(box_size=box_size, logging_level=SudokuBase.SILENT)
+            template._build()
+            Sudoku._templates[box_size] = template
+        return Sudoku._templates[box_size]
+
+    @property
+    def fields(self) -> List[Field]:
+        if self._fields is None:
+            self._view(self.template(self.board.BOX))
+        return self._fields
+
+    @property
+    def rows(self) -> List[Row]:
+        if self._rows is None:
+            self._view(self.template(self.board.BOX))
+        return self._rows
+
+    @property
+    def columns(self) -> List[Column]:
+        if self._columns is None:
+            self._view(self.template(self.board.BOX))
+        return self._columns
+
+    @property
+    def squares(self) -> Dict[SquareLocation | int, Square]:
+        if self._squares is None:
+            self._view(self.template(self.board.BOX))
+        return self._squares
+
+    def clone(self) -> "Sudoku":
+        """ Create an independent copy of the sudoku, with a copy of the board (and fields viewing it, if fields of
+        this sudoku are already in use, so that their flags are kept)
+
+        Returns:
+            (Sudoku): copy of the sudoku
+        """
+        sudoku = Sudoku.__new__(Sudoku)
+        sudoku.logger, sudoku.logger_name, sudoku.logging_level = self.logger, self.logger_name, self.logging_level
+        sudoku.board = self.board.copy()
+        sudoku._given = self._given
+        sudoku._fields = sudoku._rows = sudoku._columns = sudoku._squares = None
+        if self._fields is not None:
+            sudoku._view(self)
+        return sudoku
+
     def setup(self, initial_setup: str):
         """ Fill in known starting fields and limit their possible values, based only on what's known
 
         Args:
-            initial_setup (str): sudoku board string with values to set
+            initial_setup (str): sudoku board string with values to set, '0' or '.' for empty fields
         """
         initial_setup = initial_setup.strip()
         initial_setup = re.sub(r"\s", "", initial_setup)
+        if len(initial_setup) < self.board.SIZE:
+            self.log_error(f"Sudoku string should have {self.board.SIZE} values, got {len(initial_setup)}")
+            raise RuntimeError(f"Sudoku string should have {self.board.SIZE} values, got {len(initial_setup)}")
 
-        for idx, field in enumerate(self.fields):
-            field.set(FieldValue(int(initial_setup[idx])))
+        values = [SYMBOL_VALUES.get(symbol, -1) for symbol in initial_setup[:self.board.SIZE]]
+        if not all(0 <= value <= self.board.SIDE for value in values):
+            self.log_error(f"Sudoku string should have values 0-{self.board.SIDE}, got {initial_setup}")
+            raise RuntimeError(f"Sudoku string should have values 0-{self.board.SIDE}, got {initial_setup}")
+        self.board.values[:] = values
+        if self._fields is None:
+            self._given = True
+        else:
+            for field in self._fields:
+                field.given = True
 
-        for idx, field in enumerate(self.fields):
-            if not field.value:
-                square = self.squares[SquareLocation.from_position(field.x_pos, field.y_pos)]
-                row = self.rows[field.y_pos]
-                column = self.columns[field.x_pos]
-                field.limit(square.get_fields_values(), row.get_fields_values(), column.get_fields_values())
+        if not self.board.limit_candidates():
+            self.log_warning("Sudoku has a value given twice in a row, column or square, it has no solution")
 
     def field(self, *args: int | Position | Tuple[Position, Position] | Tuple[int, int]) -> Field:
         """ Return a single field of given index or in certain position
@@ -64,9 +181,9 @@ class Sudoku(SudokuBase):
             if isinstance(args[0], int) or isinstance(args[0], Position):
                 return self.fields[args[0]]
             elif isinstance(args[0], tuple):
-                return self.fields[args[0][0] + args[0][1] * 9]
+                return self.fields[args[0][0] + args[0][1] * self.board.SIDE]
         if len(args) == 2:
-            return self.fields[args[0] + args[1] * 9]
+            return self.fields[args[0] + args[1] * self.board.SIDE]
         else:
             self.log_error("Given field is not available")
             raise RuntimeError("Given field is not available")
@@ -93,11 +210,36 @@ class Sudoku(SudokuBase):
         """
         return self.columns[position]
 
-    def solve(self):
+    def solve(self, cache: SolutionCache = None, solver: str | Solver = "classic", profiler: Profiler = None,
+              timeout: float = None):
         """ Run a solving algorithm
+
+        Args:
+            cache (SolutionCache): cache of solutions to look up first and to store a found solution in
+            solver (str | Solver): solver instance or name of the solver to use (see `SOLVERS`)
+            profiler (Profiler): profiler of the solve (if it is sampled), labeled with the puzzle string
+            timeout (float): seconds the solve may take, the most filled board reached is shown if it times out
         """
-        solver = ClassicSolver()
-        solution, fields = solver.solve(self.fields)
+        if isinstance(solver, str):
+            if solver not in self.SOLVERS:
+                self.log_error(f"Unknown solver {solver}, available: {', '.join(self.SOLVERS)}")
+                raise RuntimeError(f"Unknown solver {solver}, available: {', '.join(self.SOLVERS)}")
+            solver = self.SOLVERS[solver]()
+
+        puzzle = self.stringify()
+        if self.board.SIZE != Board.SIZE:
+            # symmetries of the cache are those of a 9x9 sudoku
+            cache = None
+        solution = cache.get(puzzle) if cache is not None else None
+        if solution:
+            fields = Solver.board_fields(Board(int(value) for value in solution), self.fields)
+        else:
+            if profiler is not None:
+                solution, fields = profiler.profile(puzzle, solver.solve, self.fields, timeout=timeout)
+            else:
+                solution, fields = solver.solve(self.fields, timeout=timeout)
+            if cache is not None and Solver.is_complete(fields):
+                cache.put(puzzle, solution)
 
         if solution:
             print(solution)
@@ -105,6 +247,42 @@ class Sudoku(SudokuBase):
             self.log_error("No solution was found")
         self.show(fields)
 
+    def count_solutions(self, limit: int = None) -> int:
+        """ Count solutions of the sudoku, stopping at `limit` (e.g. limit=2 to check if the solution is unique)
+
+        Args:
+            limit (int): number of solutions to stop at, all are counted if not given
+
+        Returns:
+            (int): number of solutions found, up to `limit`
+        """
+        return ClassicSolver(logging_level=self.logging_level).count_solutions(self.fields, limit)
+
+    def solutions(self, limit: int = None) -> Generator[str, None, None]:
+        """ Lazily generate solutions of the sudoku
+
+        Args:
+            limit (int): maximal number of solutions to generate, all if not given
+
+        Yields:
+            (str): solution string
+        """
+        yield from ClassicSolver(logging_level=self.logging_level).solutions(self.fields, limit)
+
+    @staticmethod
+    def solve_many(puzzles, workers: int = None, **kwargs):
+        """ Solve many sudokus at once, using a pool of processes (see `backend.sudoku.solvers.parallel.solve_many`)
+
+        Args:
+            puzzles (np.ndarray | Iterable[str]): (N, 81) array of values or 81-characters strings
+            workers (int): number of worker processes, all cores if not given
+
+        Returns:
+            (np.ndarray, np.ndarray): (N, 81) array of solutions and (N,) array of `SolvingStatus` values
+        """
+        from backend.sudoku.solvers.parallel import solve_many
+        return solve_many(puzzles, workers=workers, **kwargs)
+
     def __call__(self):
         """ Return a list of fields
         """
@@ -114,24 +292,26 @@ class Sudoku(SudokuBase):
         """ Print a sudoku
         """
         show_fields = fields if fields else self.fields
-        s = "-" * 33
+        box = self.board.BOX
+        width = 3 * self.board.SIDE + 2 * box
+        s = "-" * width
         s += "\n"
         current_row = show_fields[0].y_pos
         for field in show_fields:
             if field.y_pos != current_row:
                 s += "|\n"
-                if current_row % 3 == 2:
-                    s += "=" * 33
+                if current_row % box == box - 1:
+                    s += "=" * width
                 else:
-                    s += "-" * 33
+                    s += "-" * width
                 s += "\n"
                 current_row = field.y_pos
-            if field.x_pos % 3 == 0:
+            if field.x_pos % box == 0:
                 s += "|"
                 if field.x_pos > 0:
                     s += "|"
             s += f" {str(field)} "
-        s += "|\n" + "-" * 33
+        s += "|\n" + "-" * width
         print(s)
 
     def stringify(self) -> str:
@@ -140,7 +320,7 @@ class Sudoku(SudokuBase):
         Returns:
             (str): sudoku string
         """
-        return "".join([str(field) for field in self.fields])
+        return self.board.solution_string()
 
 
 if __name__ == '__main__':
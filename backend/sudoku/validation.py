@@ -0,0 +1,144 @@
+import dataclasses
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.consts import Topology
+
+
+""" Batch validation and grading of submitted grids, given as (N, 81) arrays of values (0 for empty fields) together
+with the puzzles they were submitted for. Every check is made with array operations on the whole batch, no `Sudoku`
+or `Field` objects are built:
+
+    report = GridValidator().validate(submissions, puzzles)
+    correct = report.correct                  # (N,) grids being complete, valid solutions of their puzzles
+    cells = report.offending_cells()          # indexes of the offending fields of every grid
+"""
+
+
+@dataclasses.dataclass
+class ValidationReport:
+    """ Outcome of a batch validation, one row per submitted grid
+
+    Attributes:
+        valid (np.ndarray): (N,) bool, no value repeats in a row, column or square and all values are in range
+        complete (np.ndarray): (N,) bool, every field has a value
+        consistent (np.ndarray): (N,) bool, every clue of the puzzle is kept
+        conflicts (np.ndarray): (N, size) bool, fields with a value repeated in one of their units or out of range
+        changed (np.ndarray): (N, size) bool, clues overwritten by the submission (emptied or changed)
+    """
+
+    valid: np.ndarray
+    complete: np.ndarray
+    consistent: np.ndarray
+    conflicts: np.ndarray
+    changed: np.ndarray
+
+    @property
+    def correct(self) -> np.ndarray:
+        """ (N,) bool, grids being complete, valid solutions consistent with their clues
+        """
+        return self.valid & self.complete & self.consistent
+
+    @property
+    def offending(self) -> np.ndarray:
+        """ (N, size) bool, fields making a grid invalid or inconsistent with its clues
+        """
+        return self.conflicts | self.changed
+
+    def offending_cells(self) -> List[List[int]]:
+        """ Indexes of offending fields of every grid
+
+        Returns:
+            (list[list[int]]): sorted field indexes, an empty list for grids without offending fields
+        """
+        if not len(self.valid):
+            return []
+        grids, cells = np.nonzero(self.offending)
+        return [part.tolist() for part in np.split(cells, np.searchsorted(grids, np.arange(1, len(self.valid))))]
+
+    def to_dict(self) -> Dict[str, list]:
+        """ Return the report as a JSON serializable dict
+
+        Returns:
+            (dict[str, list]): flags of every grid by name and offending fields of every grid
+        """
+        return {"valid": self.valid.tolist(), "complete": self.complete.tolist(),
+                "consistent": self.consistent.tolist(), "correct": self.correct.tolist(),
+                "offending": self.offending_cells()}
+
+
+class GridValidator(SudokuBase):
+    """ Validator of batches of grids of a given box size (see module description).
+
+    Values are counted per unit with a single `np.bincount` over (grid, unit, value) keys, so the cost is linear in
+    the number of fields of the batch. Fields conflict if their value is counted more than once in any of their units.
+
+    Attributes:
+        topology (Topology): geometry of validated grids
+    """
+
+    def __init__(self, box_size: int = 3, logger_name: str = "GridValidator", logging_level: int = 10):
+        """
+        Args:
+            box_size (int): side of a square, 3 for classic 9x9 grids
+            logger_name (str): logger name
+            logging_level (int): logging level
+        """
+        super().__init__(logger_name, logging_level)
+        self.topology = Topology.of(box_size)
+        self.cell_units = np.array(self.topology.cell_units, dtype=np.intp)
+
+    def _grids(self, grids: np.ndarray, name: str) -> np.ndarray:
+        """ Convert grids to (N, size) array, failing on other shapes
+        """
+        grids = np.asarray(grids)
+        if grids.ndim == 1:
+            grids = grids.reshape(1, -1)
+        if grids.ndim != 2 or grids.shape[1] != self.topology.size:
+            self.log_error(f"{name} should be given as (N, {self.topology.size}) array, got {grids.shape}")
+            raise RuntimeError(f"{name} should be given as (N, {self.topology.size}) array, got {grids.shape}")
+        return grids
+
+    def validate(self, submissions: np.ndarray, puzzles: np.ndarray = None) -> ValidationReport:
+        """ Validate submitted grids and compare them with clues of their puzzles
+
+        Args:
+            submissions (np.ndarray): (N, size) array of submitted values, 0 for empty fields
+            puzzles (np.ndarray): (N, size) array of puzzles (0 for fields which are not clues), or a single puzzle
+                                  shared by all submissions; clues are not checked if not given
+
+        Returns:
+            (ValidationReport): flags and offending fields of every grid
+        """
+        start_time = time.perf_counter()
+        submissions = self._grids(submissions, "Submissions")
+        count, side = len(submissions), self.topology.side
+        units = len(self.topology.units)
+
+        # out of range values are offending by themselves, and are counted as empty fields in units
+        in_range = (submissions >= 0) & (submissions <= side)
+        values = np.where(in_range, submissions, 0).astype(np.intp)
+        # key of every (grid, unit, value) occurrence, value 0 (empty field) is counted but never conflicts
+        grid_units = np.arange(count, dtype=np.intp)[:, None, None] * units
+        keys = (grid_units + self.cell_units) * (side + 1) + values[:, :, None]
+        counts = np.bincount(keys.ravel(), minlength=count * units * (side + 1))
+        conflicts = ((counts[keys] > 1) & (values[:, :, None] != 0)).any(axis=2) | ~in_range
+
+        filled = in_range & (submissions != 0)
+        if puzzles is None:
+            changed = np.zeros_like(conflicts)
+        else:
+            puzzles = self._grids(puzzles, "Puzzles")
+            if len(puzzles) not in (1, count):
+                self.log_error(f"Expected 1 or {count} puzzles, got {len(puzzles)}")
+                raise RuntimeError(f"Expected 1 or {count} puzzles, got {len(puzzles)}")
+            changed = (puzzles != 0) & (submissions != puzzles)
+
+        report = ValidationReport(valid=~conflicts.any(axis=1), complete=filled.all(axis=1),
+                                  consistent=~changed.any(axis=1), conflicts=conflicts, changed=changed)
+        self.log_debug("Validated %s grids (%s correct) in %s seconds", count, int(report.correct.sum()),
+                       time.perf_counter() - start_time)
+        return report
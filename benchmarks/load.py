@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.api.service import SolvingService
+from backend.consts import Difficulty
+from benchmarks.run import Benchmark
+
+
+""" Load test of the solving service on localhost. Clients keep their connections alive and send requests one after
+another, so the offered load is set by the number of clients (and puzzles per request):
+
+    python -m benchmarks.load --clients 64 --requests 50
+    python -m benchmarks.load --port 8080 --clients 64    # against an already running service
+"""
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, path: str,
+                  body: dict = None) -> Tuple[int, dict]:
+    """ Send a request over a kept-alive connection and read the response
+
+    Returns:
+        (int, dict): HTTP status and JSON response
+    """
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def client(port: int, puzzles: List[str], requests: int, per_request: int,
+                 latencies: List[float], statuses: Dict[int, int]):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        for number in range(requests):
+            start = number * per_request % len(puzzles)
+            body = {"puzzles": (puzzles * 2)[start:start + per_request]}
+            start_time = time.perf_counter()
+            status, _ = await request(reader, writer, "POST", "/solve", body)
+            latencies.append(time.perf_counter() - start_time)
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 503:
+                await asyncio.sleep(0.01)
+    finally:
+        writer.close()
+
+
+async def load_test(port: int, puzzles: List[str], clients: int, requests: int, per_request: int) -> dict:
+    """ Run clients against the service and summarize results
+
+    Returns:
+        (dict): throughput, latency percentiles of requests, HTTP statuses and metrics reported by the service
+    """
+    latencies, statuses = [], {}
+    start_time = time.perf_counter()
+    await asyncio.gather(*(client(port, puzzles, requests, per_request, latencies, statuses) for _ in range(clients)))
+    elapsed = time.perf_counter() - start_time
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    _, metrics = await request(reader, writer, "GET", "/metrics")
+    writer.close()
+    latencies_ms = np.array(latencies) * 1000
+    solved = statuses.get(200, 0)
+    return {"requests_per_second": len(latencies) / elapsed, "puzzles_per_second": solved * per_request / elapsed,
+            "p50_ms": float(np.percentile(latencies_ms, 50)), "p99_ms": float(np.percentile(latencies_ms, 99)),
+            "statuses": statuses, "service": metrics}
+
+
+async def main_async(arguments) -> dict:
+    puzzles = Benchmark.strings(Benchmark(arguments.count, logging_level=SudokuBase.SILENT).corpus(Difficulty.HARD))
+    if arguments.port:
+        return await load_test(arguments.port, puzzles, arguments.clients, arguments.requests, arguments.per_request)
+    service = SolvingService(port=0, workers=arguments.workers, max_batch=arguments.max_batch,
+                             batch_wait=arguments.batch_wait, max_queue=arguments.max_queue,
+                             logging_level=SudokuBase.SILENT)
+    await service.start()
+    try:
+        return await load_test(service.port, puzzles, arguments.clients, arguments.requests, arguments.per_request)
+    finally:
+        await service.close()
+
+
+def main(arguments: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the solving service on localhost")
+    parser.add_argument("--port", type=int, default=None, help="port of a running service, one is started if not given")
+    parser.add_argument("--count", type=int, default=100, help="puzzles in the corpus")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--per-request", type=int, default=1, help="puzzles per request")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--batch-wait", type=float, default=0.005)
+    parser.add_argument("--max-queue", type=int, default=10000)
+    arguments = parser.parse_args(arguments)
+    print(json.dumps(asyncio.run(main_async(arguments)), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
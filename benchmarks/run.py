@@ -0,0 +1,277 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Callable
+
+import numpy as np
+
+from backend._base import SudokuBase
+from backend.consts import Difficulty, SolvingStatus
+from backend.ingestion.corpus import CorpusReader
+from backend.ingestion.image import DigitClassifier, ImageReader, render
+from backend.sudoku import Sudoku
+from backend.sudoku.generator import PuzzleGenerator, generate_to_file
+from backend.sudoku.solvers.batch_solver import BatchSolver
+from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.dlx_solver import DLXSolver
+from backend.sudoku.solvers.splitting_solver import SplittingSolver
+
+
+""" Reproducible benchmarks of the project. Puzzle corpora are generated locally with a fixed seed for every difficulty
+tier (and cached in `corpora` directory), results are written as JSON and can be compared with a saved baseline:
+
+    python -m benchmarks.run --count 100 --output results.json
+    python -m benchmarks.run --count 100 --output new.json --baseline results.json
+"""
+
+CORPORA_DIRECTORY = os.path.join(os.path.dirname(__file__), "corpora")
+
+SOLVERS = {
+    "classic": ClassicSolver,
+    "dlx": DLXSolver,
+}
+
+# metrics for which higher value is better, all other metrics (times, memory) are better when lower
+HIGHER_IS_BETTER = ("per_second", "accuracy")
+
+# box sizes of boards scaling sections can be run for
+SCALING_BOX_SIZES = (3, 4, 5)
+
+# seconds a single solve of scaling sections may take
+SCALING_TIMEOUT = 10.0
+
+
+class Benchmark(SudokuBase):
+    """ Benchmark suite, collecting results of all sections into a dict of `section -> metric -> value`
+
+    Attributes:
+        count (int): number of puzzles per difficulty tier
+        seed (int): seed of generated corpora
+        memory (bool): True to measure peak memory of sections
+        results (dict): results of benchmark sections
+    """
+
+    def __init__(self, count: int = 100, seed: int = 0, memory: bool = True, logger_name: str = "Benchmark",
+                 logging_level: int = 20):
+        super().__init__(logger_name, logging_level)
+        self.count = count
+        self.seed = seed
+        self.memory = memory
+        self.results = {}  # type: Dict[str, Dict[str, float]]
+
+    def corpus(self, difficulty: Difficulty) -> np.ndarray:
+        """ Get puzzles of given difficulty tier, generating and caching them on first use
+
+        Args:
+            difficulty (Difficulty): difficulty tier
+
+        Returns:
+            (np.ndarray): (count, 81) array of puzzles
+        """
+        path = os.path.join(CORPORA_DIRECTORY, f"{difficulty.name.lower()}_{self.seed}_{self.count}.sdk")
+        if not os.path.exists(path):
+            os.makedirs(CORPORA_DIRECTORY, exist_ok=True)
+            self.log_info("Generating %s corpus of %s puzzles", difficulty.name, self.count)
+            generate_to_file(path, self.count, difficulty=difficulty, seed=self.seed * 1000 + difficulty,
+                             chunk_size=max(1, self.count // 8), logging_level=SudokuBase.SILENT)
+        return CorpusReader(path, logging_level=self.logging_level).puzzles()
+
+    @staticmethod
+    def strings(puzzles: np.ndarray) -> List[str]:
+        return ["".join(map(str, puzzle)) for puzzle in puzzles.tolist()]
+
+    @staticmethod
+    def latencies(times: List[float]) -> Dict[str, float]:
+        """ Summarize latencies in seconds as percentiles in milliseconds
+        """
+        times_ms = np.array(times) * 1000
+        return {"p50_ms": float(np.percentile(times_ms, 50)), "p90_ms": float(np.percentile(times_ms, 90)),
+                "p99_ms": float(np.percentile(times_ms, 99)), "max_ms": float(times_ms.max()),
+                "mean_ms": float(times_ms.mean())}
+
+    def measure(self, name: str, function: Callable[[], Dict[str, float]]):
+        """ Run a benchmark section, and run it once more with memory tracing to record its peak memory (tracing slows
+        Python down, so it is kept out of the timed run)
+
+        Args:
+            name (str): name of the section
+            function (Callable): section returning its metrics
+        """
+        metrics = function()
+        if self.memory:
+            tracemalloc.start()
+            try:
+                function()
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            metrics["peak_memory_kb"] = peak / 1024
+        self.results[name] = metrics
+        self.log_info("%s: %s", name, metrics)
+
+    def construction(self, puzzles: List[str]) -> Dict[str, float]:
+        times = []
+        for puzzle in puzzles:
+            start_time = time.perf_counter()
+            Sudoku(puzzle, logging_level=SudokuBase.SILENT)
+            times.append(time.perf_counter() - start_time)
+        return self.latencies(times)
+
+    def single_solve(self, solver_class: type, puzzles: List[str]) -> Dict[str, float]:
+        solver = solver_class(logging_level=SudokuBase.SILENT)
+        times = []
+        for puzzle in puzzles:
+            fields = Sudoku(puzzle, logging_level=SudokuBase.SILENT).fields
+            start_time = time.perf_counter()
+            solver.solve(fields)
+            times.append(time.perf_counter() - start_time)
+        return self.latencies(times)
+
+    def scaling(self, solver_class: type, box_size: int) -> Dict[str, float]:
+        """ Measure single-solve latency of puzzles of given box size, made by `PuzzleGenerator.sized_puzzle` with
+        as many fields emptied as needed for the search to start with a guess, so that puzzles of all sizes are of
+        comparable difficulty. Mean search nodes and guesses are reported along with latency, to tell search from
+        propagation costs.
+        """
+        generator = PuzzleGenerator(seed=self.seed, logging_level=SudokuBase.SILENT)
+        puzzles = [generator.sized_puzzle(box_size, needs_guess=True)[0] for _ in range(max(1, self.count // 10))]
+        solver = solver_class(logging_level=SudokuBase.SILENT)
+        times = []
+        nodes = guesses = unsolved = 0
+        try:
+            for puzzle in puzzles:
+                fields = Sudoku(puzzle, box_size=box_size, logging_level=SudokuBase.SILENT).fields
+                start_time = time.perf_counter()
+                solver.solve(fields, timeout=SCALING_TIMEOUT)
+                times.append(time.perf_counter() - start_time)
+                nodes += solver.stats.nodes
+                guesses += solver.stats.guesses
+                unsolved += solver.status != SolvingStatus.SOLVED
+        finally:
+            if isinstance(solver, SplittingSolver):
+                solver.close()
+        return {**self.latencies(times), "mean_nodes": nodes / len(puzzles), "mean_guesses": guesses / len(puzzles),
+                "unsolved": unsolved}
+
+    def batch(self, puzzles: np.ndarray) -> Dict[str, float]:
+        start_time = time.perf_counter()
+        BatchSolver(logging_level=SudokuBase.SILENT).solve(puzzles)
+        return {"puzzles_per_second": len(puzzles) / (time.perf_counter() - start_time)}
+
+    def ingestion(self, puzzles: np.ndarray) -> Dict[str, float]:
+        """ Measure throughput and accuracy of reading puzzles from images made by `render` (the digit classifier is
+        trained before measuring)
+        """
+        classifier = DigitClassifier.synthetic(logging_level=SudokuBase.SILENT)
+        reader = ImageReader(classifier, logging_level=SudokuBase.SILENT)
+        images = render(puzzles, seed=self.seed)
+        start_time = time.perf_counter()
+        values, _ = reader.read(images)
+        elapsed = time.perf_counter() - start_time
+        return {"images_per_second": len(images) / elapsed, "cell_accuracy": float((values == puzzles).mean()),
+                "board_accuracy": float((values == puzzles).all(axis=1).mean())}
+
+    def generation(self) -> Dict[str, float]:
+        generator = PuzzleGenerator(seed=self.seed, logging_level=SudokuBase.SILENT)
+        count = max(1, self.count // 10)
+        start_time = time.perf_counter()
+        for _ in range(count):
+            generator.puzzle()
+        return {"boards_per_second": count / (time.perf_counter() - start_time)}
+
+    def run(self, solvers: List[str] = None, tiers: List[Difficulty] = None, box_sizes: List[int] = (3, 4, 5)) -> dict:
+        """ Run all benchmark sections
+
+        Args:
+            solvers (list[str]): names of solvers to measure single-solve latency of, all if not given
+            tiers (list[Difficulty]): difficulty tiers to run, all if not given
+            box_sizes (list[int]): box sizes to measure scaling of solve time with board size for
+
+        Returns:
+            (dict): meta information and results
+        """
+        tiers = tiers or list(Difficulty)
+        corpora = {tier: self.corpus(tier) for tier in tiers}
+        all_puzzles = np.concatenate(list(corpora.values()))
+
+        self.measure("construction", lambda: self.construction(self.strings(all_puzzles)))
+        for tier, puzzles in corpora.items():
+            for name in solvers or SOLVERS:
+                self.measure(f"solve.{name}.{tier.name.lower()}",
+                             lambda: self.single_solve(SOLVERS[name], self.strings(puzzles)))
+        for box_size in box_sizes:
+            side = box_size * box_size
+            for name in solvers or SOLVERS:
+                self.measure(f"scaling.{name}.{side}x{side}", lambda: self.scaling(SOLVERS[name], box_size))
+            # tail latency of the hardest puzzles, searched by all cores at once
+            self.measure(f"scaling.splitting.{side}x{side}", lambda: self.scaling(SplittingSolver, box_size))
+        self.measure("batch", lambda: self.batch(all_puzzles))
+        self.measure("generation", self.generation)
+        self.measure("ingestion", lambda: self.ingestion(all_puzzles[::max(1, len(all_puzzles) // 100)]))
+        return {"meta": {"python": sys.version.split()[0], "platform": platform.platform(),
+                         "cpus": os.cpu_count(), "count": self.count, "seed": self.seed, "time": time.time()},
+                "results": self.results}
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.1) -> List[str]:
+    """ Compare results with a baseline
+
+    Args:
+        results (dict): results of current run
+        baseline (dict): results of baseline run
+        threshold (float): relative change of a metric regarded as regression
+
+    Returns:
+        (list[str]): descriptions of regressions, empty if there are none
+    """
+    regressions = []
+    for section, metrics in results["results"].items():
+        for metric, value in metrics.items():
+            base = baseline["results"].get(section, {}).get(metric)
+            if not base:
+                continue
+            change = (value - base) / base
+            if any(metric.endswith(suffix) for suffix in HIGHER_IS_BETTER):
+                change = -change
+            if change > threshold:
+                regressions.append(f"{section}.{metric}: {base:.4g} -> {value:.4g} ({change:+.1%} worse)")
+    return regressions
+
+
+def main(arguments: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run sudoku benchmarks")
+    parser.add_argument("--count", type=int, default=100, help="puzzles per difficulty tier")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solvers", nargs="*", choices=list(SOLVERS), default=None)
+    parser.add_argument("--tiers", nargs="*", choices=[tier.name for tier in Difficulty], default=None)
+    parser.add_argument("--box-sizes", nargs="*", type=int, choices=SCALING_BOX_SIZES, default=list(SCALING_BOX_SIZES),
+                        help="box sizes of boards to measure scaling for, e.g. 4 for 16x16")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None, help="results file to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change regarded as regression")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurements")
+    arguments = parser.parse_args(arguments)
+
+    tiers = [Difficulty[tier] for tier in arguments.tiers] if arguments.tiers else None
+    results = Benchmark(arguments.count, arguments.seed, not arguments.no_memory).run(arguments.solvers, tiers,
+                                                                                       arguments.box_sizes)
+    with open(arguments.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(results, json.load(file), arguments.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+import random
+
+from backend._base import SudokuBase
+from backend.sudoku.cache import SolutionCache, Transform
+from backend.sudoku.generator import PuzzleGenerator
+
+
+def random_transform(rng: random.Random) -> Transform:
+    def lines():
+        return tuple(block * 3 + line for block in rng.sample(range(3), 3) for line in rng.sample(range(3), 3))
+
+    return Transform(rng.random() < 0.5, lines(), lines(), (0,) + tuple(rng.sample(range(1, 10), 9)))
+
+
+def test_equivalent_puzzles_hit_with_their_own_solutions():
+    generator = PuzzleGenerator(seed=5, logging_level=SudokuBase.SILENT)
+    cache = SolutionCache(logging_level=SudokuBase.SILENT)
+    rng = random.Random(5)
+    for _ in range(10):
+        puzzle, solution, _ = generator.puzzle()
+        cache.put(puzzle, solution)
+        transform = random_transform(rng)
+        assert cache.get(transform.apply(puzzle)) == transform.apply(solution)
+    assert cache.stats()["hits"] == 10
+
+
+def test_near_empty_puzzles_bypass_cache():
+    cache = SolutionCache(logging_level=SudokuBase.SILENT)
+    for puzzle in ("0" * 81, "1" + "0" * 80):
+        cache.put(puzzle, "1" * 81)
+        assert cache.get(puzzle) is None
+    assert len(cache) == 0
+    assert cache.stats()["skipped"] == 2
@@ -0,0 +1,107 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from backend._base import SudokuBase
+from backend.api.service import SolvingService, HTTPError
+
+
+EASY = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+EASY_SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+
+
+async def request(port: int, method: str, path: str, body: dict | bytes = None) -> tuple:
+    """ Send a single HTTP request to the service
+
+    Returns:
+        (int, dict): status code and JSON response
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = body if isinstance(body, bytes) else json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n"
+                 f"Connection: close\r\n\r\n".encode() + payload)
+    await writer.drain()
+    # the response is read up to its length, as worker processes forked by the service keep copies of the socket open
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    headers = dict(line.lower().split(": ", 1) for line in head[1:] if line)
+    content = await reader.readexactly(int(headers["content-length"]))
+    writer.close()
+    return int(head[0].split()[1]), json.loads(content)
+
+
+def run_service(check, **kwargs):
+    """ Run a check coroutine against a started service listening on a free port
+    """
+    async def main():
+        service = SolvingService(port=0, workers=1, logging_level=SudokuBase.SILENT, **kwargs)
+        await service.start()
+        try:
+            await check(service)
+        finally:
+            await service.close()
+
+    asyncio.run(main())
+
+
+def test_solve():
+    async def check(service):
+        status, response = await request(service.port, "POST", "/solve", {"puzzles": [EASY, EASY.replace("0", ".")]})
+        assert status == 200
+        assert response == {"solutions": [EASY_SOLUTION] * 2, "statuses": ["solved"] * 2}
+
+        status, response = await request(service.port, "POST", "/solve", {"puzzle": "11" + "0" * 79})
+        assert status == 200 and response["statuses"] == ["unsolvable"]
+
+        status, response = await request(service.port, "GET", "/metrics")
+        assert status == 200 and response["puzzles"] == 3
+
+    run_service(check)
+
+
+@pytest.mark.parametrize("method, path, body, expected", [
+    ("POST", "/solve", b"not json", 400),
+    ("POST", "/solve", {"puzzles": "0" * 81}, 400),
+    ("POST", "/solve", {"puzzle": EASY[:-1]}, 400),
+    ("POST", "/solve", {"puzzle": "x" + EASY[1:]}, 400),
+    ("GET", "/solve", None, 405),
+    ("GET", "/unknown", None, 404),
+    ("POST", "/solve", {"puzzles": [EASY] * 3}, 413),
+    ("POST", "/validate", {"submissions": [EASY_SOLUTION], "puzzles": [EASY, EASY]}, 400),
+])
+def test_errors(method, path, body, expected):
+    async def check(service):
+        status, response = await request(service.port, method, path, body)
+        assert status == expected
+        assert "error" in response
+
+    run_service(check, max_queue=2)
+
+
+def test_full_queue_is_unavailable():
+    async def check(service):
+        # puzzles stay queued without the batcher
+        service.batcher.cancel()
+        await asyncio.gather(service.batcher, return_exceptions=True)
+        service.queue.put_nowait((np.zeros(81, dtype=np.uint8), asyncio.get_running_loop().create_future(), 0.0))
+        with pytest.raises(HTTPError) as error:
+            await service.solve(service.parse_grids([EASY, EASY]))
+        assert error.value.status == 503
+        status, _ = await request(service.port, "POST", "/solve", {"puzzles": [EASY, EASY]})
+        assert status == 503
+        assert service.counters["rejected"] == 2
+
+    run_service(check, max_queue=2)
+
+
+def test_validate():
+    async def check(service):
+        wrong = EASY_SOLUTION[:2] + EASY_SOLUTION[3] + EASY_SOLUTION[2] + EASY_SOLUTION[4:]
+        status, response = await request(service.port, "POST", "/validate",
+                                         {"submissions": [EASY_SOLUTION, wrong], "puzzles": [EASY]})
+        assert status == 200
+        assert response["correct"] == [True, False]
+        assert response["offending"][0] == [] and response["offending"][1]
+
+    run_service(check)
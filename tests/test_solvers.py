@@ -0,0 +1,185 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from backend._base import SudokuBase
+from backend.consts import SolvingStatus
+from backend.sudoku import Sudoku
+from backend.sudoku.generator import PuzzleGenerator
+from backend.sudoku.solvers.batch_solver import BatchSolver
+from backend.sudoku.solvers.classic_solver import ClassicSolver
+from backend.sudoku.solvers.dlx_solver import DLXSolver, DancingLinks
+from backend.sudoku.solvers.parallel import puzzles_array
+from backend.sudoku.solvers.splitting_solver import SplittingSolver
+from backend.sudoku.solvers.techniques import ALL_TECHNIQUES, DEFAULT_TECHNIQUES
+from backend.sudoku.validation import GridValidator
+
+
+SILENT = SudokuBase.SILENT
+
+EASY = "530070000600195000098000060800060003400803001700020006060000280000419005000080079"
+HARD = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+# two equal givens in the first row
+CONFLICTING = "11" + "0" * 79
+# consistent givens without a solution: the top-left field has no candidate left
+NO_SOLUTION = "023456789100000000000000000000000000000000000000000000000000000000000000000000000"
+
+
+def values(puzzle: str) -> np.ndarray:
+    return np.array([int(value) for value in puzzle], dtype=np.uint8)
+
+
+def assert_solves(puzzle: str, solution: str):
+    report = GridValidator(logging_level=SILENT).validate(values(solution), values(puzzle))
+    assert report.correct.all(), f"{solution} is not a solution of {puzzle}"
+
+
+def dlx_count(puzzle: str, limit: int = None) -> int:
+    """ Count solutions with Dancing Links, independently of the classic search
+    """
+    board = Sudoku(puzzle, logging_level=SILENT).board
+    count = 0
+    for _ in DancingLinks(board).search():
+        count += 1
+        if limit is not None and count >= limit:
+            break
+    return count
+
+
+@pytest.fixture(scope="module")
+def generated():
+    return PuzzleGenerator(seed=7, logging_level=SILENT).puzzles(10)
+
+
+@pytest.fixture(scope="module")
+def splitting():
+    solver = SplittingSolver(workers=2, subproblems=4, logging_level=SILENT)
+    # start worker processes before any solve is timed
+    solver.solve(Sudoku(HARD, logging_level=SILENT).fields)
+    yield solver
+    solver.close()
+
+
+@pytest.mark.parametrize("solver_class", [ClassicSolver, DLXSolver])
+@pytest.mark.parametrize("puzzle", [EASY, HARD])
+def test_solution_is_valid(solver_class, puzzle):
+    solver = solver_class(logging_level=SILENT)
+    solution, _ = solver.solve(Sudoku(puzzle, logging_level=SILENT).fields)
+    assert solver.status == SolvingStatus.SOLVED
+    assert_solves(puzzle, solution)
+
+
+def test_generated_puzzles_are_solved_by_all_solvers(generated, splitting):
+    puzzles, solutions, _ = generated
+    for puzzle, expected in zip(puzzles, solutions):
+        puzzle = "".join(map(str, puzzle))
+        expected = "".join(map(str, expected))
+        for solver in (ClassicSolver(logging_level=SILENT), DLXSolver(logging_level=SILENT), splitting):
+            solution, _ = solver.solve(Sudoku(puzzle, logging_level=SILENT).fields)
+            assert solution == expected, type(solver).__name__
+
+    batch_solutions, statuses = BatchSolver(logging_level=SILENT).solve(puzzles)
+    assert (statuses == SolvingStatus.SOLVED).all()
+    assert (batch_solutions == solutions).all()
+
+
+def test_solutions_of_bigger_boards_are_valid():
+    generator = PuzzleGenerator(seed=3, logging_level=SILENT)
+    for box_size in (4, 5):
+        puzzle, _ = generator.sized_puzzle(box_size, needs_guess=True)
+        sudoku = Sudoku(puzzle, logging_level=SILENT, box_size=box_size)
+        solver = ClassicSolver(logging_level=SILENT)
+        _, fields = solver.solve(sudoku.fields)
+        assert solver.status == SolvingStatus.SOLVED
+        report = GridValidator(box_size, logging_level=SILENT).validate(
+            np.array([int(field.value) for field in fields]), np.array(sudoku.board.values))
+        assert report.correct.all()
+
+
+@pytest.mark.parametrize("techniques, by_degree", [(DEFAULT_TECHNIQUES, False), ((), False), (ALL_TECHNIQUES, True)])
+@pytest.mark.parametrize("emptied", [3, 6, 9])
+def test_solution_counts_match_dlx(generated, emptied, techniques, by_degree):
+    solver = ClassicSolver(logging_level=SILENT, techniques=techniques, by_degree=by_degree)
+    puzzles, _, _ = generated
+    for puzzle in puzzles:
+        clues = np.flatnonzero(puzzle)[:emptied]
+        puzzle = puzzle.copy()
+        puzzle[clues] = 0
+        puzzle = "".join(map(str, puzzle))
+        fields = Sudoku(puzzle, logging_level=SILENT).fields
+        assert solver.count_solutions(fields, limit=500) == dlx_count(puzzle, limit=500)
+        solutions = list(solver.solutions(fields, limit=5))
+        assert len(set(solutions)) == len(solutions)
+        for solution in solutions:
+            assert_solves(puzzle, solution)
+
+
+def test_count_solutions_stops_at_limit():
+    assert Sudoku("0" * 81, logging_level=SILENT).count_solutions(limit=3) == 3
+    assert Sudoku(HARD, logging_level=SILENT).count_solutions(limit=2) == 1
+
+
+@pytest.mark.parametrize("puzzle", [CONFLICTING, NO_SOLUTION])
+def test_unsolvable(puzzle, splitting):
+    for solver in (ClassicSolver(logging_level=SILENT), DLXSolver(logging_level=SILENT), splitting):
+        start_time = time.perf_counter()
+        solver.solve(Sudoku(puzzle, logging_level=SILENT).fields)
+        assert solver.status == SolvingStatus.UNSOLVABLE, type(solver).__name__
+        assert time.perf_counter() - start_time < 1
+    assert Sudoku(puzzle, logging_level=SILENT).count_solutions() == 0
+
+    _, statuses = BatchSolver(logging_level=SILENT).solve(values(puzzle).reshape(1, -1))
+    assert statuses[0] == SolvingStatus.UNSOLVABLE
+
+
+@pytest.mark.parametrize("solver_class", [ClassicSolver, DLXSolver])
+def test_timed_out(solver_class):
+    solver = solver_class(logging_level=SILENT)
+    solver.solve(Sudoku(HARD, logging_level=SILENT).fields, deadline=time.monotonic() - 1)
+    assert solver.status == SolvingStatus.TIMED_OUT
+
+
+@pytest.mark.parametrize("solver_class", [ClassicSolver, DLXSolver])
+def test_cancelled(solver_class):
+    cancel = threading.Event()
+    cancel.set()
+    solver = solver_class(logging_level=SILENT)
+    solver.solve(Sudoku(HARD, logging_level=SILENT).fields, cancel=cancel)
+    assert solver.status == SolvingStatus.CANCELLED
+
+
+def test_limits_of_batch_and_splitting_solvers(splitting):
+    _, statuses = BatchSolver(logging_level=SILENT).solve(values(HARD).reshape(1, -1),
+                                                          deadline=time.monotonic() - 1)
+    assert statuses[0] == SolvingStatus.TIMED_OUT
+
+    cancel = threading.Event()
+    cancel.set()
+    _, statuses = BatchSolver(logging_level=SILENT).solve(values(HARD).reshape(1, -1), cancel=cancel)
+    assert statuses[0] == SolvingStatus.CANCELLED
+
+    splitting.solve(Sudoku(HARD, logging_level=SILENT).fields, cancel=cancel)
+    assert splitting.status == SolvingStatus.CANCELLED
+
+
+def test_solver_stats():
+    solver = ClassicSolver(logging_level=SILENT)
+    solver.solve(Sudoku(HARD, logging_level=SILENT).fields)
+    stats = solver.stats
+    assert stats.nodes > 1 and stats.guesses >= stats.backtracks
+    assert stats.eliminated.get("naked_singles", 0) > 0
+    assert set(stats.to_dict()) >= {"nodes", "guesses", "backtracks", "propagation_passes", "eliminated"}
+
+    solver.solve(Sudoku(EASY, logging_level=SILENT).fields)
+    assert solver.stats.guesses == 0
+
+
+def test_puzzles_array_validates_strings():
+    puzzle = EASY.replace("0", ".")
+    assert (puzzles_array([puzzle, EASY]) == values(EASY)).all()
+    with pytest.raises(ValueError, match="Puzzle 1"):
+        puzzles_array([EASY, EASY[:-1]])
+    with pytest.raises(ValueError, match="Puzzle 1"):
+        puzzles_array([EASY, "x" + EASY[1:]])